@@ -1,3 +1,15 @@
-from .email_processor import EmailProcessor, email_processor
+from .email_processor import EmailProcessor, get_email_processor
 
-__all__ = ["EmailProcessor", "email_processor"]
+# 기존 `from src.agents import email_processor` 호환: 패키지 속성 email_processor는 서브모듈 대신
+# 아래 __getattr__의 싱글톤 (서브모듈은 `from src.agents.email_processor import ...`로 그대로 임포트)
+globals().pop("email_processor", None)
+
+
+def __getattr__(name):
+    """email_processor 싱글톤은 첫 접근 시 생성 (import 시점에는 그래프를 만들지 않음)"""
+    if name == "email_processor":
+        return get_email_processor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["EmailProcessor", "email_processor", "get_email_processor"]
@@ -4,21 +4,36 @@ LangGraph Supervisor Agent for Email Processing
 n8n 기본 에이전트들을 orchestration하여 복잡한 이메일 처리 워크플로우를 수행합니다.
 """
 
-from typing import TypedDict, List, Dict, Literal, Optional
+from typing import TypedDict, List, Dict, Literal, Optional, Annotated, AsyncIterator, Deque, get_type_hints
 from langgraph.graph import StateGraph, END
+from collections import deque
 from datetime import date
+import asyncio
+import functools
 import logging
-import json
+import operator
 
 from ..tools.n8n_tools import n8n_tools
 from ..services.db_service import db
+from ..services.analysis_cache import (
+    analysis_cache, reply_cache, make_cache_key,
+    SemanticAnalysisCache, semantic_key_text
+)
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+# 유사 이메일(뉴스레터 등) 분석 결과 재사용 캐시
+semantic_cache = SemanticAnalysisCache(threshold=settings.SEMANTIC_CACHE_THRESHOLD)
+
 
 # ========== State 정의 ==========
 
+def merge_reply_drafts(left: Dict[int, dict], right: Dict[int, dict]) -> Dict[int, dict]:
+    """이메일별 답변 초안 병합 (reply_one 결과 합치기용 reducer)"""
+    return {**(left or {}), **(right or {})}
+
+
 class EmailProcessingState(TypedDict):
     """이메일 처리 워크플로우 상태"""
 
@@ -29,12 +44,12 @@ class EmailProcessingState(TypedDict):
     email_ids: List[int]
     emails: List[dict]
 
-    # 분석 결과
-    classifications: List[dict]
-    important_emails: List[int]  # 중요도 >= 7
+    # 분석 결과 (이메일별 classify_one 결과를 operator.add로 병합)
+    classifications: Annotated[List[dict], operator.add]
+    important_emails: Annotated[List[int], operator.add]  # 중요도 >= 7
 
-    # 답변 데이터
-    reply_drafts: Dict[int, dict]  # {email_id: {formal, casual, brief}}
+    # 답변 데이터 (이메일별 reply_one 결과를 병합)
+    reply_drafts: Annotated[Dict[int, dict], merge_reply_drafts]  # {email_id: {formal, casual, brief}}
     approved_replies: List[dict]
 
     # 요약
@@ -45,9 +60,25 @@ class EmailProcessingState(TypedDict):
     errors: List[str]
 
 
+# state 키별 reducer (Annotated 메타데이터), astream 업데이트를 최종 state로 합칠 때 사용
+STATE_REDUCERS = {
+    key: hint.__metadata__[0]
+    for key, hint in get_type_hints(EmailProcessingState, include_extras=True).items()
+    if hasattr(hint, "__metadata__")
+}
+
+
+def apply_state_update(state: Dict, update: Dict) -> Dict:
+    """노드 부분 업데이트를 state에 반영 (reducer가 있는 키는 병합, 나머지는 덮어쓰기)"""
+    for key, value in update.items():
+        reducer = STATE_REDUCERS.get(key)
+        state[key] = reducer(state.get(key), value) if reducer and key in state else value
+    return state
+
+
 # ========== Node 함수들 ==========
 
-def fetch_emails_node(state: EmailProcessingState) -> Dict:
+async def fetch_emails_node(state: EmailProcessingState) -> Dict:
     """
     Step 1: n8n FetchEmailAgent 호출
     """
@@ -55,7 +86,7 @@ def fetch_emails_node(state: EmailProcessingState) -> Dict:
 
     try:
         # n8n 워크플로우 호출
-        result = n8n_tools.fetch_emails()
+        result = await n8n_tools.fetch_emails_async()
 
         return {
             "email_ids": result.get("email_ids", []),
@@ -72,12 +103,202 @@ def fetch_emails_node(state: EmailProcessingState) -> Dict:
         }
 
 
-def classify_emails_node(state: EmailProcessingState) -> Dict:
+def dispatch_classify(emails: List[dict]) -> List[dict]:
+    """
+    분류 fan-out 디스패처: 이메일 1개당 classify_one 페이로드 1개
+
+    LangGraph Send API의 Send("classify_one", payload)와 같은 형태의 페이로드를 만듭니다.
+    (현재 langgraph 버전에는 Send가 없어 classify_emails_node 안에서 동시 실행)
+    """
+    return [{"email": email} for email in emails]
+
+
+def _as_bool(value) -> bool:
+    """n8n 응답의 bool 값 정규화 ("true"/"false" 문자열 또는 bool)"""
+    return value.strip().lower() == "true" if isinstance(value, str) else bool(value)
+
+
+def _analysis_cache_key(email: dict) -> str:
+    """분류 결과 캐시 키 (이메일 내용 해시)"""
+    return make_cache_key(email['id'], email.get('subject'), email.get('body_text'), "analyze_v1")
+
+
+def _embed_for_cache(email: dict) -> List[float]:
+    """유사도 캐시용 이메일 임베딩 (RAG 임베딩 모델 재사용)"""
+    from ..rag.rag_service import EmailRAGService
+    return EmailRAGService().embed_text(semantic_key_text(email.get('subject'), email.get('body_text')))
+
+
+async def _lookup_caches(email: dict):
+    """
+    분류 캐시 조회: 정확 일치(analysis_cache) → 유사도(semantic_cache)
+
+    Returns:
+        (update 또는 None, 임베딩 또는 None)
+        임베딩은 캐시 미스 후 분석 결과를 semantic_cache에 넣을 때 다시 사용합니다.
+    """
+    cached = analysis_cache.get(_analysis_cache_key(email))
+    if cached is not None:
+        logger.info(f"[Node] 이메일 {email['id']} 분류 캐시 적중")
+        return cached, None
+
+    if settings.SEMANTIC_CACHE_THRESHOLD <= 0:
+        return None, None
+
+    try:
+        embedding = await asyncio.to_thread(_embed_for_cache, email)
+    except Exception as e:
+        logger.debug(f"[Node] 유사도 캐시 임베딩 실패 (건너뜀): {e}")
+        return None, None
+
+    similar = semantic_cache.lookup(embedding)
+    if similar is not None:
+        logger.info(f"[Node] 이메일 {email['id']} 유사 이메일 분류 재사용")
+        update = _classification_update(email, similar, cache=False)
+        # n8n 분석 워크플로우를 건너뛰었으므로 분석 결과를 직접 DB에 저장 (실패하면 n8n으로 분석)
+        for analysis in update["classifications"]:
+            try:
+                await asyncio.to_thread(db.update_email_analysis, email['id'], analysis)
+            except Exception as e:
+                logger.error(f"[Node] 이메일 {email['id']} 재사용 분류 저장 실패: {e}")
+                return None, embedding
+        analysis_cache.put(_analysis_cache_key(email), update)
+        return update, None
+
+    return None, embedding
+
+
+def _classification_update(email: dict, result: Dict, embedding: Optional[List[float]] = None,
+                           cache: bool = True) -> Dict:
+    """
+    n8n 분석 응답 → classify 부분 상태 업데이트 변환 (단건/일괄 공통)
+
+    성공한 결과는 analysis_cache에 저장하고 (cache=False면 생략), embedding이 있으면 semantic_cache에도 저장합니다.
+    """
+    r = result
+    if not r.get("success", True):
+        logger.error(f"[Node] n8n 분석 실패: email_id={email['id']}, error={r.get('error')}")
+        return {"classifications": [], "important_emails": []}
+
+    # n8n 응답에서 분석 결과 추출
+    analysis = {
+        "email_id": email['id'],
+        "email_type": r.get("email_type", "기타"),
+        "importance_score": int(r.get("importance_score") or 5),
+        "needs_reply": _as_bool(r.get("needs_reply", False)),
+        "sentiment": r.get("sentiment", "neutral"),
+        "key_points": r.get("key_points", [])
+    }
+
+    logger.info(
+        f"[Node] 이메일 {email['id']} 분류 (RAG): "
+        f"{analysis.get('email_type')}, "
+        f"중요도 {analysis.get('importance_score')}"
+    )
+
+    update = {
+        "classifications": [analysis],
+        # 중요도 >= 7이면 important 리스트에 추가
+        "important_emails": [email['id']] if analysis['importance_score'] >= 7 else []
+    }
+    if cache:
+        analysis_cache.put(_analysis_cache_key(email), update)
+    if embedding is not None:
+        semantic_cache.add(embedding, analysis)
+
+    return update
+
+
+async def classify_one(payload: dict) -> Dict:
+    """
+    이메일 1개 분류 (n8n_tools → RAG → Gemini)
+
+    Returns:
+        {"classifications": [analysis], "important_emails": [email_id] 또는 []}
+        실패 시 빈 리스트 반환
+    """
+    email = payload["email"]
+
+    # 같은/비슷한 내용의 이메일을 TTL 안에 이미 분석했다면 캐시 사용
+    cached, embedding = await _lookup_caches(email)
+    if cached is not None:
+        return cached
+
+    try:
+        # n8n_tools를 통해 분석 (RAG 프롬프트 자동 적용)
+        result = await n8n_tools.analyze_email_async(
+            email_id=email['id'],
+            email_data=email,
+            use_rag=True  # RAG 프롬프트 엔지니어링 적용
+        )
+        return _classification_update(email, result, embedding)
+
+    except Exception as e:
+        logger.error(f"[Node] 이메일 {email['id']} 분석 실패: {e}")
+        return {"classifications": [], "important_emails": []}
+
+
+async def classify_batch(payloads: List[dict]) -> List[Dict]:
+    """
+    이메일 여러 개를 한 번의 batch webhook 호출로 분류
+
+    캐시(정확 일치/유사도) 적중분은 빼고 나머지만 n8n_tools.analyze_emails_batch()로 보냅니다.
+    batch webhook 호출 자체가 실패하면 예외를 그대로 올려 호출자가 단건 분류로 대체합니다.
+    """
+    updates: List[Dict] = [None] * len(payloads)
+    misses = []
+    embeddings = {}
+
+    for i, payload in enumerate(payloads):
+        cached, embedding = await _lookup_caches(payload["email"])
+        if cached is not None:
+            updates[i] = cached
+        else:
+            misses.append(i)
+            embeddings[i] = embedding
+
+    if misses:
+        emails = [payloads[i]["email"] for i in misses]
+        results = await n8n_tools.analyze_emails_batch_async(emails, use_rag=True)
+
+        for i, email, result in zip(misses, emails, results):
+            try:
+                updates[i] = _classification_update(email, result, embeddings[i])
+            except Exception as e:
+                logger.error(f"[Node] 이메일 {email['id']} 분석 결과 처리 실패: {e}")
+                updates[i] = {"classifications": [], "important_emails": []}
+
+    return updates
+
+
+def _stored_classification_update(row: dict) -> Dict:
+    """DB에 저장된 분석 결과 → classify 부분 상태 업데이트 (LLM 호출 없음)"""
+    analysis = {
+        "email_id": row['id'],
+        "email_type": row.get("email_type") or "기타",
+        "importance_score": int(row.get("importance_score") or 5),
+        "needs_reply": bool(row.get("needs_reply")),
+        "sentiment": row.get("sentiment") or "neutral",
+        "key_points": (row.get("ai_analysis") or {}).get("key_points", [])
+    }
+    return {
+        "classifications": [analysis],
+        "important_emails": [row['id']] if analysis['importance_score'] >= 7 else []
+    }
+
+
+async def classify_emails_node(state: EmailProcessingState) -> Dict:
     """
     Step 2: n8n_tools를 통해 이메일 분류 (RAG 적용)
 
     Phase 3 개선: 직접 webhook 호출 대신 n8n_tools.analyze_email() 사용
     → RAG 프롬프트 엔지니어링이 자동으로 적용됨
+
+    dispatch_classify로 만든 이메일별 작업을 ANALYZE_BATCH_SIZE개씩 묶어 batch webhook으로 보내고
+    (ANALYZE_BATCH_SIZE <= 1이면 이메일별 classify_one), asyncio.gather로 동시에 실행합니다.
+    Semaphore(CLASSIFY_CONCURRENCY)로 동시 요청 수를 제한합니다.
+
+    중복 ID는 제거하고, 오늘 이미 분류된 이메일은 DB의 분석 결과를 그대로 사용합니다.
     """
     logger.info(f"[Node] classify_emails_node 시작: {len(state['email_ids'])}개 이메일 (RAG 적용)")
 
@@ -89,48 +310,56 @@ def classify_emails_node(state: EmailProcessingState) -> Dict:
         }
 
     try:
-        # PostgreSQL에서 이메일 조회
-        emails = db.get_emails_by_ids(state["email_ids"])
+        # 중복 제거 (순서 유지) 후 오늘 이미 분류된 이메일은 건너뜀
+        email_ids = list(dict.fromkeys(state["email_ids"]))
+        todo_ids = await asyncio.to_thread(db.get_unclassified_ids, email_ids, date.today())
+        todo = set(todo_ids)
 
-        classifications = []
-        important_emails = []
+        already = [eid for eid in email_ids if eid not in todo]
+        stored_rows = await asyncio.to_thread(db.get_classifications_for, already) if already else []
+        if stored_rows:
+            logger.info(f"[Node] {len(stored_rows)}개 이메일은 오늘 이미 분류됨 (저장된 결과 사용)")
 
-        for email in emails:
-            try:
-                # n8n_tools를 통해 분석 (RAG 프롬프트 자동 적용)
-                result = n8n_tools.analyze_email(
-                    email_id=email['id'],
-                    email_data=email,
-                    use_rag=True  # RAG 프롬프트 엔지니어링 적용
-                )
+        # PostgreSQL에서 분류에 필요한 컬럼만 조회
+        emails = await asyncio.to_thread(db.get_emails_for_classification, email_ids)
 
-                if result.get("success", True):
-                    # n8n 응답에서 분석 결과 추출
-                    analysis = {
-                        "email_id": email['id'],
-                        "email_type": result.get("email_type", "기타"),
-                        "importance_score": int(result.get("importance_score", 5)),
-                        "needs_reply": result.get("needs_reply", "false").lower() == "true" if isinstance(result.get("needs_reply"), str) else result.get("needs_reply", False),
-                        "sentiment": result.get("sentiment", "neutral"),
-                        "key_points": result.get("key_points", [])
-                    }
-
-                    classifications.append(analysis)
-
-                    # 중요도 >= 7이면 important 리스트에 추가
-                    if analysis.get('importance_score', 0) >= 7:
-                        important_emails.append(email['id'])
-
-                    logger.info(
-                        f"[Node] 이메일 {email['id']} 분류 (RAG): "
-                        f"{analysis.get('email_type')}, "
-                        f"중요도 {analysis.get('importance_score')}"
-                    )
-                else:
-                    logger.error(f"[Node] n8n 분석 실패: email_id={email['id']}, error={result.get('error')}")
+        sem = asyncio.Semaphore(settings.CLASSIFY_CONCURRENCY or 8)
+        batch_size = settings.ANALYZE_BATCH_SIZE
 
+        async def _bounded(payload: dict) -> Dict:
+            async with sem:
+                return await classify_one(payload)
+
+        async def _bounded_batch(chunk: List[dict]) -> List[Dict]:
+            try:
+                async with sem:
+                    return await classify_batch(chunk)
             except Exception as e:
-                logger.error(f"[Node] 이메일 {email['id']} 분석 실패: {e}")
+                # batch webhook이 없거나 실패하면 단건 분석으로 대체
+                logger.warning(f"[Node] 일괄 분석 실패, 단건 분석으로 대체: {e}")
+                return await asyncio.gather(*(_bounded(p) for p in chunk))
+
+        payloads = dispatch_classify([email for email in emails if email['id'] in todo])
+
+        if batch_size > 1:
+            # batch_size개씩 묶어 1번의 HTTP 요청으로 보내고, 묶음끼리는 동시에 실행
+            chunks = [payloads[i:i + batch_size] for i in range(0, len(payloads), batch_size)]
+            chunk_updates = await asyncio.gather(*(_bounded_batch(chunk) for chunk in chunks))
+            updates = [update for chunk in chunk_updates for update in chunk]
+        else:
+            updates = await asyncio.gather(*(_bounded(p) for p in payloads))
+
+        updates = [_stored_classification_update(row) for row in stored_rows] + list(updates)
+
+        # 루프 안 LOAD_ATTR 제거용 로컬 바인딩
+        classifications = []
+        important_emails = []
+        add_classifications = classifications.extend
+        add_important = important_emails.extend
+
+        for update in updates:
+            add_classifications(update["classifications"])
+            add_important(update["important_emails"])
 
         return {
             "emails": emails,
@@ -149,9 +378,55 @@ def classify_emails_node(state: EmailProcessingState) -> Dict:
         }
 
 
-def generate_replies_node(state: EmailProcessingState) -> Dict:
+def dispatch_replies(state: EmailProcessingState) -> List[dict]:
+    """답변 생성 fan-out 디스패처: 중요 이메일 1개당 reply_one 페이로드 1개"""
+    emails_by_id = {email['id']: email for email in state.get("emails") or []}
+    return [
+        {"email_id": email_id, "email": emails_by_id.get(email_id)}
+        for email_id in state["important_emails"]
+    ]
+
+
+async def reply_one(payload: dict) -> Dict:
+    """
+    이메일 1개 답변 생성 (n8n GenerateReplyAgent)
+
+    Returns:
+        {"reply_drafts": {email_id: drafts}} (실패 시 빈 dict)
+    """
+    email_id = payload["email_id"]
+    email = payload.get("email")
+
+    # 이메일 내용을 알고 있으면 캐시 조회 (내용이 바뀌면 키도 바뀜)
+    cache_key = None
+    if email is not None:
+        cache_key = make_cache_key(email_id, email.get('subject'), email.get('body_text'), "reply_v1")
+        cached = reply_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"[Node] 이메일 {email_id} 답변 캐시 적중")
+            return {"reply_drafts": {email_id: cached}}
+
+    # n8n 워크플로우 호출
+    result = await n8n_tools.generate_reply_async(email_id=email_id)
+
+    if not result.get("success"):
+        return {"reply_drafts": {}}
+
+    drafts = result.get("reply_drafts", {})
+    if cache_key is not None:
+        reply_cache.put(cache_key, drafts)
+
+    logger.info(f"[Node] 이메일 {email_id} 답변 생성 완료")
+    return {"reply_drafts": {email_id: drafts}}
+
+
+async def generate_replies_node(state: EmailProcessingState) -> Dict:
     """
     Step 3: n8n GenerateReplyAgent 호출 (중요한 이메일만)
+
+    dispatch_replies로 만든 이메일별 reply_one 작업을 asyncio.gather로 동시에 실행하고,
+    Semaphore(REPLY_CONCURRENCY)로 동시 요청 수를 제한합니다.
+    실패한 이메일은 errors에 기록하고 나머지 답변은 그대로 반환합니다.
     """
     logger.info(f"[Node] generate_replies_node 시작: {len(state['important_emails'])}개 이메일")
 
@@ -162,20 +437,33 @@ def generate_replies_node(state: EmailProcessingState) -> Dict:
         }
 
     try:
-        reply_drafts = {}
+        sem = asyncio.Semaphore(settings.REPLY_CONCURRENCY or 4)
 
-        for email_id in state["important_emails"]:
-            # n8n 워크플로우 호출
-            result = n8n_tools.generate_reply(email_id=email_id)
+        async def _bounded(payload: dict) -> Dict:
+            async with sem:
+                return await reply_one(payload)
 
-            if result.get("success"):
-                reply_drafts[email_id] = result.get("reply_drafts", {})
-                logger.info(f"[Node] 이메일 {email_id} 답변 생성 완료")
+        payloads = dispatch_replies(state)
+        updates = await asyncio.gather(*(_bounded(p) for p in payloads), return_exceptions=True)
 
-        return {
+        reply_drafts = {}
+        errors = []
+
+        for payload, update in zip(payloads, updates):
+            if isinstance(update, Exception):
+                logger.error(f"[Node] 이메일 {payload['email_id']} 답변 생성 실패: {update}")
+                errors.append(f"reply {payload['email_id']}: {update}")
+                continue
+            reply_drafts = merge_reply_drafts(reply_drafts, update["reply_drafts"])
+
+        result = {
             "reply_drafts": reply_drafts,
             "current_step": "replies_generated"
         }
+        if errors:
+            result["errors"] = state.get("errors", []) + errors
+
+        return result
 
     except Exception as e:
         logger.error(f"[Node] generate_replies_node 실패: {e}")
@@ -186,9 +474,98 @@ def generate_replies_node(state: EmailProcessingState) -> Dict:
         }
 
 
-def send_replies_node(state: EmailProcessingState) -> Dict:
+class ReplySendQueue:
+    """
+    승인된 답변 백그라운드 발송 큐
+
+    send_replies_node는 답변을 큐에 넣기만 하고 바로 반환하며,
+    워커 태스크가 n8n SendEmailAgent 호출을 순서대로 처리합니다 (실패 시 재시도).
+    큐와 워커는 이벤트 루프별로 만들어지므로, 루프를 닫기 전에 drain()을 호출해야 합니다.
+    drain() 없이 다른 루프에서 enqueue하면 이전 큐에 남은 답변은 새 큐로 옮겨 발송합니다.
+    """
+
+    def __init__(self, max_retries: int = 3, retry_delay: float = 2.0, max_failed: int = 100):
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        # 재시도 후에도 실패한 답변 (최근 max_failed개만 보관, 오래된 것부터 버림)
+        self.failed: Deque[dict] = deque(maxlen=max_failed)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop = None
+
+    def _ensure_worker(self):
+        """현재 이벤트 루프에 큐/워커가 없으면 생성"""
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            old_queue = self._queue
+            self._queue = asyncio.Queue()
+            self._loop = loop
+            self._worker = loop.create_task(self._run())
+
+            # 이전 루프의 큐에 남은 답변을 새 큐로 이동 (이전 워커는 루프와 함께 멈춤)
+            moved = 0
+            while old_queue is not None and not old_queue.empty():
+                self._queue.put_nowait(old_queue.get_nowait())
+                moved += 1
+            if moved:
+                logger.warning(f"[SendQueue] 이전 이벤트 루프 큐에 남은 답변 {moved}개를 새 큐로 이동")
+
+    def enqueue(self, reply: dict):
+        """답변 발송 예약 (즉시 반환)"""
+        self._ensure_worker()
+        self._queue.put_nowait(reply)
+
+    @property
+    def pending(self) -> int:
+        """발송 대기 중인 답변 수"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _run(self):
+        while True:
+            reply = await self._queue.get()
+            try:
+                await self._send_with_retry(reply)
+            finally:
+                self._queue.task_done()
+
+    async def _send_with_retry(self, reply: dict):
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                # n8n 워크플로우 호출
+                await n8n_tools.send_email_async(
+                    to_email=reply["to_email"],
+                    subject=reply["subject"],
+                    body=reply["body"],
+                    to_name=reply.get("to_name")
+                )
+                logger.info(f"[SendQueue] {reply['to_email']}로 답변 발송 완료")
+                return
+
+            except Exception as e:
+                logger.warning(f"[SendQueue] {reply['to_email']} 발송 실패 ({attempt}/{self.max_retries}): {e}")
+                if attempt < self.max_retries:
+                    await asyncio.sleep(self.retry_delay * attempt)
+
+        if len(self.failed) == self.failed.maxlen:
+            logger.warning(f"[SendQueue] 실패 목록이 가득 차 가장 오래된 항목 {self.failed[0]['to_email']}을 버립니다")
+        logger.error(f"[SendQueue] {reply['to_email']} 발송 최종 실패")
+        self.failed.append(reply)
+
+    async def drain(self):
+        """대기 중인 발송이 모두 끝날 때까지 대기"""
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+
+
+# 답변 발송 큐 (EmailProcessor.drain()으로 종료 시 비움)
+reply_send_queue = ReplySendQueue()
+
+
+async def send_replies_node(state: EmailProcessingState) -> Dict:
     """
     Step 4: n8n SendEmailAgent 호출 (사용자 승인된 답변만)
+
+    발송 결과를 기다리지 않도록 reply_send_queue에 넣고 바로 반환합니다.
     """
     logger.info(f"[Node] send_replies_node 시작: {len(state['approved_replies'])}개 답변")
 
@@ -199,18 +576,12 @@ def send_replies_node(state: EmailProcessingState) -> Dict:
 
     try:
         for reply in state["approved_replies"]:
-            # n8n 워크플로우 호출
-            n8n_tools.send_email(
-                to_email=reply["to_email"],
-                subject=reply["subject"],
-                body=reply["body"],
-                to_name=reply.get("to_name")
-            )
+            reply_send_queue.enqueue(reply)
 
-            logger.info(f"[Node] {reply['to_email']}로 답변 발송 완료")
+        logger.info(f"[Node] {len(state['approved_replies'])}개 답변 발송 예약")
 
         return {
-            "current_step": "sent"
+            "current_step": "send_queued"
         }
 
     except Exception as e:
@@ -221,7 +592,7 @@ def send_replies_node(state: EmailProcessingState) -> Dict:
         }
 
 
-def summarize_emails_node(state: EmailProcessingState) -> Dict:
+async def summarize_emails_node(state: EmailProcessingState) -> Dict:
     """
     Step 5: n8n SummarizeEmailAgent 호출
     """
@@ -229,7 +600,7 @@ def summarize_emails_node(state: EmailProcessingState) -> Dict:
 
     try:
         # n8n 워크플로우 호출
-        result = n8n_tools.summarize_emails(
+        result = await n8n_tools.summarize_emails_async(
             email_ids=state.get("email_ids")
         )
 
@@ -275,8 +646,9 @@ def should_send_replies(state: EmailProcessingState) -> str:
 
 # ========== Graph 구성 ==========
 
+@functools.cache
 def create_email_processing_graph():
-    """이메일 처리 그래프 생성"""
+    """이메일 처리 그래프 생성 (컴파일 결과를 프로세스 내에서 공유)"""
 
     workflow = StateGraph(EmailProcessingState)
 
@@ -315,8 +687,9 @@ def create_email_processing_graph():
     return workflow.compile()
 
 
+@functools.cache
 def create_daily_summary_graph():
-    """일일 요약 그래프 생성"""
+    """일일 요약 그래프 생성 (컴파일 결과를 프로세스 내에서 공유)"""
 
     workflow = StateGraph(EmailProcessingState)
 
@@ -342,10 +715,30 @@ class EmailProcessor:
     def __init__(self):
         self.email_processing_graph = create_email_processing_graph()
         self.daily_summary_graph = create_daily_summary_graph()
+        self.send_queue = reply_send_queue
+
+    async def drain(self):
+        """백그라운드 답변 발송 완료 대기 (종료 시 호출)"""
+        await self.send_queue.drain()
 
     def process_new_emails(self) -> Dict:
         """
-        새 이메일 처리 워크플로우
+        새 이메일 처리 워크플로우 (동기 래퍼)
+
+        이벤트 루프 밖에서 호출할 때 사용합니다.
+        FastAPI 등 async 컨텍스트에서는 process_new_emails_async()를 사용하세요.
+        """
+        async def _run() -> Dict:
+            final_state = await self.process_new_emails_async()
+            # 이벤트 루프가 닫히기 전에 예약된 답변 발송을 마침
+            await self.drain()
+            return final_state
+
+        return asyncio.run(_run())
+
+    async def process_new_emails_async(self) -> Dict:
+        """
+        새 이메일 처리 워크플로우 (stream_new_emails()를 끝까지 소비해 최종 state 반환)
 
         Returns:
             {
@@ -356,10 +749,20 @@ class EmailProcessor:
                 "current_step": "replies_generated"
             }
         """
-        logger.info("[Supervisor] process_new_emails 시작")
+        final_state = self._initial_state("process_new_emails")
+
+        async for step in self.stream_new_emails():
+            for update in step.values():
+                apply_state_update(final_state, update or {})
+
+        logger.info(f"[Supervisor] process_new_emails 완료: {final_state['current_step']}")
 
-        initial_state: EmailProcessingState = {
-            "task": "process_new_emails",
+        return final_state
+
+    def _initial_state(self, task: str) -> EmailProcessingState:
+        """워크플로우 초기 state"""
+        return {
+            "task": task,
             "email_ids": [],
             "emails": [],
             "classifications": [],
@@ -371,13 +774,30 @@ class EmailProcessor:
             "errors": []
         }
 
-        final_state = self.email_processing_graph.invoke(initial_state)
+    async def stream_new_emails(self) -> AsyncIterator[Dict]:
+        """
+        새 이메일 처리 워크플로우 (노드별 결과 스트리밍)
 
-        logger.info(f"[Supervisor] process_new_emails 완료: {final_state['current_step']}")
+        각 노드가 끝날 때마다 {노드 이름: 부분 업데이트}를 yield 합니다.
+        분류 결과를 답변 생성이 끝나기 전에 화면에 보여줄 수 있습니다.
+        """
+        logger.info("[Supervisor] process_new_emails 시작")
 
-        return final_state
+        async for step in self.email_processing_graph.astream(
+            self._initial_state("process_new_emails"),
+            stream_mode="updates"
+        ):
+            yield step
 
     def generate_daily_summary(self) -> Dict:
+        """
+        일일 요약 생성 워크플로우 (동기 래퍼)
+
+        FastAPI 등 async 컨텍스트에서는 generate_daily_summary_async()를 사용하세요.
+        """
+        return asyncio.run(self.generate_daily_summary_async())
+
+    async def generate_daily_summary_async(self) -> Dict:
         """
         일일 요약 생성 워크플로우
 
@@ -389,20 +809,9 @@ class EmailProcessor:
         """
         logger.info("[Supervisor] generate_daily_summary 시작")
 
-        initial_state: EmailProcessingState = {
-            "task": "daily_summary",
-            "email_ids": [],
-            "emails": [],
-            "classifications": [],
-            "important_emails": [],
-            "reply_drafts": {},
-            "approved_replies": [],
-            "summary": None,
-            "current_step": "init",
-            "errors": []
-        }
+        initial_state = self._initial_state("daily_summary")
 
-        final_state = self.daily_summary_graph.invoke(initial_state)
+        final_state = await self.daily_summary_graph.ainvoke(initial_state)
 
         logger.info(f"[Supervisor] generate_daily_summary 완료")
 
@@ -447,11 +856,22 @@ class EmailProcessor:
             }
 
     def analyze_multiple_emails(self, email_ids: List[int]) -> Dict:
+        """
+        여러 이메일 분석 워크플로우 (동기 래퍼)
+
+        async 컨텍스트에서는 analyze_multiple_emails_async()를 사용하세요.
+        """
+        return asyncio.run(self.analyze_multiple_emails_async(email_ids))
+
+    async def analyze_multiple_emails_async(self, email_ids: List[int], emails: Optional[List[Dict]] = None) -> Dict:
         """
         여러 이메일 분석 워크플로우 (n8n을 통해 Gemini 호출)
 
+        이메일별 분석을 asyncio.gather로 동시에 실행합니다 (Semaphore(CLASSIFY_CONCURRENCY)로 제한).
+
         Args:
             email_ids: 분석할 이메일 ID 리스트
+            emails: 이미 조회한 이메일 행 (email_ids와 같은 순서, 있으면 이메일별 DB 재조회 생략)
 
         Returns:
             {
@@ -464,27 +884,48 @@ class EmailProcessor:
         """
         logger.info(f"[Supervisor] analyze_multiple_emails 시작: {len(email_ids)}개 이메일")
 
-        results = []
+        sem = asyncio.Semaphore(settings.CLASSIFY_CONCURRENCY or 8)
 
-        for email_id in email_ids:
-            try:
-                result = n8n_tools.analyze_email(email_id)
-                results.append({
-                    "email_id": email_id,
-                    "success": result.get("success", True),
-                    "analysis": result.get("analysis", {})
-                })
-                logger.info(f"[Supervisor] 이메일 {email_id} 분석 완료")
+        async def _bounded(email_id: int, email_data: Optional[Dict]) -> Dict:
+            async with sem:
+                return await n8n_tools.analyze_email_async(email_id, email_data=email_data)
 
-            except Exception as e:
-                logger.error(f"[Supervisor] 이메일 {email_id} 분석 실패: {e}")
-                results.append({
+        rows = emails if emails is not None else [None] * len(email_ids)
+        raw = await asyncio.gather(
+            *(_bounded(eid, row) for eid, row in zip(email_ids, rows)),
+            return_exceptions=True
+        )
+
+        # 결과 개수를 알고 있으므로 미리 할당 + 로컬 바인딩
+        results = [None] * len(email_ids)
+        succeeded = 0
+        failed = 0
+        log_info = logger.info
+
+        for i, (email_id, result) in enumerate(zip(email_ids, raw)):
+            if isinstance(result, Exception):
+                logger.error(f"[Supervisor] 이메일 {email_id} 분석 실패: {result}")
+                results[i] = {
                     "email_id": email_id,
                     "success": False,
-                    "error": str(e)
-                })
+                    "error": str(result)
+                }
+                failed += 1
+                continue
 
-        logger.info(f"[Supervisor] analyze_multiple_emails 완료: 성공={sum(1 for r in results if r['success'])}, 실패={sum(1 for r in results if not r['success'])}")
+            success = result.get("success", True)
+            results[i] = {
+                "email_id": email_id,
+                "success": success,
+                "analysis": result.get("analysis", {})
+            }
+            if success:
+                succeeded += 1
+            else:
+                failed += 1
+            log_info(f"[Supervisor] 이메일 {email_id} 분석 완료")
+
+        logger.info(f"[Supervisor] analyze_multiple_emails 완료: 성공={succeeded}, 실패={failed}")
 
         return {
             "total": len(email_ids),
@@ -492,5 +933,15 @@ class EmailProcessor:
         }
 
 
-# 전역 인스턴스
-email_processor = EmailProcessor()
+# 전역 인스턴스 (첫 사용 시 생성)
+@functools.cache
+def get_email_processor() -> EmailProcessor:
+    """EmailProcessor 싱글톤 반환 (import 시점에는 그래프를 만들지 않음)"""
+    return EmailProcessor()
+
+
+def __getattr__(name):
+    """기존 `from src.agents.email_processor import email_processor` 호환 (PEP 562, 접근 시점에 생성)"""
+    if name == "email_processor":
+        return get_email_processor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -10,6 +10,11 @@ class Settings:
     POSTGRES_USER: str = os.getenv("MY_POSTGRES_USER", "postgres")
     POSTGRES_PASSWORD: str = os.getenv("MY_POSTGRES_PASSWORD", "")
     POSTGRES_PORT: int = int(os.getenv("MY_POSTGRES_PORT", "5432"))
+    # 커넥션 풀 크기 (요청마다 새 연결 대신 재사용)
+    DB_POOL_MIN: int = int(os.getenv("MY_DB_POOL_MIN", "5"))
+    DB_POOL_MAX: int = int(os.getenv("MY_DB_POOL_MAX", "20"))
+    # 풀이 모두 사용 중일 때 빈 연결을 기다리는 최대 시간 (초)
+    DB_POOL_TIMEOUT: float = float(os.getenv("MY_DB_POOL_TIMEOUT", "30"))
 
     # Gemini API
     GEMINI_API_KEY: str = os.getenv("MY_GEMINI_API_KEY", "")
@@ -18,6 +23,20 @@ class Settings:
     NAVER_EMAIL: str = os.getenv("MY_NAVER_EMAIL", "")
     NAVER_NAME: str = os.getenv("MY_NAVER_NAME", "")
 
+    # LangGraph 워크플로우 동시 실행 수 (n8n/Gemini Rate Limit 고려)
+    CLASSIFY_CONCURRENCY: int = int(os.getenv("MY_CLASSIFY_CONCURRENCY", "8"))
+    REPLY_CONCURRENCY: int = int(os.getenv("MY_REPLY_CONCURRENCY", "4"))
+
+    # 일괄 분석 webhook 1회당 이메일 수 (1 이하면 이메일별 단건 호출)
+    # analyze-batch 워크플로우(n8n_workflows/workflow_4_email_analysis.md)를 n8n에 만든 뒤에만 1보다 크게 설정
+    ANALYZE_BATCH_SIZE: int = int(os.getenv("MY_ANALYZE_BATCH_SIZE", "1"))
+
+    # 유사 이메일 분석 결과 재사용 (임베딩 코사인 유사도 기준값, 0이면 비활성화)
+    SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("MY_SEMANTIC_CACHE_THRESHOLD", "0.92"))
+
+    # 이 점수 미만으로 분류된 이메일은 RAG 검색 생략 (마케팅/공지는 점수와 상관없이 생략)
+    RAG_MIN_IMPORTANCE: int = int(os.getenv("MY_RAG_MIN_IMPORTANCE", "5"))
+
     @property
     def database_url(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
@@ -14,19 +14,31 @@ from .code import (
     AnalysisEvaluation,
     ReplyEvaluation,
     SummaryEvaluation,
-    evaluator,
+    get_evaluator,
     create_ground_truth_template,
     DatasetGenerator,
-    dataset_generator,
+    get_dataset_generator,
 )
 
+
+def __getattr__(name):
+    """evaluator / dataset_generator 싱글톤은 첫 접근 시 생성 (기존 임포트 호환)"""
+    if name == "evaluator":
+        return get_evaluator()
+    if name == "dataset_generator":
+        return get_dataset_generator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     'PerformanceEvaluator',
     'AnalysisEvaluation',
     'ReplyEvaluation',
     'SummaryEvaluation',
     'evaluator',
+    'get_evaluator',
     'create_ground_truth_template',
     'DatasetGenerator',
     'dataset_generator',
+    'get_dataset_generator',
 ]
@@ -12,15 +12,23 @@ from .performance_evaluator import (
     AnalysisEvaluation,
     ReplyEvaluation,
     SummaryEvaluation,
-    evaluator,
+    get_evaluator,
     create_ground_truth_template
 )
 
 from .dataset_generator import (
     DatasetGenerator,
-    dataset_generator
+    get_dataset_generator
 )
 
+
+def __getattr__(name):
+    """evaluator 싱글톤은 첫 접근 시 생성 (dataset_generator는 서브모듈, 싱글톤은 get_dataset_generator())"""
+    if name == "evaluator":
+        return get_evaluator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     # 평가 클래스
     'PerformanceEvaluator',
@@ -28,9 +36,10 @@ __all__ = [
     'ReplyEvaluation',
     'SummaryEvaluation',
     'evaluator',
+    'get_evaluator',
     'create_ground_truth_template',
 
     # 데이터셋 생성
     'DatasetGenerator',
-    'dataset_generator',
+    'get_dataset_generator',
 ]
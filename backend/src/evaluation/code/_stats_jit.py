@@ -0,0 +1,65 @@
+"""
+점수 통계 커널 (numba JIT, numba가 없으면 numpy)
+
+row_moments(x) → 행별 (합계, 제곱합, 최소, 최대)
+- x는 (필드 수, 개수) 2차원 점수 행렬 (AnalysisScoreColumns의 matrix() 형식)
+- 합계/제곱합만 돌려주므로 평균/분산은 호출 측이 누적 통계와 합쳐서 계산합니다.
+- numba 설치 시 행렬을 1번만 순회하는 단일 스레드 커널을 사용합니다.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba가 없으면 numpy 연산으로 대체
+    njit = None
+
+
+def _row_moments_loop(x, sums, sumsqs, mins, maxs):
+    """행마다 1번 순회: 합계 / 제곱합 / 최소 / 최대 (결과는 out 배열에 기록)"""
+    for r in range(x.shape[0]):
+        total = 0.0
+        total_sq = 0.0
+        mn = x[r, 0]
+        mx = x[r, 0]
+        for c in range(x.shape[1]):
+            v = x[r, c]
+            total += v
+            total_sq += v * v
+            if v < mn:
+                mn = v
+            if v > mx:
+                mx = v
+        sums[r] = total
+        sumsqs[r] = total_sq
+        mins[r] = mn
+        maxs[r] = mx
+
+
+def _row_moments_numpy(x, sums, sumsqs, mins, maxs):
+    """numba가 없을 때: 같은 값을 numpy 리덕션으로"""
+    x.sum(axis=1, out=sums)
+    np.square(x).sum(axis=1, out=sumsqs)
+    x.min(axis=1, out=mins)
+    x.max(axis=1, out=maxs)
+
+
+# fastmath는 합산 순서를 바꿔 numpy 결과와 달라질 수 있으므로 사용하지 않음
+_row_moments = njit(nogil=True, cache=True)(_row_moments_loop) if njit is not None else _row_moments_numpy
+
+
+def row_moments(x) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    2차원 점수 행렬의 행별 (합계, 제곱합, 최소, 최대)
+
+    열이 없으면 합계/제곱합은 0, 최소/최대는 +inf / -inf (누적 통계와 합쳐도 값이 바뀌지 않음)
+    """
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    rows = x.shape[0]
+    sums, sumsqs = np.zeros(rows), np.zeros(rows)
+    mins, maxs = np.full(rows, np.inf), np.full(rows, -np.inf)
+    if x.shape[1]:
+        _row_moments(x, sums, sumsqs, mins, maxs)
+    return sums, sumsqs, mins, maxs
@@ -0,0 +1,28 @@
+"""
+합성 코퍼스 MessagePack 생성 스크립트
+
+_synthetic_corpus.py의 리터럴을 data/_synthetic_corpus.msgpack으로 저장합니다.
+원본의 sha256을 .msgpack.sha256에 함께 기록하고, dataset_generator는 해시가
+현재 원본과 같을 때만 리터럴 대신 이 파일을 디코딩합니다.
+
+사용법:
+    python bake_dataset.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from _synthetic_corpus import SYNTHETIC_EMAILS
+from dataset_generator import SYNTHETIC_CORPUS_FILE, SYNTHETIC_CORPUS_SOURCE, _write_msgpack, _write_stamps
+
+
+def main():
+    SYNTHETIC_CORPUS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    _write_msgpack(SYNTHETIC_CORPUS_FILE, list(SYNTHETIC_EMAILS))
+    _write_stamps(SYNTHETIC_CORPUS_SOURCE, [SYNTHETIC_CORPUS_FILE])
+    print(f"합성 코퍼스 저장 완료: {SYNTHETIC_CORPUS_FILE} ({len(SYNTHETIC_EMAILS)}개)")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,713 +7,739 @@
 - Ground Truth 포함
 """
 
+import functools
+import hashlib
+import io
 import json
 import os
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from functools import cached_property
 from pathlib import Path
 
-# 현재 파일 기준 data 폴더 경로
-DATA_DIR = Path(__file__).parent.parent / "data"
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
 
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
 
-class DatasetGenerator:
-    """테스트 데이터셋 생성기"""
+try:
+    from numba import njit
+except ImportError:  # numba가 없으면 numpy 벡터 연산으로 대체
+    njit = None
 
-    def __init__(self):
-        self.test_emails: List[Dict] = []
-        self.ground_truth: List[Dict] = []
-
-    def generate_synthetic_emails(self) -> List[Dict]:
-        """
-        합성 테스트 이메일 생성
-        각 유형별로 다양한 케이스 포함
-        """
-        synthetic_emails = [
-            # ========== 채용 관련 (5개) ==========
-            {
-                "id": "synthetic_001",
-                "subject": "[ABC회사] 서류 전형 합격 및 면접 안내",
-                "sender_name": "ABC회사 인사팀",
-                "sender_address": "hr@abc-company.com",
-                "body_text": """안녕하세요, 홍길동님.
+def _resolve_data_dir() -> Path:
+    """
+    data 폴더 경로 (임포트 시 1번만 계산)
 
-ABC회사 백엔드 개발자 채용에 지원해 주셔서 감사합니다.
+    1. MY_EVAL_DATA_DIR 환경변수 (zip 배포 등 패키지 안에 쓸 수 없을 때)
+    2. 패키지로 임포트된 경우 importlib.resources 기준 evaluation/data
+    3. 스크립트로 직접 실행한 경우 현재 파일 기준 ../data
+    """
+    env_dir = os.getenv("MY_EVAL_DATA_DIR")
+    if env_dir:
+        return Path(env_dir)
 
-서류 전형 결과, 귀하께서 합격하셨음을 알려드립니다.
-다음 단계인 1차 면접 일정을 아래와 같이 안내드립니다.
+    parent_package = (__package__ or "").rpartition(".")[0]
+    if parent_package:
+        from importlib import resources
 
-- 일시: 2024년 12월 10일 (화) 오후 2시
-- 장소: ABC회사 본사 3층 회의실
-- 준비물: 신분증, 포트폴리오
+        data_dir = resources.files(parent_package) / "data"
+        if isinstance(data_dir, Path):  # 일반 파일시스템 (zip 안이면 아래 경로 사용)
+            return data_dir
 
-참석 가능 여부를 12월 6일까지 회신 부탁드립니다.
+    return Path(__file__).parent.parent / "data"
 
-감사합니다.
-ABC회사 인사팀 드림""",
-                "received_at": "2024-12-04T09:00:00",
-                "ground_truth": {
-                    "email_type": "채용",
-                    "importance_score": 9,
-                    "needs_reply": True,
-                    "sentiment": "positive",
-                    "key_points": ["서류 합격", "면접 일정 12/10", "참석 여부 회신 필요"]
-                }
-            },
-            {
-                "id": "synthetic_002",
-                "subject": "면접 결과 안내 - 불합격",
-                "sender_name": "XYZ테크 채용담당",
-                "sender_address": "recruit@xyztech.co.kr",
-                "body_text": """안녕하세요.
 
-XYZ테크 프론트엔드 개발자 채용에 지원해 주셔서 감사합니다.
+DATA_DIR = _resolve_data_dir()
+
+
+def _read_json(filepath: Path):
+    """
+    JSON 파일 로드 (파일 전체를 bytes로 한 번에 읽어서 파싱)
+
+    msgspec → orjson → 표준 json 순으로 사용 가능한 디코더를 씁니다.
+    결과는 항상 dict/list (기존 호출자와 동일)
+    """
+    return _decode_json(filepath.read_bytes())
+
+
+def _decode_json(data: bytes):
+    """JSON bytes 파싱 (msgspec → orjson → 표준 json)"""
+    if msgspec is not None:
+        return msgspec.json.decode(data)
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
-안타깝게도 이번 채용에서는 귀하의 합류가 어렵게 되었습니다.
-더 좋은 기회가 있으시길 바라며, 앞으로의 발전을 응원합니다.
 
-감사합니다.""",
-                "received_at": "2024-12-04T10:00:00",
-                "ground_truth": {
-                    "email_type": "채용",
-                    "importance_score": 7,
-                    "needs_reply": False,
-                    "sentiment": "negative",
-                    "key_points": ["불합격 통보"]
-                }
-            },
-            {
-                "id": "synthetic_003",
-                "subject": "코딩테스트 안내",
-                "sender_name": "스타트업A HR",
-                "sender_address": "hr@startup-a.io",
-                "body_text": """안녕하세요.
+# 분류 라벨 (intern된 문자열 1개씩 공유, 파일에는 라벨 인덱스로 저장)
+EMAIL_TYPE_LABELS = tuple(sys.intern(t) for t in ("채용", "마케팅", "공지", "개인", "기타"))
+SENTIMENT_LABELS = tuple(sys.intern(t) for t in ("positive", "neutral", "negative"))
+
+# 라벨 인덱스로 저장하는 컬럼 → 라벨 목록
+LABEL_COLUMNS = {
+    "email_types": EMAIL_TYPE_LABELS,
+    "sentiments": SENTIMENT_LABELS,
+}
 
-스타트업A 개발자 채용 프로세스의 일환으로 코딩테스트를 안내드립니다.
+# Ground Truth 컬럼형(SoA) 저장 형식: 필드 이름 → 컬럼 이름 (version 2.1)
+GROUND_TRUTH_COLUMNS = {
+    "id": "ids",
+    "subject": "subjects",
+    "email_type": "email_types",
+    "importance_score": "importance_scores",
+    "needs_reply": "needs_reply",
+    "sentiment": "sentiments",
+    "key_points": "key_points",
+}
 
-- 응시 기간: 12월 5일 ~ 12월 7일
-- 소요 시간: 약 2시간
-- 문제 수: 3문제 (알고리즘 2, SQL 1)
-- 링크: https://test.example.com/abc123
 
-기한 내 응시 부탁드립니다.
+def decode_label_columns(data: Dict) -> Dict:
+    """
+    라벨 인덱스 컬럼을 문자열로 복원 (version 2.1, 제자리 변환 후 data 반환)
 
-감사합니다.""",
-                "received_at": "2024-12-04T11:00:00",
-                "ground_truth": {
-                    "email_type": "채용",
-                    "importance_score": 8,
-                    "needs_reply": False,
-                    "sentiment": "neutral",
-                    "key_points": ["코딩테스트 안내", "기한 12/5~12/7", "2시간 소요"]
-                }
-            },
-            {
-                "id": "synthetic_004",
-                "subject": "연봉 협상 관련 문의",
-                "sender_name": "DEF기업 인사",
-                "sender_address": "hr@def-corp.com",
-                "body_text": """안녕하세요, 홍길동님.
+    복원된 문자열은 intern되어 같은 라벨끼리 같은 객체를 공유합니다.
+    """
+    labels = data.pop("labels", None)
+    if labels:
+        columns = data["columns"]
+        for column, names in labels.items():
+            names = [sys.intern(name) for name in names]
+            columns[column] = [names[idx] if idx is not None else None for idx in columns[column]]
+    return data
 
-최종 면접 합격을 축하드립니다!
 
-처우 협의를 위해 아래 내용을 확인 부탁드립니다.
-- 희망 연봉
-- 입사 가능일
-- 현재 재직 여부
+def ground_truth_row(columns: Dict, i: int) -> Dict:
+    """컬럼형 Ground Truth에서 i번째 정답을 행(dict) 형태로 반환 (라벨은 복원된 상태여야 함)"""
+    return {field: columns[column][i] for field, column in GROUND_TRUTH_COLUMNS.items()}
+
 
-회신 부탁드립니다.
+def ground_truth_rows(data: Dict) -> List[Dict]:
+    """Ground Truth 파일 → 행 리스트 (version 1.0 행 형식 / 2.x 컬럼 형식 모두 지원)"""
+    if "columns" not in data:
+        return data["ground_truths"]
+
+    columns = decode_label_columns(data)["columns"]
+    return [ground_truth_row(columns, i) for i in range(len(columns["ids"]))]
 
-감사합니다.""",
-                "received_at": "2024-12-04T14:00:00",
-                "ground_truth": {
-                    "email_type": "채용",
-                    "importance_score": 10,
-                    "needs_reply": True,
-                    "sentiment": "positive",
-                    "key_points": ["최종 합격", "연봉 협상", "입사일 문의"]
-                }
-            },
-            {
-                "id": "synthetic_005",
-                "subject": "이력서 접수 확인",
-                "sender_name": "채용플랫폼",
-                "sender_address": "noreply@jobplatform.com",
-                "body_text": """이력서가 정상적으로 접수되었습니다.
-
-지원 정보:
-- 회사: GHI컴퍼니
-- 포지션: 데이터 엔지니어
-- 접수일: 2024년 12월 4일
-
-서류 검토 후 개별 연락드리겠습니다.
-
-감사합니다.""",
-                "received_at": "2024-12-04T15:00:00",
-                "ground_truth": {
-                    "email_type": "채용",
-                    "importance_score": 5,
-                    "needs_reply": False,
-                    "sentiment": "neutral",
-                    "key_points": ["이력서 접수 확인", "서류 검토 예정"]
-                }
-            },
 
-            # ========== 마케팅 관련 (5개) ==========
-            {
-                "id": "synthetic_006",
-                "subject": "[50% 할인] 블랙프라이데이 특별 프로모션!",
-                "sender_name": "쇼핑몰A",
-                "sender_address": "marketing@shoppingmall.com",
-                "body_text": """🎉 블랙프라이데이 특별 할인!
+def ground_truth_by_id(data: Dict) -> Dict[str, Dict]:
+    """
+    Ground Truth 파일 → {id: 정답 행}
+
+    행 리스트를 따로 만들지 않고, 컬럼형이면 컬럼들을 zip해서 한 번에 dict를 채웁니다.
+    """
+    if "columns" not in data:
+        return {gt["id"]: gt for gt in data["ground_truths"]}
+
+    columns = decode_label_columns(data)["columns"]
+    fields = tuple(GROUND_TRUTH_COLUMNS)
+    return {
+        values[0]: dict(zip(fields, values))  # fields[0] == "id"
+        for values in zip(*(columns[column] for column in GROUND_TRUTH_COLUMNS.values()))
+    }
 
-전 상품 최대 50% 할인!
-- 기간: 11월 24일 ~ 11월 27일
-- 쿠폰코드: BLACKFRI2024
 
-지금 바로 쇼핑하세요!
+def _stream_json_array(filepath: Path, header: Dict, key: str, items) -> None:
+    """
+    JSON 객체를 스트리밍으로 저장
+
+    header의 키들을 먼저 쓰고, key 배열은 원소 1개씩 인코딩해서 64KB 버퍼로 씁니다.
+    (전체 데이터셋을 하나의 문자열로 만들지 않음, 배열 원소는 한 줄에 1개)
+    """
+    if orjson is not None:
+        def dumps(obj) -> bytes:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        def dumps(obj) -> bytes:
+            return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    with open(filepath, "wb", buffering=0) as raw, io.BufferedWriter(raw, buffer_size=64 * 1024) as buf:
+        buf.write(dumps(header)[:-1])  # 닫는 } 제외
+        if header:
+            buf.write(b",")
+        buf.write(dumps(key) + b":[\n")
+
+        for i, item in enumerate(items):
+            if i:
+                buf.write(b",\n")
+            buf.write(dumps(item))
+
+        buf.write(b"\n]}\n")
+
+
+def _write_msgpack(filepath: Path, data) -> None:
+    """MessagePack 파일 저장 (msgspec 필요)"""
+    if msgspec is None:
+        raise RuntimeError("msgspec이 설치되지 않아 MessagePack으로 저장할 수 없습니다")
+    filepath.write_bytes(msgspec.msgpack.encode(data))
+
+
+def _file_sha256(filepath: Path) -> str:
+    """파일 내용 sha256 (사본이 어떤 JSON에서 만들어졌는지 비교용)"""
+    return hashlib.sha256(filepath.read_bytes()).hexdigest()
+
+
+def _stamp_path(copy_path: Path) -> Path:
+    """사본(.msgpack / .json.zst) 옆에 두는 원본 JSON 해시 파일 경로"""
+    return copy_path.with_name(copy_path.name + ".sha256")
+
 
-수신거부: unsubscribe@shoppingmall.com""",
-                "received_at": "2024-11-24T08:00:00",
-                "ground_truth": {
-                    "email_type": "마케팅",
-                    "importance_score": 2,
-                    "needs_reply": False,
-                    "sentiment": "positive",
-                    "key_points": ["50% 할인", "블랙프라이데이", "쿠폰코드"]
-                }
-            },
-            {
-                "id": "synthetic_007",
-                "subject": "새로운 기능 출시 안내 - RunPod",
-                "sender_name": "RunPod Team",
-                "sender_address": "team@runpod.io",
-                "body_text": """RunPod의 새로운 기능을 소개합니다!
-
-Load Balancer가 출시되었습니다.
-- 실시간 스트리밍 지원
-- 저지연 API 엔드포인트
-- vLLM 최적화
-
-자세한 내용은 문서를 확인하세요.
-
-Unsubscribe | Manage Preferences""",
-                "received_at": "2024-12-01T10:00:00",
-                "ground_truth": {
-                    "email_type": "마케팅",
-                    "importance_score": 3,
-                    "needs_reply": False,
-                    "sentiment": "positive",
-                    "key_points": ["새 기능 출시", "Load Balancer", "기술 업데이트"]
-                }
-            },
-            {
-                "id": "synthetic_008",
-                "subject": "무료 웨비나 초대 - AI 트렌드 2025",
-                "sender_name": "테크컨퍼런스",
-                "sender_address": "events@techconf.co.kr",
-                "body_text": """AI 트렌드 2025 웨비나에 초대합니다!
-
-일시: 12월 15일 오후 7시
-주제: 2025년 AI 산업 전망
-연사: 김AI 교수 (서울대)
-
-무료 등록: https://webinar.example.com
-
-수신거부""",
-                "received_at": "2024-12-03T09:00:00",
-                "ground_truth": {
-                    "email_type": "마케팅",
-                    "importance_score": 4,
-                    "needs_reply": False,
-                    "sentiment": "positive",
-                    "key_points": ["무료 웨비나", "AI 트렌드", "12월 15일"]
-                }
-            },
-            {
-                "id": "synthetic_009",
-                "subject": "구독 갱신 안내",
-                "sender_name": "SaaS서비스",
-                "sender_address": "billing@saas-service.com",
-                "body_text": """구독이 곧 만료됩니다.
-
-현재 플랜: Pro ($29/월)
-만료일: 2024년 12월 10일
-
-지금 갱신하시면 20% 할인!
-자동 갱신을 원하시면 결제 정보를 확인해주세요.
-
-문의: support@saas-service.com""",
-                "received_at": "2024-12-03T11:00:00",
-                "ground_truth": {
-                    "email_type": "마케팅",
-                    "importance_score": 5,
-                    "needs_reply": False,
-                    "sentiment": "neutral",
-                    "key_points": ["구독 만료 임박", "갱신 할인", "12월 10일 만료"]
-                }
-            },
-            {
-                "id": "synthetic_010",
-                "subject": "뉴스레터 - 이번 주 테크 뉴스",
-                "sender_name": "테크뉴스레터",
-                "sender_address": "newsletter@technews.kr",
-                "body_text": """이번 주 테크 뉴스 Top 5
-
-1. OpenAI GPT-5 발표 임박
-2. 애플 M4 칩 성능 공개
-3. 테슬라 로보택시 시범 운행
-4. 구글 Gemini 2.0 업데이트
-5. 삼성 갤럭시 S25 유출
-
-자세히 보기: https://technews.kr/weekly""",
-                "received_at": "2024-12-04T07:00:00",
-                "ground_truth": {
-                    "email_type": "마케팅",
-                    "importance_score": 2,
-                    "needs_reply": False,
-                    "sentiment": "neutral",
-                    "key_points": ["주간 뉴스레터", "테크 뉴스"]
-                }
-            },
+def _write_stamps(source: Path, copies: List[Path]) -> None:
+    """사본마다 원본 파일의 sha256을 기록 (원본과 사본을 함께 저장한 뒤 호출)"""
+    digest = _file_sha256(source)
+    for copy_path in copies:
+        _stamp_path(copy_path).write_text(digest, encoding="ascii")
 
-            # ========== 공지 관련 (5개) ==========
-            {
-                "id": "synthetic_011",
-                "subject": "서울시 당현천 개장 안내",
-                "sender_name": "서울시청",
-                "sender_address": "info@seoul.go.kr",
-                "body_text": """서울시 당현천 '당현마루·달빛브릿지' 개장 안내
 
-개장일: 2024년 12월 5일
-위치: 서대문구 당현천
-시설: 산책로, 전망대, 야간 조명
+def _stamp_matches(copy_path: Path, source: Path, digest: Optional[str] = None) -> bool:
+    """사본의 .sha256에 기록된 해시가 현재 원본 내용과 같은지 (digest를 넘기면 원본을 다시 해시하지 않음)"""
+    stamp = _stamp_path(copy_path)
+    if not copy_path.exists() or not stamp.exists():
+        return False
+    return stamp.read_text(encoding="ascii").strip() == (digest or _file_sha256(source))
 
-많은 방문 부탁드립니다.
 
-서울특별시""",
-                "received_at": "2024-12-04T08:00:00",
-                "ground_truth": {
-                    "email_type": "공지",
-                    "importance_score": 3,
-                    "needs_reply": False,
-                    "sentiment": "positive",
-                    "key_points": ["시설 개장", "당현천", "12월 5일"]
-                }
-            },
-            {
-                "id": "synthetic_012",
-                "subject": "시스템 점검 안내 (12/7 02:00-06:00)",
-                "sender_name": "IT지원팀",
-                "sender_address": "it-support@company.com",
-                "body_text": """시스템 정기 점검 안내
-
-일시: 12월 7일(토) 02:00 ~ 06:00
-대상: 전사 시스템 (메일, ERP, 그룹웨어)
-영향: 해당 시간 서비스 이용 불가
-
-양해 부탁드립니다.
-
-IT지원팀""",
-                "received_at": "2024-12-04T16:00:00",
-                "ground_truth": {
-                    "email_type": "공지",
-                    "importance_score": 6,
-                    "needs_reply": False,
-                    "sentiment": "neutral",
-                    "key_points": ["시스템 점검", "12/7 새벽", "서비스 중단"]
-                }
-            },
-            {
-                "id": "synthetic_013",
-                "subject": "개인정보 처리방침 변경 안내",
-                "sender_name": "서비스운영팀",
-                "sender_address": "privacy@service.com",
-                "body_text": """개인정보 처리방침 변경 안내
+def _read_dataset_file(filepath: Path):
+    """
+    데이터셋 파일 로드
 
-시행일: 2024년 12월 15일
+    .json 경로를 받으면 같은 이름의 .msgpack (msgspec 설치 시) / .json.zst (zstandard 설치 시)
+    사본 중 .sha256에 기록된 원본 해시가 현재 JSON 내용과 같은 첫 번째 사본을 읽습니다.
+    (MessagePack → zstd 순, 맞는 사본이 없으면 JSON, JSON이 없으면 있는 사본)
+    수정 시각은 git checkout / 복사로 쉽게 바뀌므로 비교에 쓰지 않습니다.
+    """
+    if filepath.suffix == ".msgpack":
+        return msgspec.msgpack.decode(filepath.read_bytes())
+    if filepath.suffix == ".zst":
+        return _decode_json(zstd.ZstdDecompressor().decompress(filepath.read_bytes()))
 
-주요 변경사항:
-1. 개인정보 보유기간 변경 (3년 → 5년)
-2. 제3자 제공 항목 추가
-3. 마케팅 동의 절차 간소화
+    candidates = []
+    if msgspec is not None:
+        candidates.append(filepath.with_suffix(".msgpack"))
+    if zstd is not None:
+        candidates.append(filepath.with_name(filepath.name + ".zst"))
+    candidates = [path for path in candidates if path.exists()]
 
-자세한 내용: https://service.com/privacy
+    if not filepath.exists():
+        return _read_dataset_file(candidates[0]) if candidates else _read_json(filepath)
 
-문의: privacy@service.com""",
-                "received_at": "2024-12-01T10:00:00",
-                "ground_truth": {
-                    "email_type": "공지",
-                    "importance_score": 4,
-                    "needs_reply": False,
-                    "sentiment": "neutral",
-                    "key_points": ["개인정보 방침 변경", "12월 15일 시행"]
-                }
-            },
-            {
-                "id": "synthetic_014",
-                "subject": "[긴급] 보안 업데이트 필수 적용 안내",
-                "sender_name": "보안팀",
-                "sender_address": "security@company.com",
-                "body_text": """긴급 보안 업데이트 안내
+    digest = None
+    for path in candidates:
+        if not _stamp_path(path).exists():
+            continue
+        digest = digest or _file_sha256(filepath)
+        if _stamp_matches(path, filepath, digest):
+            return _read_dataset_file(path)
+    return _read_json(filepath)
 
-중요한 보안 취약점이 발견되어 즉시 업데이트가 필요합니다.
 
-대상: 전 직원 PC
-방법: 제어판 > Windows Update 실행
-기한: 12월 5일까지
+def _write_json(filepath: Path, data, pretty: bool = False) -> None:
+    """
+    JSON 파일 저장 (orjson이 있으면 orjson, 없으면 표준 json)
 
-미적용 시 네트워크 접속이 제한됩니다.
+    기본은 공백 없는 compact 형식, pretty=True면 사람이 읽기 좋게 들여쓰기 2칸
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        filepath.write_bytes(orjson.dumps(data, option=option))
+        return
 
-보안팀""",
-                "received_at": "2024-12-04T09:00:00",
-                "ground_truth": {
-                    "email_type": "공지",
-                    "importance_score": 8,
-                    "needs_reply": False,
-                    "sentiment": "neutral",
-                    "key_points": ["긴급 보안 업데이트", "12/5까지", "필수 적용"]
-                }
-            },
-            {
-                "id": "synthetic_015",
-                "subject": "연말 휴무 안내",
-                "sender_name": "총무팀",
-                "sender_address": "admin@company.com",
-                "body_text": """2024년 연말 휴무 안내
+    with open(filepath, 'w', encoding='utf-8') as f:
+        if pretty:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        else:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
 
-휴무 기간: 12월 30일(월) ~ 1월 1일(수)
-업무 재개: 1월 2일(목)
 
-긴급 연락처: 010-1234-5678
+def _write_json_zst(filepath: Path, data) -> None:
+    """compact JSON을 zstd(level 3)로 압축해서 저장 (zstandard 필요)"""
+    if zstd is None:
+        raise RuntimeError("zstandard가 설치되지 않아 .zst로 저장할 수 없습니다")
+
+    if orjson is not None:
+        encoded = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        encoded = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    filepath.write_bytes(zstd.ZstdCompressor(level=3).compress(encoded))
+
+
+# 본문 분리 저장 형식: 메타데이터 인덱스 + 이메일별 본문 텍스트 파일
+DATASET_INDEX_FILE = "dataset_index.json"
+BODIES_DIR = "bodies"
+
+
+def _write_dataset_index(filepath: Path, header: Dict, emails: List[Dict]) -> None:
+    """
+    본문을 뺀 인덱스 JSON + bodies/{id}.txt 저장
+
+    분류/중요도 평가처럼 본문이 필요 없는 경로는 인덱스만 읽으면 됩니다.
+    """
+    bodies_dir = filepath.parent / BODIES_DIR
+    bodies_dir.mkdir(parents=True, exist_ok=True)
+
+    for email in emails:
+        (bodies_dir / f"{email['id']}.txt").write_text(email.get("body_text") or "", encoding="utf-8")
+
+    index = [{key: value for key, value in email.items() if key != "body_text"} for email in emails]
+    _write_json(filepath, {**header, "emails": index})
+
+
+@functools.lru_cache(maxsize=64)
+def _read_body(filepath: Path) -> str:
+    """본문 텍스트 파일 로드 (최근 64개 캐시)"""
+    return filepath.read_text(encoding="utf-8")
+
+
+# 합성 코퍼스: bake_dataset.py가 만든 MessagePack 파일 (원본은 _synthetic_corpus.py)
+SYNTHETIC_CORPUS_SOURCE = Path(__file__).parent / "_synthetic_corpus.py"
+SYNTHETIC_CORPUS_FILE = DATA_DIR / "_synthetic_corpus.msgpack"
+
+
+@functools.cache
+def _synthetic_corpus() -> tuple:
+    """
+    합성 테스트 이메일 (프로세스당 1번만 로드)
+
+    msgspec이 있고 .msgpack 옆 .sha256이 현재 _synthetic_corpus.py 내용과 같으면 디코딩만 하고,
+    아니면 (bake 이후 원본이 바뀌었거나 bake_dataset.py를 실행하지 않은 경우) 리터럴을 임포트합니다.
+    """
+    if msgspec is not None and _stamp_matches(SYNTHETIC_CORPUS_FILE, SYNTHETIC_CORPUS_SOURCE):
+        return tuple(_intern_repeated(msgspec.msgpack.decode(SYNTHETIC_CORPUS_FILE.read_bytes())))
+
+    try:
+        from ._synthetic_corpus import SYNTHETIC_EMAILS
+    except ImportError:  # 스크립트로 직접 실행한 경우
+        from _synthetic_corpus import SYNTHETIC_EMAILS
+
+    return tuple(_intern_repeated(SYNTHETIC_EMAILS))
+
+
+# 여러 이메일에 반복되는 짧은 문자열 필드 (intern해서 객체 1개로 공유)
+_INTERNED_EMAIL_FIELDS = ("sender_name", "sender_address")
+_INTERNED_GROUND_TRUTH_FIELDS = ("email_type", "sentiment")
+
+
+def _intern_repeated(emails):
+    """
+    반복되는 필드 값을 sys.intern으로 교체 (제자리 변환 후 emails 반환)
+
+    MessagePack 디코딩은 같은 값도 문자열 객체를 매번 새로 만들기 때문에,
+    라벨(email_type / sentiment)과 발신자 값을 intern해서 EMAIL_TYPE_LABELS 등과 같은 객체를 씁니다.
+    """
+    for email in emails:
+        for field in _INTERNED_EMAIL_FIELDS:
+            if isinstance(email.get(field), str):
+                email[field] = sys.intern(email[field])
+        ground_truth = email.get("ground_truth") or {}
+        for field in _INTERNED_GROUND_TRUTH_FIELDS:
+            if isinstance(ground_truth.get(field), str):
+                ground_truth[field] = sys.intern(ground_truth[field])
+    return emails
+
+
+# ========== 대량 합성 이메일 (generate_bulk) ==========
+
+# 유형별 템플릿: {idx} {name} {company} {date} 치환
+_BULK_TEMPLATES = (
+    {
+        "email_type": "채용",
+        "subject": "[{company}] 채용 전형 결과 및 면접 안내 #{idx}",
+        "sender_name": "{company} 인사팀",
+        "sender_address": "hr{idx}@recruit-{company_id}.co.kr",
+        "body_text": "안녕하세요, {name}님.\n\n{company} 채용에 지원해 주셔서 감사합니다.\n면접 일정은 {date}입니다.\n참석 가능 여부를 회신 부탁드립니다.",
+        "key_points": ["채용 전형 결과", "면접 일정 {date}"],
+        "score_range": (6, 10),
+        "reply_prob": 0.8,
+        "sentiment_probs": (0.7, 0.2, 0.1),
+    },
+    {
+        "email_type": "마케팅",
+        "subject": "[{company}] 오늘만 특가! 최대 50% 할인 #{idx}",
+        "sender_name": "{company}",
+        "sender_address": "noreply@shop-{company_id}.com",
+        "body_text": "{name} 고객님, {date}까지 진행되는 특별 할인 행사를 안내드립니다.\n지금 바로 확인하세요!",
+        "key_points": ["할인 행사", "{date}까지"],
+        "score_range": (1, 3),
+        "reply_prob": 0.0,
+        "sentiment_probs": (0.3, 0.7, 0.0),
+    },
+    {
+        "email_type": "공지",
+        "subject": "[공지] 시스템 정기 점검 안내 ({date}) #{idx}",
+        "sender_name": "{company} 운영팀",
+        "sender_address": "notice@{company_id}.co.kr",
+        "body_text": "안녕하세요.\n{date}에 시스템 정기 점검이 진행됩니다.\n점검 시간 동안 서비스 이용이 제한됩니다.",
+        "key_points": ["정기 점검", "{date}"],
+        "score_range": (3, 6),
+        "reply_prob": 0.05,
+        "sentiment_probs": (0.0, 0.9, 0.1),
+    },
+    {
+        "email_type": "개인",
+        "subject": "{name}님, 이번 주 약속 관련해서요 #{idx}",
+        "sender_name": "{name}",
+        "sender_address": "friend{idx}@gmail.com",
+        "body_text": "안녕! {date}에 시간 괜찮아?\n같이 저녁 먹으면서 이야기하자. 답장 줘~",
+        "key_points": ["약속 제안", "{date}"],
+        "score_range": (5, 8),
+        "reply_prob": 0.9,
+        "sentiment_probs": (0.6, 0.35, 0.05),
+    },
+    {
+        "email_type": "기타",
+        "subject": "[{company}] 새 알림 {idx}건이 있습니다",
+        "sender_name": "{company} 알림",
+        "sender_address": "alert@{company_id}.io",
+        "body_text": "{name}님, {date} 기준으로 확인하지 않은 알림이 있습니다.",
+        "key_points": ["알림", "{date}"],
+        "score_range": (1, 4),
+        "reply_prob": 0.0,
+        "sentiment_probs": (0.0, 1.0, 0.0),
+    },
+)
+
+_BULK_NAMES = ("홍길동", "김철수", "이영희", "박민수", "최지은", "정우성", "강하늘", "윤서연")
+_BULK_COMPANIES = ("ABC회사", "XYZ테크", "한빛소프트", "넥스트랩", "그린마켓", "블루클라우드")
+
+# 라벨 계산용 파라미터 배열 (유형 인덱스 = _BULK_TEMPLATES 순서)
+_BULK_SCORE_LO = np.array([t["score_range"][0] for t in _BULK_TEMPLATES], dtype=np.int64)
+_BULK_SCORE_HI = np.array([t["score_range"][1] for t in _BULK_TEMPLATES], dtype=np.int64)
+_BULK_REPLY_PROB = np.array([t["reply_prob"] for t in _BULK_TEMPLATES], dtype=np.float64)
+_BULK_SENTIMENT_CDF = np.cumsum([t["sentiment_probs"] for t in _BULK_TEMPLATES], axis=1)
+
+
+def _fill_bulk_labels_loop(type_ids, rand, score_lo, score_hi, reply_prob, sentiment_cdf,
+                           scores, needs_reply, sentiment_ids):
+    """라벨 배열 채우기 (numba @njit 대상, 배열 인덱스 연산만 사용)"""
+    for i in range(type_ids.shape[0]):
+        t = type_ids[i]
+        scores[i] = score_lo[t] + int(rand[i, 0] * (score_hi[t] - score_lo[t] + 1))
+        needs_reply[i] = rand[i, 1] < reply_prob[t]
+        s = 0
+        while s < 2 and rand[i, 2] >= sentiment_cdf[t, s]:
+            s += 1
+        sentiment_ids[i] = s
+
+
+def _fill_bulk_labels_numpy(type_ids, rand, score_lo, score_hi, reply_prob, sentiment_cdf,
+                            scores, needs_reply, sentiment_ids):
+    """numba가 없을 때: 같은 계산을 numpy 벡터 연산으로"""
+    scores[:] = score_lo[type_ids] + (rand[:, 0] * (score_hi[type_ids] - score_lo[type_ids] + 1)).astype(np.int64)
+    needs_reply[:] = rand[:, 1] < reply_prob[type_ids]
+    sentiment_ids[:] = np.minimum((rand[:, 2][:, None] >= sentiment_cdf[type_ids]).sum(axis=1), 2)
+
+
+_fill_bulk_labels = njit(cache=True)(_fill_bulk_labels_loop) if njit is not None else _fill_bulk_labels_numpy
 
-즐거운 연말연시 보내세요!
 
-총무팀""",
-                "received_at": "2024-12-03T14:00:00",
-                "ground_truth": {
-                    "email_type": "공지",
-                    "importance_score": 5,
-                    "needs_reply": False,
-                    "sentiment": "positive",
-                    "key_points": ["연말 휴무", "12/30~1/1", "긴급 연락처"]
-                }
-            },
+class DatasetGenerator:
+    """테스트 데이터셋 생성기"""
 
-            # ========== 개인 관련 (5개) ==========
-            {
-                "id": "synthetic_016",
-                "subject": "프로젝트 협업 요청",
-                "sender_name": "김개발",
-                "sender_address": "kim.dev@gmail.com",
-                "body_text": """안녕하세요, 홍길동님.
+    def __init__(self, created_at: Optional[str] = None):
+        self.test_emails: List[Dict] = []
+        self.ground_truth: List[Dict] = []
+        # 모든 저장 파일이 같은 생성 시각을 쓰도록 1번만 계산 (고정값을 넘기면 재현 가능한 파일)
+        self.created_at = created_at or datetime.now(timezone.utc).isoformat()
 
-오픈소스 프로젝트에서 활동하시는 것을 보고 연락드립니다.
+    def generate_synthetic_emails(self) -> List[Dict]:
+        """
+        합성 테스트 이메일 생성
+        각 유형별로 다양한 케이스 포함
 
-현재 진행 중인 AI 챗봇 프로젝트에 참여 의향이 있으신지 문의드립니다.
-- 기술 스택: Python, LangChain, FastAPI
-- 예상 기간: 3개월
-- 보상: 오픈소스 기여 + 소정의 사례비
+        _synthetic_corpus()의 dict는 프로세스 전체가 공유하므로, 호출자가 db_id 등을
+        써넣어도 다른 호출자에게 보이지 않도록 이메일 / ground_truth dict를 복사해서 반환합니다.
+        """
+        return [
+            {**email, "ground_truth": dict(email["ground_truth"])}
+            for email in _synthetic_corpus()
+        ]
 
-관심 있으시면 회신 부탁드립니다.
+    def generate_bulk(self, n: int, seed: int = 42) -> List[Dict]:
+        """
+        대량 합성 이메일 생성 (벤치마크용, generate_synthetic_emails와 같은 형식)
 
-감사합니다.
-김개발 드림""",
-                "received_at": "2024-12-04T11:00:00",
+        라벨(중요도/답변 필요/감정)은 numpy 배열에 한 번에 계산하고 (numba 설치 시 JIT),
+        제목/본문은 유형별 템플릿을 치환해 리스트 컴프리헨션 1번으로 만듭니다.
+        같은 seed면 같은 데이터셋이 생성됩니다.
+        """
+        rng = np.random.default_rng(seed)
+        type_ids = rng.integers(0, len(_BULK_TEMPLATES), size=n)
+        name_ids = rng.integers(0, len(_BULK_NAMES), size=n)
+        company_ids = rng.integers(0, len(_BULK_COMPANIES), size=n)
+        rand = rng.random((n, 3))
+
+        scores = np.empty(n, dtype=np.int64)
+        needs_reply = np.empty(n, dtype=np.bool_)
+        sentiment_ids = np.empty(n, dtype=np.int64)
+        _fill_bulk_labels(type_ids, rand, _BULK_SCORE_LO, _BULK_SCORE_HI, _BULK_REPLY_PROB,
+                          _BULK_SENTIMENT_CDF, scores, needs_reply, sentiment_ids)
+
+        base = datetime(2024, 12, 1, 9, 0, 0)
+        sentiments = ("positive", "neutral", "negative")
+
+        def _make(i: int, t: int, name_id: int, company_id: int) -> Dict:
+            template = _BULK_TEMPLATES[t]
+            received_at = base + timedelta(days=i % 30, minutes=(i * 37) % 600)
+            fields = {
+                "idx": i + 1,
+                "name": _BULK_NAMES[name_id],
+                "company": _BULK_COMPANIES[company_id],
+                "company_id": company_id,
+                "date": (received_at + timedelta(days=7)).strftime("%m/%d"),
+            }
+            return {
+                "id": f"bulk_{i + 1:06d}",
+                "subject": template["subject"].format(**fields),
+                "sender_name": template["sender_name"].format(**fields),
+                "sender_address": template["sender_address"].format(**fields),
+                "body_text": template["body_text"].format(**fields),
+                "received_at": received_at.isoformat(),
                 "ground_truth": {
-                    "email_type": "개인",
-                    "importance_score": 7,
-                    "needs_reply": True,
-                    "sentiment": "positive",
-                    "key_points": ["프로젝트 협업 제안", "AI 챗봇", "회신 요청"]
+                    "email_type": template["email_type"],
+                    "importance_score": int(scores[i]),
+                    "needs_reply": bool(needs_reply[i]),
+                    "sentiment": sentiments[sentiment_ids[i]],
+                    "key_points": [kp.format(**fields) for kp in template["key_points"]]
                 }
-            },
-            {
-                "id": "synthetic_017",
-                "subject": "Re: 지난주 미팅 후속",
-                "sender_name": "이매니저",
-                "sender_address": "lee.manager@partner.com",
-                "body_text": """안녕하세요.
-
-지난주 미팅에서 논의한 내용 정리해서 보내드립니다.
+            }
 
-1. API 연동 방식 확정
-2. 일정: 1월 중 MVP 완료
-3. 다음 미팅: 12월 12일
-
-첨부 파일 확인 부탁드립니다.
-의견 있으시면 말씀해주세요.
+        return [
+            _make(i, t, name_id, company_id)
+            for i, (t, name_id, company_id) in enumerate(zip(type_ids.tolist(), name_ids.tolist(), company_ids.tolist()))
+        ]
 
-감사합니다.""",
-                "received_at": "2024-12-04T13:00:00",
-                "ground_truth": {
-                    "email_type": "개인",
-                    "importance_score": 7,
-                    "needs_reply": True,
-                    "sentiment": "neutral",
-                    "key_points": ["미팅 후속", "일정 확인", "의견 요청"]
-                }
-            },
-            {
-                "id": "synthetic_018",
-                "subject": "생일 축하해요!",
-                "sender_name": "박친구",
-                "sender_address": "park.friend@naver.com",
-                "body_text": """생일 축하해~! 🎂🎉
-
-올해도 건강하고 행복한 한 해 보내!
-다음에 만나서 밥 한번 먹자ㅋㅋ
-
-선물은 나중에 줄게~""",
-                "received_at": "2024-12-04T00:01:00",
-                "ground_truth": {
-                    "email_type": "개인",
-                    "importance_score": 4,
-                    "needs_reply": True,
-                    "sentiment": "positive",
-                    "key_points": ["생일 축하", "친구"]
-                }
-            },
-            {
-                "id": "synthetic_019",
-                "subject": "기술 질문 - LangGraph 관련",
-                "sender_name": "최주니어",
-                "sender_address": "choi.junior@company.com",
-                "body_text": """안녕하세요, 선배님.
+    @cached_property
+    def synthetic_emails(self) -> List[Dict]:
+        """합성 테스트 이메일 (인스턴스별 1번만 생성, save_* 메서드가 공유)"""
+        return self.generate_synthetic_emails()
 
-LangGraph 관련해서 질문이 있어서 메일 드립니다.
+    def build_test_dataset(self, emails: Optional[List[Dict]] = None) -> Dict:
+        """테스트 데이터셋 (저장 형식과 무관한 dict, emails 기본값: synthetic_emails)"""
+        emails = self.synthetic_emails if emails is None else emails
+        return {**self._test_dataset_header(emails), "emails": emails}
 
-StateGraph에서 conditional_edges를 사용할 때
-여러 조건을 처리하는 best practice가 궁금합니다.
+    def _test_dataset_header(self, emails: List[Dict]) -> Dict:
+        """테스트 데이터셋의 emails 외 메타데이터"""
 
-혹시 시간 되시면 간단히 조언 부탁드려도 될까요?
+        return {
+            "version": "1.0",
+            "created_at": self.created_at,
+            "description": "AI 메일 비서 성능 측정용 테스트 데이터셋",
+            "statistics": {
+                "total": len(emails),
+                "by_type": dict(Counter(email["ground_truth"]["email_type"] for email in emails))
+            }
+        }
 
-감사합니다.
-최주니어 드림""",
-                "received_at": "2024-12-04T15:00:00",
-                "ground_truth": {
-                    "email_type": "개인",
-                    "importance_score": 5,
-                    "needs_reply": True,
-                    "sentiment": "neutral",
-                    "key_points": ["기술 질문", "LangGraph", "조언 요청"]
-                }
-            },
-            {
-                "id": "synthetic_020",
-                "subject": "이번 주 스터디 불참 안내",
-                "sender_name": "정스터디",
-                "sender_address": "jung.study@gmail.com",
-                "body_text": """안녕하세요.
+    def build_ground_truth(self, emails: Optional[List[Dict]] = None) -> Dict:
+        """
+        Ground Truth (저장 형식과 무관한 dict)
 
-이번 주 토요일 스터디에 개인 사정으로 불참합니다.
-다음 주에는 꼭 참석하겠습니다.
+        version 2.1: 필드별 컬럼 리스트 (키 이름은 파일에 1번만 기록)
+        email_type / sentiment는 "labels" 목록의 인덱스로 저장
+        행 단위 접근은 ground_truth_rows() 사용
+        emails 기본값: synthetic_emails
+        """
+        emails = self.synthetic_emails if emails is None else emails
+        ground_truths = [email["ground_truth"] for email in emails]
+
+        # 행 dict를 합치지 않고 필드별로 바로 컬럼 생성
+        columns = {
+            "ids": [email["id"] for email in emails],
+            "subjects": [email["subject"] for email in emails],
+            **{
+                column: [gt.get(field) for gt in ground_truths]
+                for field, column in GROUND_TRUTH_COLUMNS.items()
+                if field not in ("id", "subject")
+            }
+        }
 
-발표 자료는 미리 공유드릴게요.
+        for column, names in LABEL_COLUMNS.items():
+            index = {name: i for i, name in enumerate(names)}
+            columns[column] = [index.get(value) for value in columns[column]]
 
-감사합니다.""",
-                "received_at": "2024-12-04T17:00:00",
-                "ground_truth": {
-                    "email_type": "개인",
-                    "importance_score": 3,
-                    "needs_reply": False,
-                    "sentiment": "neutral",
-                    "key_points": ["스터디 불참", "자료 공유 예정"]
-                }
-            },
-
-            # ========== 기타 (5개) ==========
-            {
-                "id": "synthetic_021",
-                "subject": "택배 배송 완료 안내",
-                "sender_name": "CJ대한통운",
-                "sender_address": "noreply@cjlogistics.com",
-                "body_text": """배송이 완료되었습니다.
-
-운송장번호: 1234567890
-배송완료: 2024-12-04 14:32
-수령인: 홍길동
-배송위치: 경비실
-
-감사합니다.""",
-                "received_at": "2024-12-04T14:35:00",
-                "ground_truth": {
-                    "email_type": "기타",
-                    "importance_score": 3,
-                    "needs_reply": False,
-                    "sentiment": "neutral",
-                    "key_points": ["배송 완료", "경비실 수령"]
-                }
-            },
-            {
-                "id": "synthetic_022",
-                "subject": "카드 사용 내역 알림",
-                "sender_name": "KB국민카드",
-                "sender_address": "card@kbcard.com",
-                "body_text": """KB국민카드 사용 알림
-
-일시: 2024-12-04 12:30
-가맹점: 스타벅스 강남점
-금액: 6,500원
-누적: 125,000원/500,000원
-
-이용해 주셔서 감사합니다.""",
-                "received_at": "2024-12-04T12:31:00",
-                "ground_truth": {
-                    "email_type": "기타",
-                    "importance_score": 2,
-                    "needs_reply": False,
-                    "sentiment": "neutral",
-                    "key_points": ["카드 사용 알림", "6,500원"]
-                }
-            },
-            {
-                "id": "synthetic_023",
-                "subject": "GitHub - New pull request",
-                "sender_name": "GitHub",
-                "sender_address": "noreply@github.com",
-                "body_text": """@contributor opened a new pull request in your-repo/project
+        return {
+            "version": "2.1",
+            "created_at": self.created_at,
+            "description": "성능 평가용 정답 데이터 (컬럼 형식)",
+            "labels": {column: list(names) for column, names in LABEL_COLUMNS.items()},
+            "columns": columns
+        }
 
-#42 Add feature: email classification
+    def save_test_dataset(
+        self,
+        filename: str = "test_dataset.json",
+        emails: Optional[List[Dict]] = None,
+        pretty: bool = False
+    ):
+        """테스트 데이터셋 저장 (emails 기본값: synthetic_emails, pretty=True면 들여쓰기)"""
+        filepath = DATA_DIR / filename
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        emails = self.synthetic_emails if emails is None else emails
 
-Files changed: 5
-Commits: 3
+        if pretty:
+            _write_json(filepath, self.build_test_dataset(emails), pretty=True)
+        else:
+            # 메타데이터 → 이메일 순으로 스트리밍 저장
+            _stream_json_array(filepath, self._test_dataset_header(emails), "emails", emails)
 
-View pull request: https://github.com/your-repo/project/pull/42""",
-                "received_at": "2024-12-04T16:00:00",
-                "ground_truth": {
-                    "email_type": "기타",
-                    "importance_score": 6,
-                    "needs_reply": False,
-                    "sentiment": "neutral",
-                    "key_points": ["GitHub PR", "코드 리뷰 필요"]
-                }
-            },
-            {
-                "id": "synthetic_024",
-                "subject": "비밀번호 변경 완료",
-                "sender_name": "네이버",
-                "sender_address": "noreply@naver.com",
-                "body_text": """비밀번호가 성공적으로 변경되었습니다.
-
-변경 일시: 2024-12-04 10:15
-변경 IP: 123.456.xxx.xxx
-
-본인이 변경하지 않았다면 즉시 고객센터로 연락주세요.
-고객센터: 1588-1234""",
-                "received_at": "2024-12-04T10:15:00",
-                "ground_truth": {
-                    "email_type": "기타",
-                    "importance_score": 4,
-                    "needs_reply": False,
-                    "sentiment": "neutral",
-                    "key_points": ["비밀번호 변경 완료", "보안 알림"]
-                }
-            },
-            {
-                "id": "synthetic_025",
-                "subject": "Slack 알림 요약",
-                "sender_name": "Slack",
-                "sender_address": "notification@slack.com",
-                "body_text": """You have 15 unread messages
-
-#general (5 messages)
-#dev-team (8 messages)
-#random (2 messages)
-
-View in Slack: https://slack.com/messages""",
-                "received_at": "2024-12-04T18:00:00",
-                "ground_truth": {
-                    "email_type": "기타",
-                    "importance_score": 3,
-                    "needs_reply": False,
-                    "sentiment": "neutral",
-                    "key_points": ["Slack 알림", "15개 메시지"]
-                }
-            },
-        ]
+        print(f"테스트 데이터셋 저장 완료: {filepath}")
+        return filepath
 
-        return synthetic_emails
+    def save_ground_truth(
+        self,
+        filename: str = "ground_truth.json",
+        emails: Optional[List[Dict]] = None,
+        pretty: bool = False
+    ):
+        """Ground Truth 별도 저장 (emails 기본값: synthetic_emails, pretty=True면 들여쓰기)"""
+        filepath = DATA_DIR / filename
+        filepath.parent.mkdir(parents=True, exist_ok=True)
 
-    def save_test_dataset(self, filename: str = "test_dataset.json"):
-        """테스트 데이터셋 저장"""
-        emails = self.generate_synthetic_emails()
+        _write_json(filepath, self.build_ground_truth(emails), pretty=pretty)
 
-        dataset = {
-            "version": "1.0",
-            "created_at": datetime.now().isoformat(),
-            "description": "AI 메일 비서 성능 측정용 테스트 데이터셋",
-            "statistics": {
-                "total": len(emails),
-                "by_type": {
-                    "채용": 5,
-                    "마케팅": 5,
-                    "공지": 5,
-                    "개인": 5,
-                    "기타": 5
-                }
-            },
-            "emails": emails
-        }
+        print(f"Ground Truth 저장 완료: {filepath}")
+        return filepath
 
+    def save_test_dataset_msgpack(self, filename: str = "test_dataset.msgpack", emails: Optional[List[Dict]] = None):
+        """테스트 데이터셋 MessagePack 저장 (load_test_dataset("test_dataset.msgpack")으로 로드)"""
         filepath = DATA_DIR / filename
         filepath.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(dataset, f, ensure_ascii=False, indent=2)
+        _write_msgpack(filepath, self.build_test_dataset(emails))
+        _stamp_path(filepath).unlink(missing_ok=True)  # JSON과 따로 저장했으므로 원본 해시 없음
 
         print(f"테스트 데이터셋 저장 완료: {filepath}")
         return filepath
 
-    def save_ground_truth(self, filename: str = "ground_truth.json"):
-        """Ground Truth 별도 저장"""
-        emails = self.generate_synthetic_emails()
-
-        ground_truth_data = {
-            "version": "1.0",
-            "created_at": datetime.now().isoformat(),
-            "description": "성능 평가용 정답 데이터",
-            "ground_truths": [
-                {
-                    "id": email["id"],
-                    "subject": email["subject"],
-                    **email["ground_truth"]
-                }
-                for email in emails
-            ]
-        }
-
+    def save_ground_truth_msgpack(self, filename: str = "ground_truth.msgpack", emails: Optional[List[Dict]] = None):
+        """Ground Truth MessagePack 저장 (load_ground_truth("ground_truth.msgpack")으로 로드)"""
         filepath = DATA_DIR / filename
         filepath.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(ground_truth_data, f, ensure_ascii=False, indent=2)
+        _write_msgpack(filepath, self.build_ground_truth(emails))
+        _stamp_path(filepath).unlink(missing_ok=True)  # JSON과 따로 저장했으므로 원본 해시 없음
 
         print(f"Ground Truth 저장 완료: {filepath}")
         return filepath
 
+    def save_all(
+        self,
+        emails: Optional[List[Dict]] = None,
+        pretty: bool = False,
+        msgpack: Optional[bool] = None,
+        compress: Optional[bool] = None,
+        index: bool = True
+    ) -> List[Path]:
+        """
+        테스트 데이터셋 + Ground Truth 동시 저장
+
+        두 payload를 emails 1벌로 한 번씩만 만들고, 파일 쓰기는 스레드로 병렬 실행합니다.
+        msgpack 기본값: msgspec이 설치돼 있으면 .msgpack 사본도 저장
+        compress 기본값: zstandard가 설치돼 있으면 .json.zst 사본도 저장
+        사본마다 원본 JSON의 sha256을 .sha256 파일로 남겨 load_* 가 같은 내용일 때만 사본을 읽습니다.
+        index: 본문을 뺀 dataset_index.json + bodies/{id}.txt 저장
+        """
+        emails = self.synthetic_emails if emails is None else emails
+        msgpack = msgspec is not None if msgpack is None else msgpack
+        compress = zstd is not None if compress is None else compress
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+
+        header = self._test_dataset_header(emails)
+        ground_truth = self.build_ground_truth(emails)
+
+        test_path = DATA_DIR / "test_dataset.json"
+        ground_truth_path = DATA_DIR / "ground_truth.json"
+        if pretty:
+            jobs = [(_write_json, test_path, {**header, "emails": emails}, pretty)]
+        else:
+            jobs = [(_stream_json_array, test_path, header, "emails", emails)]
+        jobs.append((_write_json, ground_truth_path, ground_truth, pretty))
+        if msgpack:
+            jobs.append((_write_msgpack, DATA_DIR / "test_dataset.msgpack", {**header, "emails": emails}))
+            jobs.append((_write_msgpack, DATA_DIR / "ground_truth.msgpack", ground_truth))
+        if compress:
+            jobs.append((_write_json_zst, DATA_DIR / "test_dataset.json.zst", {**header, "emails": emails}))
+            jobs.append((_write_json_zst, DATA_DIR / "ground_truth.json.zst", ground_truth))
+        if index:
+            jobs.append((_write_dataset_index, DATA_DIR / DATASET_INDEX_FILE, header, emails))
+
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            futures = [executor.submit(*job) for job in jobs]
+            for future in futures:
+                future.result()  # 쓰기 중 예외는 여기서 다시 발생
+
+        paths = [job[1] for job in jobs]
+        for source in (test_path, ground_truth_path):
+            copies = [path for path in paths if path != source and path.name.startswith(source.stem + ".")]
+            _write_stamps(source, copies)
+        for path in paths:
+            print(f"저장 완료: {path}")
+        return paths
+
     def load_test_dataset(self, filename: str = "test_dataset.json") -> Dict:
-        """테스트 데이터셋 로드"""
+        """테스트 데이터셋 로드 (JSON과 내용이 같은 .msgpack / .json.zst 사본이 있으면 우선 사용)"""
         filepath = DATA_DIR / filename
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return _read_dataset_file(filepath)
+
+    def load_dataset_index(self) -> Dict:
+        """본문(body_text)을 뺀 데이터셋 인덱스 로드 (본문은 load_body로 개별 로드)"""
+        return _read_json(DATA_DIR / DATASET_INDEX_FILE)
+
+    def load_body(self, email_id: str) -> str:
+        """이메일 1개의 본문 로드 (bodies/{id}.txt, 최근 64개 캐시)"""
+        return _read_body(DATA_DIR / BODIES_DIR / f"{email_id}.txt")
 
     def load_ground_truth(self, filename: str = "ground_truth.json") -> Dict:
-        """Ground Truth 로드"""
+        """Ground Truth 로드 (JSON과 내용이 같은 .msgpack / .json.zst 사본이 있으면 우선 사용)"""
         filepath = DATA_DIR / filename
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return _read_dataset_file(filepath)
+
 
+# 싱글톤 인스턴스 (첫 사용 시 생성)
+@functools.cache
+def get_dataset_generator() -> DatasetGenerator:
+    """DatasetGenerator 싱글톤 반환"""
+    return DatasetGenerator()
 
-# 싱글톤 인스턴스
-dataset_generator = DatasetGenerator()
+
+def __getattr__(name):
+    """기존 `from dataset_generator import dataset_generator` 호환 (PEP 562, 접근 시점에 생성)"""
+    if name == "dataset_generator":
+        return get_dataset_generator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="테스트 데이터셋 생성")
+    parser.add_argument(
+        "--timestamp",
+        default=None,
+        help="created_at에 기록할 시각 (ISO 8601, 지정하면 실행할 때마다 같은 파일 생성)"
+    )
+    args = parser.parse_args()
+
     # 데이터셋 생성 테스트
-    generator = DatasetGenerator()
-    generator.save_test_dataset()
-    generator.save_ground_truth()
+    generator = DatasetGenerator(created_at=args.timestamp)
+    generator.save_all()
     print("데이터셋 생성 완료!")
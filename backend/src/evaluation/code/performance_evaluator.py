@@ -4,17 +4,129 @@ AI Email Assistant 성능 평가 시스템
 이메일 분석, 답변 생성, 요약 품질을 측정하고 시각화합니다.
 """
 
+import asyncio
+import functools
+import hashlib
+import io
 import json
 import logging
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime
-from dataclasses import dataclass, asdict
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+from dataclasses import dataclass, asdict, fields, is_dataclass, replace
 import statistics
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from ._stats_jit import row_moments
+except ImportError:  # 스크립트로 직접 실행한 경우
+    from _stats_jit import row_moments
+
 logger = logging.getLogger(__name__)
 
+# backend/src (rag, services 임포트용) - 모듈 로드 시 한 번만 추가
+_SRC_DIR = str(Path(__file__).parent.parent.parent)
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+
+
+def _json_default(obj):
+    """표준 json용 dataclass 직렬화 (asdict처럼 깊은 복사하지 않음)"""
+    if is_dataclass(obj):
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    raise TypeError(f"JSON으로 직렬화할 수 없는 타입: {type(obj).__name__}")
+
+
+def _dumps(obj) -> bytes:
+    """compact JSON bytes (orjson이 있으면 orjson, dataclass 그대로 지원)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+
+def _stream_json_object(filepath, data: Dict) -> None:
+    """
+    JSON 객체를 스트리밍으로 저장
+
+    리스트 값은 원소 1개씩 인코딩해서 64KB 버퍼로 씁니다. (배열 원소는 한 줄에 1개)
+    전체 결과를 하나의 문자열로 만들지 않습니다.
+    """
+    with open(filepath, "wb", buffering=0) as raw, io.BufferedWriter(raw, buffer_size=64 * 1024) as buf:
+        buf.write(b"{\n")
+        for i, (key, value) in enumerate(data.items()):
+            if i:
+                buf.write(b",\n")
+            buf.write(_dumps(key) + b":")
+            if isinstance(value, list):
+                buf.write(b"[")
+                for j, item in enumerate(value):
+                    buf.write(b",\n" if j else b"\n")
+                    buf.write(_dumps(item))
+                buf.write(b"\n]" if value else b"]")
+            else:
+                buf.write(_dumps(value))
+        buf.write(b"\n}\n")
+
+
+# 답변 평가(LLM-as-Judge) 프롬프트 템플릿 (create_reply_evaluation_prompt에서 str.format으로 채움)
+_REPLY_PROMPT_TMPL = """다음 이메일에 대한 AI 생성 답변을 평가해주세요.
+
+## 원본 이메일
+- 발신자: {sender_name} <{sender_address}>
+- 제목: {subject}
+- 본문:
+{body}
+
+## AI 생성 답변 (목표 톤: {target_tone})
+{generated_reply}
+
+## 평가 기준 (각 항목 0-25점)
+
+1. **문맥 이해도** (0-25점): 원본 이메일의 핵심 내용을 정확히 파악했는가?
+2. **톤 일관성** (0-25점): 요청된 톤({target_tone})을 잘 유지했는가?
+3. **응답 적절성** (0-25점): 이메일에 대한 답변으로 적절한가? (질문에 답변, 요청 처리 등)
+4. **한국어 자연스러움** (0-25점): 문법, 어휘, 경어체 사용이 자연스러운가?
+
+## 출력 형식 (JSON)
+```json
+{{
+    "context_understanding": <점수>,
+    "tone_consistency": <점수>,
+    "response_appropriateness": <점수>,
+    "korean_naturalness": <점수>,
+    "total_score": <총점>,
+    "evaluation_notes": "<평가 의견>"
+}}
+```
+"""
+
+
+# 중요도 차이 → 점수 (차이 ≤2: 25점, 3: 15점, 그 외 0점, 차이가 표 길이를 넘으면 마지막 칸)
+_IMPORTANCE_SCORE_TABLE = np.array([25, 25, 25, 15] + [0] * 100, dtype=np.int8)
+_IMPORTANCE_MAX_DIFF = len(_IMPORTANCE_SCORE_TABLE) - 1
+
+# needs_reply를 True로 보는 문자열 (소문자 비교)
+_TRUTHY: frozenset = frozenset({'true', '1', 'yes', 't', 'y'})
+_TRUTHY_ARRAY = np.array(sorted(_TRUTHY))
+
+# LLM 응답의 ```json ... ``` 블록
+_JSON_BLOCK_RE = re.compile(r'```json\s*(.*?)\s*```', re.DOTALL)
+
+# 비교 리포트 시각화 바: _BAR_TEMPLATE[25 - n:50 - n] 슬라이스 1번으로 "█" n칸 + "░" (25 - n)칸
+_BAR_WIDTH = 25
+_BAR_TEMPLATE = "█" * _BAR_WIDTH + "░" * _BAR_WIDTH
+
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisEvaluation:
     """이메일 분석 평가 결과"""
     email_id: int
@@ -26,7 +138,7 @@ class AnalysisEvaluation:
     evaluation_notes: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class ReplyEvaluation:
     """답변 생성 평가 결과"""
     email_id: int
@@ -38,7 +150,7 @@ class ReplyEvaluation:
     evaluation_notes: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class SummaryEvaluation:
     """요약 평가 결과"""
     summary_date: str
@@ -50,13 +162,287 @@ class SummaryEvaluation:
     evaluation_notes: str = ""
 
 
+# AnalysisEvaluation 점수 필드 (AnalysisScoreColumns의 컬럼)
+ANALYSIS_SCORE_FIELDS = (
+    "email_type_score",
+    "importance_score_accuracy",
+    "needs_reply_score",
+    "sentiment_score",
+    "total_score",
+)
+
+
+_ANALYSIS_FIELD_INDEX = {field: i for i, field in enumerate(ANALYSIS_SCORE_FIELDS)}
+
+
+def _order_stats(values: np.ndarray) -> Tuple[float, float, float]:
+    """
+    (최소, 중앙값, 최대)를 np.partition 1번으로 계산 (정렬 없이 O(N))
+
+    개수가 짝수면 중앙값은 가운데 두 값의 평균 (statistics.median과 같음)
+    """
+    n = len(values)
+    kth = sorted({0, (n - 1) // 2, n // 2, n - 1})
+    part = np.partition(values, kth)
+    return float(part[0]), float(part[(n - 1) // 2] + part[n // 2]) / 2, float(part[n - 1])
+
+
+class AnalysisScoreColumns:
+    """
+    이메일 분석 평가 결과 컬럼 저장소 (SoA)
+
+    점수는 (필드 수, 용량) float64 행렬에 필드별 행으로 저장하고 용량이 부족하면 2배로 늘립니다.
+    email_id / 메모는 리스트로 보관하고, AnalysisEvaluation 목록은 필요할 때만 만듭니다.
+    필드별 합계 / 제곱합 / 최소 / 최대를 추가할 때마다 갱신하므로 summary()는 O(1)입니다.
+    (Welford처럼 매번 나누지 않고 합계만 쌓으므로 평균은 sum / n 한 번만 반올림 → append / extend 결과가 같음)
+    """
+
+    def __init__(self, capacity: int = 64):
+        k = len(ANALYSIS_SCORE_FIELDS)
+        self._n = 0
+        self._scores = np.empty((k, capacity), dtype=np.float64)
+        self.email_ids: List[int] = []
+        self.notes: List[str] = []
+        # 필드별 누적 통계
+        self._sum = np.zeros(k)
+        self._sumsq = np.zeros(k)
+        self._min = np.full(k, np.inf)
+        self._max = np.full(k, -np.inf)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _reserve(self, size: int) -> None:
+        capacity = self._scores.shape[1]
+        if size <= capacity:
+            return
+        grown = np.empty((len(ANALYSIS_SCORE_FIELDS), max(size, capacity * 2)), dtype=np.float64)
+        grown[:, :self._n] = self._scores[:, :self._n]
+        self._scores = grown
+
+    def append(self, evaluation: AnalysisEvaluation) -> None:
+        """평가 결과 1개 추가"""
+        values = np.array([getattr(evaluation, field) for field in ANALYSIS_SCORE_FIELDS], dtype=np.float64)
+
+        self._reserve(self._n + 1)
+        self._scores[:, self._n] = values
+        self.email_ids.append(evaluation.email_id)
+        self.notes.append(evaluation.evaluation_notes)
+        self._n += 1
+
+        self._sum += values
+        self._sumsq += values * values
+        np.minimum(self._min, values, out=self._min)
+        np.maximum(self._max, values, out=self._max)
+
+    def extend(self, email_ids: List[int], notes: List[str], scores: Dict[str, np.ndarray]) -> None:
+        """평가 결과 여러 개를 점수 배열 그대로 추가 (배치 평가용)"""
+        start, end = self._n, self._n + len(email_ids)
+        if end == start:
+            return
+        self._reserve(end)
+        for field, i in _ANALYSIS_FIELD_INDEX.items():
+            self._scores[i, start:end] = scores[field]
+        self.email_ids.extend(email_ids)
+        self.notes.extend(notes)
+        self._n = end
+
+        # 배치 통계를 누적 통계에 합침 (행렬 1번 순회, numba 설치 시 JIT)
+        batch_sum, batch_sumsq, batch_min, batch_max = row_moments(self._scores[:, start:end])
+        self._sum += batch_sum
+        self._sumsq += batch_sumsq
+        np.minimum(self._min, batch_min, out=self._min)
+        np.maximum(self._max, batch_max, out=self._max)
+
+    def column(self, field: str) -> np.ndarray:
+        """점수 컬럼 (복사 없는 view)"""
+        return self._scores[_ANALYSIS_FIELD_INDEX[field], :self._n]
+
+    def matrix(self) -> np.ndarray:
+        """전체 점수 행렬 (필드 수, 개수) view, 행 순서는 ANALYSIS_SCORE_FIELDS"""
+        return self._scores[:, :self._n]
+
+    def summary(self) -> Dict[str, Tuple[int, float, float, float, float]]:
+        """필드별 (n, 평균, 표본 표준편차, 최소, 최대) - 누적 통계에서 바로 계산 (O(1))"""
+        n = self._n
+        if n == 0:
+            return {field: (0, 0.0, 0.0, 0.0, 0.0) for field in ANALYSIS_SCORE_FIELDS}
+
+        mean = self._sum / n
+        if n > 1:
+            # (n·Σx² - (Σx)²) / (n(n-1)): 정수 점수면 분자까지 정확, 반올림 오차로 음수가 되지 않도록 0으로 자름
+            var = np.maximum(n * self._sumsq - self._sum * self._sum, 0.0) / (n * (n - 1))
+            std = np.sqrt(var)
+        else:
+            std = np.zeros(len(ANALYSIS_SCORE_FIELDS))
+        return {
+            field: (n, float(mean[i]), float(std[i]), float(self._min[i]), float(self._max[i]))
+            for field, i in _ANALYSIS_FIELD_INDEX.items()
+        }
+
+    def to_evaluations(self) -> List[AnalysisEvaluation]:
+        """AnalysisEvaluation 목록으로 변환"""
+        columns = self.matrix().tolist()
+        return [
+            AnalysisEvaluation(email_id, *row, evaluation_notes=note)
+            for email_id, note, *row in zip(self.email_ids, self.notes, *columns)
+        ]
+
+
+# 답변 평가 프롬프트 버전 (create_reply_evaluation_prompt를 바꾸면 올려서 캐시 무효화)
+REPLY_EVAL_PROMPT_VERSION = "reply_eval_v2"
+
+
+class ReplyEvaluationCache:
+    """
+    LLM-as-Judge 답변 평가 결과 파일 캐시
+
+    키: sha256(provider, model, 프롬프트 버전, 렌더링된 평가 프롬프트)
+        (프롬프트에 들어가는 발신자/제목/본문/답변/톤이 하나라도 다르면 다른 키)
+    값: {cache_dir}/{키}.json (평가 결과 + 캐시 시각 + 모델 정보)
+    조회 시 ReplyEvaluation으로 다시 검증하고, 형식이 안 맞거나 ttl이 지난 파일은 삭제합니다.
+    """
+
+    def __init__(self, cache_dir: str, ttl: Optional[float] = None):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl  # 초 단위, None이면 만료 없음
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(provider: str, model: str, prompt: str) -> str:
+        """캐시 키 생성 (각 값 앞에 길이를 붙여서 값 경계가 섞이지 않게 함)"""
+        parts = [
+            provider,
+            model,
+            REPLY_EVAL_PROMPT_VERSION,
+            prompt,
+        ]
+        digest = hashlib.sha256()
+        for part in parts:
+            encoded = str(part).encode("utf-8")
+            digest.update(len(encoded).to_bytes(8, "big"))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str, email_id: int) -> Optional[ReplyEvaluation]:
+        """캐시 조회 (없거나 만료/손상이면 None, email_id는 현재 이메일로 교체)"""
+        path = self._path(key)
+        if not path.exists():
+            self.misses += 1
+            return None
+
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            cached_at = datetime.fromisoformat(entry["cached_at"])
+            if self.ttl is not None and (datetime.now(timezone.utc) - cached_at).total_seconds() > self.ttl:
+                raise ValueError("만료된 캐시")
+
+            names = {f.name for f in fields(ReplyEvaluation)}
+            data = {k: v for k, v in entry["evaluation"].items() if k in names}
+            data["email_id"] = email_id
+            evaluation = ReplyEvaluation(**data)
+        except Exception as e:
+            logger.warning(f"답변 평가 캐시 삭제 ({path.name}): {e}")
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return evaluation
+
+    def put(self, key: str, evaluation: ReplyEvaluation, provider: str, model: str) -> None:
+        """캐시 저장 (임시 파일에 쓴 뒤 교체)"""
+        entry = {
+            "cached_at": datetime.now(timezone.utc).isoformat(),
+            "provider": provider,
+            "model": model,
+            "prompt_version": REPLY_EVAL_PROMPT_VERSION,
+            "evaluation": asdict(evaluation),
+        }
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def stats(self) -> Dict:
+        """캐시 적중 통계"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+# 답변 평가 프롬프트 / 유사도 캐시에 넣는 본문 길이
+BODY_PREVIEW_CHARS = 1000
+
+
+def body_preview(original_email: Dict) -> str:
+    """본문 앞 BODY_PREVIEW_CHARS자 (짧은 본문은 잘라서 복사하지 않고 그대로 사용)"""
+    body = original_email.get('body_text') or ''
+    return body if len(body) <= BODY_PREVIEW_CHARS else body[:BODY_PREVIEW_CHARS]
+
+
+def reply_semantic_text(original_email: Dict, generated_reply: str) -> str:
+    """유사 답변 캐시용 임베딩 입력 텍스트 (제목 + 본문 앞 1000자 + 생성 답변)"""
+    return "\n".join([
+        original_email.get('subject', '') or '',
+        body_preview(original_email),
+        generated_reply or '',
+    ])
+
+
+def _default_reply_embed(text: str) -> List[float]:
+    """RAG 임베딩 모델로 텍스트 임베딩 (sentence-transformers)"""
+    from rag.rag_service import EmailRAGService
+
+    return EmailRAGService().embed_text(text)
+
+
 class PerformanceEvaluator:
     """성능 평가 클래스"""
 
-    def __init__(self):
-        self.analysis_results: List[AnalysisEvaluation] = []
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        semantic_threshold: float = 0.0,
+        embed: Optional[Callable[[str], List[float]]] = None
+    ):
+        self.analysis_scores = AnalysisScoreColumns()
         self.reply_results: List[ReplyEvaluation] = []
         self.summary_results: List[SummaryEvaluation] = []
+        # 답변 평가(LLM-as-Judge) 캐시, cache_dir이 없으면 비활성화
+        self.reply_cache = ReplyEvaluationCache(cache_dir) if cache_dir else None
+        # 유사 답변 평가 재사용 (임베딩 코사인 유사도 기준값, 0이면 비활성화)
+        self.semantic_threshold = semantic_threshold
+        self._embed = embed or _default_reply_embed
+        self._semantic_caches: Dict = {}  # 톤 → SemanticAnalysisCache
+
+    def _get_semantic_cache(self, target_tone: str):
+        """
+        톤별 유사도 캐시 (처음 필요할 때 생성, services.analysis_cache 재사용)
+
+        톤마다 따로 두어야 다른 톤의 더 가까운 답변이 같은 톤의 적중을 가리지 않습니다.
+        """
+        cache = self._semantic_caches.get(target_tone)
+        if cache is None:
+            from services.analysis_cache import SemanticAnalysisCache
+
+            cache = self._semantic_caches[target_tone] = SemanticAnalysisCache(
+                threshold=self.semantic_threshold, maxsize=1024
+            )
+        return cache
+
+    @property
+    def analysis_results(self) -> List[AnalysisEvaluation]:
+        """이메일 분석 평가 결과 목록 (analysis_scores에서 매번 새로 생성)"""
+        return self.analysis_scores.to_evaluations()
 
     # ========== 이메일 분석 평가 ==========
 
@@ -89,17 +475,13 @@ class PerformanceEvaluator:
         gt_importance = int(ground_truth.get('importance_score', 0) or 0)
         importance_diff = abs(ai_importance - gt_importance)
 
-        if importance_diff <= 2:
-            importance_score_accuracy = 25
-        elif importance_diff <= 3:
-            importance_score_accuracy = 15
-        else:
-            importance_score_accuracy = 0
+        importance_score_accuracy = int(_IMPORTANCE_SCORE_TABLE[min(importance_diff, _IMPORTANCE_MAX_DIFF)])
+        if importance_score_accuracy == 0:
             notes.append(f"중요도 차이 큼: AI={ai_importance}, 정답={gt_importance}")
 
         # 3. needs_reply 평가 (25점)
-        ai_needs_reply = str(ai_result.get('needs_reply', '')).lower() in ['true', '1', 'yes']
-        gt_needs_reply = str(ground_truth.get('needs_reply', '')).lower() in ['true', '1', 'yes']
+        ai_needs_reply = str(ai_result.get('needs_reply', '')).lower() in _TRUTHY
+        gt_needs_reply = str(ground_truth.get('needs_reply', '')).lower() in _TRUTHY
         needs_reply_score = 25 if ai_needs_reply == gt_needs_reply else 0
         if needs_reply_score == 0:
             notes.append(f"답변필요 불일치: AI={ai_needs_reply}, 정답={gt_needs_reply}")
@@ -121,9 +503,95 @@ class PerformanceEvaluator:
             evaluation_notes="; ".join(notes)
         )
 
-        self.analysis_results.append(evaluation)
+        self.analysis_scores.append(evaluation)
         return evaluation
 
+    def evaluate_analysis_batch(
+        self,
+        email_ids: List[int],
+        ai_results: List[Dict],
+        ground_truths: List[Dict]
+    ) -> List[AnalysisEvaluation]:
+        """
+        이메일 분석 결과를 한 번에 평가합니다. (evaluate_analysis와 같은 채점 기준)
+
+        필드별로 NumPy 배열을 만들고 점수는 배열 연산으로 계산합니다.
+        email_type / sentiment는 정수 코드로 바꿔서 비교합니다.
+        """
+        n = len(email_ids)
+        if not n:
+            return []
+
+        def codes(field: str) -> Tuple[np.ndarray, np.ndarray]:
+            vocab: Dict = {}
+            ai = np.fromiter((vocab.setdefault(r.get(field), len(vocab)) for r in ai_results), dtype=np.int32, count=n)
+            gt = np.fromiter((vocab.setdefault(g.get(field), len(vocab)) for g in ground_truths), dtype=np.int32, count=n)
+            return ai, gt
+
+        def importance(rows: List[Dict]) -> np.ndarray:
+            return np.fromiter((int(r.get('importance_score', 0) or 0) for r in rows), dtype=np.int64, count=n)
+
+        def needs_reply(rows: List[Dict]) -> np.ndarray:
+            values = np.char.lower(np.array([str(r.get('needs_reply', '')) for r in rows]))
+            return np.isin(values, _TRUTHY_ARRAY)
+
+        ai_type, gt_type = codes('email_type')
+        ai_sentiment, gt_sentiment = codes('sentiment')
+        ai_importance, gt_importance = importance(ai_results), importance(ground_truths)
+        ai_reply, gt_reply = needs_reply(ai_results), needs_reply(ground_truths)
+
+        type_match = ai_type == gt_type
+        importance_diff = np.abs(ai_importance - gt_importance)
+        reply_match = ai_reply == gt_reply
+        sentiment_match = ai_sentiment == gt_sentiment
+
+        type_scores = np.where(type_match, 25, 0)
+        importance_scores = _IMPORTANCE_SCORE_TABLE[np.minimum(importance_diff, _IMPORTANCE_MAX_DIFF)].astype(np.int64)
+        reply_scores = np.where(reply_match, 25, 0)
+        sentiment_scores = np.where(sentiment_match, 25, 0)
+        totals = type_scores + importance_scores + reply_scores + sentiment_scores
+
+        # 불일치 항목만 메모 작성
+        notes: List[List[str]] = [[] for _ in range(n)]
+        for i in np.flatnonzero(~type_match):
+            notes[i].append(f"유형 불일치: AI={ai_results[i].get('email_type')}, 정답={ground_truths[i].get('email_type')}")
+        for i in np.flatnonzero(importance_diff > 3):
+            notes[i].append(f"중요도 차이 큼: AI={ai_importance[i]}, 정답={gt_importance[i]}")
+        for i in np.flatnonzero(~reply_match):
+            notes[i].append(f"답변필요 불일치: AI={bool(ai_reply[i])}, 정답={bool(gt_reply[i])}")
+        for i in np.flatnonzero(~sentiment_match):
+            notes[i].append(f"감정 불일치: AI={ai_results[i].get('sentiment')}, 정답={ground_truths[i].get('sentiment')}")
+
+        note_texts = ["; ".join(note) for note in notes]
+        self.analysis_scores.extend(list(email_ids), note_texts, {
+            "email_type_score": type_scores,
+            "importance_score_accuracy": importance_scores,
+            "needs_reply_score": reply_scores,
+            "sentiment_score": sentiment_scores,
+            "total_score": totals,
+        })
+
+        return [
+            AnalysisEvaluation(
+                email_id=email_id,
+                email_type_score=type_score,
+                importance_score_accuracy=importance_score,
+                needs_reply_score=reply_score,
+                sentiment_score=sentiment_score,
+                total_score=total,
+                evaluation_notes=note
+            )
+            for email_id, type_score, importance_score, reply_score, sentiment_score, total, note in zip(
+                email_ids,
+                type_scores.tolist(),
+                importance_scores.tolist(),
+                reply_scores.tolist(),
+                sentiment_scores.tolist(),
+                totals.tolist(),
+                note_texts
+            )
+        ]
+
     # ========== 답변 생성 평가 (LLM-as-Judge) ==========
 
     def create_reply_evaluation_prompt(
@@ -134,36 +602,169 @@ class PerformanceEvaluator:
     ) -> str:
         """답변 평가를 위한 프롬프트 생성"""
 
-        return f"""다음 이메일에 대한 AI 생성 답변을 평가해주세요.
+        return _REPLY_PROMPT_TMPL.format(
+            sender_name=original_email.get('sender_name', 'Unknown'),
+            sender_address=original_email.get('sender_address', ''),
+            subject=original_email.get('subject', ''),
+            body=body_preview(original_email),
+            generated_reply=generated_reply,
+            target_tone=target_tone
+        )
 
-## 원본 이메일
-- 발신자: {original_email.get('sender_name', 'Unknown')} <{original_email.get('sender_address', '')}>
-- 제목: {original_email.get('subject', '')}
-- 본문:
-{original_email.get('body_text', '')[:1000]}
+    def evaluate_reply(
+        self,
+        email_id: int,
+        original_email: Dict,
+        generated_reply: str,
+        target_tone: str,
+        judge: Callable[[str], str],
+        provider: str = "gemini",
+        model: str = ""
+    ) -> ReplyEvaluation:
+        """
+        답변을 LLM-as-Judge로 평가합니다. (캐시 적중 시 LLM 호출 생략)
 
-## AI 생성 답변 (목표 톤: {target_tone})
-{generated_reply}
+        Args:
+            judge: 평가 프롬프트를 받아 LLM 응답 텍스트를 반환하는 함수
+            provider / model: 캐시 키와 감사용 메타데이터
+        """
+        cached, key, embedding = self._lookup_reply_caches(
+            email_id, original_email, generated_reply, target_tone, provider, model
+        )
+        if cached is not None:
+            self.reply_results.append(cached)
+            return cached
 
-## 평가 기준 (각 항목 0-25점)
+        # LLM 호출
+        prompt = self.create_reply_evaluation_prompt(original_email, generated_reply, target_tone)
+        return self._finish_reply_evaluation(email_id, judge(prompt), key, embedding, target_tone, provider, model)
 
-1. **문맥 이해도** (0-25점): 원본 이메일의 핵심 내용을 정확히 파악했는가?
-2. **톤 일관성** (0-25점): 요청된 톤({target_tone})을 잘 유지했는가?
-3. **응답 적절성** (0-25점): 이메일에 대한 답변으로 적절한가? (질문에 답변, 요청 처리 등)
-4. **한국어 자연스러움** (0-25점): 문법, 어휘, 경어체 사용이 자연스러운가?
+    async def evaluate_replies_batch(
+        self,
+        items: List[Dict],
+        judge: Callable[[str], Awaitable[str]],
+        concurrency: int = 16,
+        provider: str = "gemini",
+        model: str = ""
+    ) -> List[ReplyEvaluation]:
+        """
+        여러 답변을 LLM-as-Judge로 동시에 평가합니다. (입력 순서대로 반환)
 
-## 출력 형식 (JSON)
-```json
-{{
-    "context_understanding": <점수>,
-    "tone_consistency": <점수>,
-    "response_appropriateness": <점수>,
-    "korean_naturalness": <점수>,
-    "total_score": <총점>,
-    "evaluation_notes": "<평가 의견>"
-}}
-```
-"""
+        캐시는 먼저 동기로 확인하고, 캐시 미스만 judge로 보냅니다. (동시 호출 수는 concurrency로 제한)
+
+        Args:
+            items: [{email_id, original_email, generated_reply, target_tone}, ...]
+            judge: 평가 프롬프트를 받아 LLM 응답 텍스트를 반환하는 async 함수
+                   (HTTP 클라이언트는 호출 측에서 1개를 만들어 재사용하세요)
+        """
+        results: List[Optional[ReplyEvaluation]] = [None] * len(items)
+        misses = []
+
+        for i, item in enumerate(items):
+            cached, key, embedding = self._lookup_reply_caches(
+                item["email_id"], item["original_email"], item["generated_reply"], item["target_tone"],
+                provider, model
+            )
+            if cached is not None:
+                results[i] = cached
+            else:
+                misses.append((i, key, embedding))
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _judge_one(item: Dict) -> str:
+            prompt = self.create_reply_evaluation_prompt(
+                item["original_email"], item["generated_reply"], item["target_tone"]
+            )
+            async with semaphore:
+                try:
+                    return await judge(prompt)
+                except Exception as e:
+                    logger.error(f"답변 평가 LLM 호출 실패 (email_id={item['email_id']}): {e}")
+                    return ""
+
+        responses = await asyncio.gather(*[_judge_one(items[i]) for i, _, _ in misses])
+
+        # 파싱/캐시 저장은 입력 순서대로 (reply_results 순서 유지)
+        responses_by_index = {i: (key, embedding, response) for (i, key, embedding), response in zip(misses, responses)}
+        for i, item in enumerate(items):
+            if results[i] is not None:
+                self.reply_results.append(results[i])
+                continue
+            key, embedding, response = responses_by_index[i]
+            results[i] = self._finish_reply_evaluation(
+                item["email_id"], response, key, embedding, item["target_tone"], provider, model
+            )
+
+        return results
+
+    def _lookup_reply_caches(
+        self,
+        email_id: int,
+        original_email: Dict,
+        generated_reply: str,
+        target_tone: str,
+        provider: str,
+        model: str
+    ) -> Tuple[Optional[ReplyEvaluation], Optional[str], Optional[List[float]]]:
+        """
+        답변 평가 캐시 조회: 정확 일치(파일) → 유사 답변(임베딩)
+
+        Returns:
+            (캐시된 평가 또는 None, 파일 캐시 키, 임베딩) - 키/임베딩은 미스 후 결과 저장에 다시 사용
+        """
+        # 1. 정확 일치 (파일 캐시)
+        key = None
+        if self.reply_cache is not None:
+            prompt = self.create_reply_evaluation_prompt(original_email, generated_reply, target_tone)
+            key = self.reply_cache.make_key(provider, model, prompt)
+            cached = self.reply_cache.get(key, email_id)
+            if cached is not None:
+                return cached, key, None
+
+        # 2. 유사 답변 (임베딩 코사인 유사도, 같은 톤 캐시에서만 검색)
+        embedding = None
+        if self.semantic_threshold > 0:
+            try:
+                embedding = self._embed(reply_semantic_text(original_email, generated_reply))
+            except Exception as e:
+                logger.debug(f"유사 답변 캐시 임베딩 실패 (건너뜀): {e}")
+
+        if embedding is not None:
+            match = self._get_semantic_cache(target_tone).match(embedding)
+            if match is not None:
+                similar, similarity = match
+                note = f"유사 답변 캐시 적중 (유사도={similarity:.3f})"
+                evaluation = replace(
+                    similar,
+                    email_id=email_id,
+                    evaluation_notes=f"{similar.evaluation_notes}; {note}" if similar.evaluation_notes else note
+                )
+                return evaluation, key, embedding
+
+        return None, key, embedding
+
+    def _finish_reply_evaluation(
+        self,
+        email_id: int,
+        llm_response: str,
+        key: Optional[str],
+        embedding: Optional[List[float]],
+        target_tone: str,
+        provider: str,
+        model: str
+    ) -> ReplyEvaluation:
+        """LLM 응답 파싱 + 파싱에 성공한 결과만 (reply_results에 추가된 경우) 캐시 저장"""
+        parsed_before = len(self.reply_results)
+        evaluation = self.parse_reply_evaluation(email_id, llm_response)
+
+        if len(self.reply_results) > parsed_before:
+            if key is not None:
+                self.reply_cache.put(key, evaluation, provider, model)
+            if embedding is not None:
+                self._get_semantic_cache(target_tone).add(embedding, evaluation)
+
+        return evaluation
 
     def parse_reply_evaluation(
         self,
@@ -174,15 +775,14 @@ class PerformanceEvaluator:
 
         try:
             # JSON 블록 추출
-            import re
-            json_match = re.search(r'```json\s*(.*?)\s*```', llm_response, re.DOTALL)
+            json_match = _JSON_BLOCK_RE.search(llm_response)
             if json_match:
                 json_str = json_match.group(1)
             else:
                 # JSON 블록이 없으면 전체에서 찾기
                 json_str = llm_response
 
-            data = json.loads(json_str)
+            data = orjson.loads(json_str) if orjson is not None else json.loads(json_str)
 
             evaluation = ReplyEvaluation(
                 email_id=email_id,
@@ -214,23 +814,30 @@ class PerformanceEvaluator:
 
     def get_analysis_statistics(self) -> Dict:
         """이메일 분석 평가 통계"""
-        if not self.analysis_results:
+        scores = self.analysis_scores
+        if not len(scores):
             return {"message": "평가 데이터 없음"}
 
-        total_scores = [r.total_score for r in self.analysis_results]
+        # 5개 점수 필드별 평균/표준편차/최소/최대 (누적 통계, 중앙값만 컬럼 순회)
+        summary = scores.summary()
+
+        def avg(field: str) -> float:
+            return round(summary[field][1], 2)
+
+        _, _, total_std, total_min, total_max = summary["total_score"]
 
         return {
-            "count": len(self.analysis_results),
-            "average_score": round(statistics.mean(total_scores), 2),
-            "median_score": round(statistics.median(total_scores), 2),
-            "min_score": min(total_scores),
-            "max_score": max(total_scores),
-            "std_dev": round(statistics.stdev(total_scores), 2) if len(total_scores) > 1 else 0,
+            "count": len(scores),
+            "average_score": avg("total_score"),
+            "median_score": round(_order_stats(scores.column("total_score"))[1], 2),
+            "min_score": total_min,
+            "max_score": total_max,
+            "std_dev": round(total_std, 2) if len(scores) > 1 else 0,
             "breakdown": {
-                "email_type_avg": round(statistics.mean([r.email_type_score for r in self.analysis_results]), 2),
-                "importance_avg": round(statistics.mean([r.importance_score_accuracy for r in self.analysis_results]), 2),
-                "needs_reply_avg": round(statistics.mean([r.needs_reply_score for r in self.analysis_results]), 2),
-                "sentiment_avg": round(statistics.mean([r.sentiment_score for r in self.analysis_results]), 2)
+                "email_type_avg": avg("email_type_score"),
+                "importance_avg": avg("importance_score_accuracy"),
+                "needs_reply_avg": avg("needs_reply_score"),
+                "sentiment_avg": avg("sentiment_score")
             }
         }
 
@@ -239,19 +846,27 @@ class PerformanceEvaluator:
         if not self.reply_results:
             return {"message": "평가 데이터 없음"}
 
-        total_scores = [r.total_score for r in self.reply_results]
+        n = len(self.reply_results)
+
+        def avg(field: str) -> float:
+            # 항목별 평균은 리스트/배열을 만들지 않고 generator를 fmean으로 바로 합산
+            return round(statistics.fmean(getattr(r, field) for r in self.reply_results), 2)
+
+        total_scores = np.fromiter((r.total_score for r in self.reply_results), dtype=np.float64, count=n)
+        total_min, total_median, total_max = _order_stats(total_scores)
+        (total_sum,), _, _, _ = row_moments(total_scores[np.newaxis, :])
 
         return {
-            "count": len(self.reply_results),
-            "average_score": round(statistics.mean(total_scores), 2),
-            "median_score": round(statistics.median(total_scores), 2),
-            "min_score": min(total_scores),
-            "max_score": max(total_scores),
+            "count": n,
+            "average_score": round(float(total_sum) / n, 2),
+            "median_score": round(total_median, 2),
+            "min_score": total_min,
+            "max_score": total_max,
             "breakdown": {
-                "context_understanding_avg": round(statistics.mean([r.context_understanding for r in self.reply_results]), 2),
-                "tone_consistency_avg": round(statistics.mean([r.tone_consistency for r in self.reply_results]), 2),
-                "response_appropriateness_avg": round(statistics.mean([r.response_appropriateness for r in self.reply_results]), 2),
-                "korean_naturalness_avg": round(statistics.mean([r.korean_naturalness for r in self.reply_results]), 2)
+                "context_understanding_avg": avg("context_understanding"),
+                "tone_consistency_avg": avg("tone_consistency"),
+                "response_appropriateness_avg": avg("response_appropriateness"),
+                "korean_naturalness_avg": avg("korean_naturalness")
             }
         }
 
@@ -268,7 +883,8 @@ class PerformanceEvaluator:
         improvement = after_avg - before_avg
         improvement_pct = (improvement / before_avg * 100) if before_avg > 0 else 0
 
-        report = f"""
+        buf = io.StringIO()
+        buf.write(f"""
 ╔══════════════════════════════════════════════════════════════╗
 ║            {evaluation_type.upper()} 성능 개선 비교 리포트              ║
 ╠══════════════════════════════════════════════════════════════╣
@@ -280,42 +896,45 @@ class PerformanceEvaluator:
 ║  │ 평균 점수  │  {before_avg:>6.1f}점  │  {after_avg:>6.1f}점  │  {improvement_pct:>+6.1f}%  │       ║
 ║  └────────────┴────────────┴────────────┴────────────┘       ║
 ║                                                              ║
-"""
+""")
 
         if 'breakdown' in before_stats and 'breakdown' in after_stats:
-            report += "║  📈 항목별 상세                                              ║\n"
+            buf.write("║  📈 항목별 상세                                              ║\n")
 
             for key in before_stats['breakdown'].keys():
                 before_val = before_stats['breakdown'].get(key, 0)
                 after_val = after_stats['breakdown'].get(key, 0)
                 item_improvement = after_val - before_val
 
-                # 시각화 바
-                bar_length = int(after_val)
-                bar = "█" * bar_length + "░" * (25 - bar_length)
+                # 시각화 바 (템플릿 슬라이스 1번)
+                bar_length = min(max(int(after_val), 0), _BAR_WIDTH)
+                bar = _BAR_TEMPLATE[_BAR_WIDTH - bar_length:2 * _BAR_WIDTH - bar_length]
 
-                report += f"║  {key:<20} {bar} {after_val:>5.1f} ({item_improvement:>+5.1f}) ║\n"
+                buf.write(f"║  {key:<20} {bar} {after_val:>5.1f} ({item_improvement:>+5.1f}) ║\n")
 
-        report += """║                                                              ║
+        buf.write("""║                                                              ║
 ╚══════════════════════════════════════════════════════════════╝
-"""
-        return report
+""")
+        return buf.getvalue()
 
     def export_results(self, filepath: str):
-        """결과를 JSON 파일로 내보내기"""
+        """
+        결과를 JSON 파일로 내보내기
+
+        dataclass는 dict로 복사하지 않고 바로 직렬화하며, 평가 목록은 원소 1개씩 스트리밍으로 씁니다.
+        """
         data = {
             "exported_at": datetime.now().isoformat(),
-            "analysis_evaluations": [asdict(r) for r in self.analysis_results],
-            "reply_evaluations": [asdict(r) for r in self.reply_results],
-            "summary_evaluations": [asdict(r) for r in self.summary_results],
+            "analysis_evaluations": self.analysis_results,
+            "reply_evaluations": self.reply_results,
+            "summary_evaluations": self.summary_results,
             "statistics": {
                 "analysis": self.get_analysis_statistics(),
                 "reply": self.get_reply_statistics()
             }
         }
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        _stream_json_object(filepath, data)
 
         logger.info(f"평가 결과 내보내기 완료: {filepath}")
 
@@ -343,5 +962,15 @@ def create_ground_truth_template(emails: List[Dict]) -> List[Dict]:
     return templates
 
 
-# 싱글톤 인스턴스
-evaluator = PerformanceEvaluator()
+# 싱글톤 인스턴스 (첫 접근 시 생성)
+@functools.cache
+def get_evaluator() -> PerformanceEvaluator:
+    """PerformanceEvaluator 싱글톤 반환"""
+    return PerformanceEvaluator()
+
+
+def __getattr__(name):
+    """기존 `from performance_evaluator import evaluator` 호환 (PEP 562, 접근 시점에 생성)"""
+    if name == "evaluator":
+        return get_evaluator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,6 +7,7 @@ Phase 2: With RAG (RAG DB 적용 후)
 사용법:
     # 테스트 데이터 생성
     python run_evaluation.py --generate-data
+    python run_evaluation.py --generate-data --pretty
 
     # Phase 1 측정 (5개만 테스트)
     python run_evaluation.py --phase phase1_baseline --limit 5
@@ -18,33 +19,177 @@ Phase 2: With RAG (RAG DB 적용 후)
     python run_evaluation.py --compare
 """
 
+import csv
+import functools
+import io
 import json
 import sys
 import os
 import argparse
+import asyncio
+import atexit
 import requests
+from requests.adapters import HTTPAdapter
 import psycopg2
+import threading
 import time
-from psycopg2.extras import RealDictCursor
+from concurrent.futures import ThreadPoolExecutor
+from psycopg2.extras import execute_values
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
 # 경로 설정
 EVAL_DIR = Path(__file__).parent.parent
-DATA_DIR = EVAL_DIR / "data"
 RESULTS_DIR = EVAL_DIR / "results"
 REPORTS_DIR = EVAL_DIR / "reports"
 
 # 평가 모듈 임포트
 sys.path.insert(0, str(Path(__file__).parent))
-from performance_evaluator import PerformanceEvaluator, evaluator
-from dataset_generator import dataset_generator
+from performance_evaluator import PerformanceEvaluator
+from dataset_generator import DATA_DIR, get_dataset_generator, ground_truth_by_id, _read_json, _write_json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import httpx
+except ImportError:  # httpx가 없으면 스레드 풀 + requests로 호출
+    httpx = None
+
+try:
+    import google.generativeai as genai
+except ImportError:  # 답변 평가(LLM-as-Judge)를 쓸 때만 필요
+    genai = None
 
 # 테스트용 ID 시작 번호 (기존 데이터와 충돌 방지)
 TEST_ID_START = 90000
 
 
+class RequestRateLimiter:
+    """
+    스레드 안전 요청 속도 제한기
+
+    분당 requests_per_minute회가 넘지 않도록 요청 시작 시각을 균등 간격으로 배정합니다.
+    (응답 대기는 여러 스레드에서 겹쳐도 webhook 호출 시작 간격은 유지)
+    """
+
+    def __init__(self, requests_per_minute: float = 15):
+        self.requests_per_minute = requests_per_minute
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """다음 요청 슬롯 예약 후 대기해야 할 초 반환"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_at, now)
+            self._next_at = slot + self.interval
+        return slot - now
+
+    def acquire(self) -> None:
+        """다음 요청 슬롯까지 대기"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """다음 요청 슬롯까지 대기 (이벤트 루프는 막지 않음)"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+# 25칸 시각화 바 (채운 칸 수 → 문자열, 리포트마다 문자열 곱셈을 하지 않도록 미리 생성)
+_BARS = tuple('█' * i + '░' * (25 - i) for i in range(26))
+
+
+def _bar(value) -> str:
+    """값(0~25)에 해당하는 시각화 바 (범위 밖이면 양 끝으로 맞춤)"""
+    return _BARS[min(max(int(value), 0), 25)]
+
+
+# 분석 리포트 템플릿 (generate_report에서 str.format_map으로 채움)
+_REPORT_TMPL = """# 성능 평가 리포트: {phase}
+
+## 개요
+- **평가 일시**: {started_at}
+- **완료 일시**: {completed_at}
+- **Phase**: {phase}
+
+---
+
+## 이메일 분석 성능
+
+### 전체 통계
+| 항목 | 값 |
+|------|-----|
+| 평가 건수 | {count} |
+| 평균 점수 | {average_score}/100 |
+| 중앙값 | {median_score} |
+| 최소/최대 | {min_score} / {max_score} |
+| 표준편차 | {std_dev} |
+
+### 항목별 점수 (25점 만점)
+| 항목 | 평균 점수 | 정확도 |
+|------|----------|--------|
+| email_type | {email_type_avg} | {email_type_pct:.1f}% |
+| importance_score | {importance_avg} | {importance_pct:.1f}% |
+| needs_reply | {needs_reply_avg} | {needs_reply_pct:.1f}% |
+| sentiment | {sentiment_avg} | {sentiment_pct:.1f}% |
+
+### 시각화
+```
+email_type      {email_type_bar} {email_type_avg}/25
+importance      {importance_bar} {importance_avg}/25
+needs_reply     {needs_reply_bar} {needs_reply_avg}/25
+sentiment       {sentiment_bar} {sentiment_avg}/25
+```
+
+---
+
+## 상세 결과
+
+### 오류 발생 건
+{errors}
+---
+
+## 개선 제안
+
+1. **email_type 정확도 개선**: {email_type_suggestion}
+2. **importance 정확도 개선**: {importance_suggestion}
+3. **sentiment 정확도 개선**: {sentiment_suggestion}
+
+---
+
+*Generated at {generated_at}*
+"""
+
+# 항목 평균이 20점 미만일 때 리포트에 넣는 개선 제안
+_REPORT_SUGGESTIONS = {
+    "email_type": "프롬프트에 분류 예시 추가 필요",
+    "importance": "중요도 기준 명확화 필요",
+    "sentiment": "감정 분석 프롬프트 보강 필요",
+}
+
+
+def _encode_payload(payload: Dict) -> bytes:
+    """UTF-8 JSON bytes 인코딩 (webhook 요청 본문 / 결과 jsonl, 한글은 이스케이프하지 않음)"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+
+def _decode_response(response: requests.Response):
+    """webhook 응답 JSON 파싱 (orjson.JSONDecodeError는 json.JSONDecodeError의 하위 클래스)"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
 class TestDatabaseManager:
     """테스트용 DB 관리자 (직접 연결)"""
 
@@ -56,56 +201,110 @@ class TestDatabaseManager:
         self.password = os.getenv("MY_POSTGRES_PASSWORD", os.getenv("POSTGRES_PASSWORD", "1234"))
         self.port = int(os.getenv("MY_POSTGRES_PORT", os.getenv("POSTGRES_PORT", "5432")))
 
+        self._conn = None
+        atexit.register(self.close)
+
     def get_connection(self):
-        """PostgreSQL 연결"""
+        """
+        새 PostgreSQL 연결
+
+        기본 커서는 튜플 행을 반환합니다 (삽입/삭제 경로는 행을 읽지 않음).
+        행을 dict로 읽어야 하면 conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)로 따로 여세요.
+        """
         return psycopg2.connect(
             host=self.host,
             database=self.database,
             user=self.user,
             password=self.password,
-            port=self.port,
-            cursor_factory=RealDictCursor
+            port=self.port
         )
 
-    def insert_test_emails(self, emails: List[Dict]) -> List[int]:
-        """테스트 이메일들을 DB에 삽입"""
-        conn = self.get_connection()
+    @property
+    def connection(self):
+        """재사용하는 PostgreSQL 연결 (첫 사용 시 연결, 끊겼으면 다시 연결)"""
+        if self._conn is None or self._conn.closed:
+            self._conn = self.get_connection()
+        return self._conn
+
+    def close(self) -> None:
+        """재사용 연결 닫기"""
+        if self._conn is not None and not self._conn.closed:
+            self._conn.close()
+        self._conn = None
+
+    @staticmethod
+    def _test_email_rows(emails: List[Dict]) -> List[tuple]:
+        """삽입할 행 목록 (synthetic_001 -> 90001 형식으로 ID 변환)"""
+        received_default = datetime.now().isoformat()
+        return [
+            (
+                TEST_ID_START + i + 1,
+                email.get('subject'),
+                email.get('sender_name'),
+                email.get('sender_address'),
+                email.get('body_text'),
+                email.get('received_at', received_default),
+                f"test_{email.get('id')}",
+            )
+            for i, email in enumerate(emails)
+        ]
+
+    # 테스트 이메일 upsert 공통 절 (같은 ID가 남아 있으면 덮어쓰고 분석 결과 초기화)
+    # 모든 행이 삽입 또는 갱신되고 ID는 Python에서 정하므로 RETURNING 없음
+    _UPSERT_CLAUSE = """
+        ON CONFLICT (id) DO UPDATE SET
+            subject = EXCLUDED.subject,
+            sender_name = EXCLUDED.sender_name,
+            sender_address = EXCLUDED.sender_address,
+            body_text = EXCLUDED.body_text,
+            received_at = EXCLUDED.received_at,
+            email_type = NULL,
+            importance_score = NULL,
+            needs_reply = NULL,
+            sentiment = NULL,
+            ai_analysis = NULL,
+            processing_status = NULL
+    """
+
+    @staticmethod
+    def _skip_commit_fsync(cur) -> None:
+        """
+        현재 트랜잭션만 synchronous_commit 끄기 (커밋 시 WAL fsync를 기다리지 않음)
+
+        테스트 이메일은 평가 후 정리되는 임시 데이터라 서버 장애 시 마지막 커밋이 유실돼도 문제없습니다.
+        """
+        cur.execute("SET LOCAL synchronous_commit TO OFF")
+
+    def insert_test_emails(self, emails: List[Dict], method: str = "copy") -> List[int]:
+        """
+        테스트 이메일들을 DB에 삽입
+
+        method:
+            "copy"     - COPY FROM STDIN으로 임시 테이블에 적재한 뒤 ON CONFLICT DO UPDATE로 병합 (기본, 가장 빠름)
+            "values"   - INSERT ... ON CONFLICT DO UPDATE 한 문장으로 덮어쓰기 (execute_values)
+            "prepared" - PREPARE한 upsert를 행마다 실행 (실패한 행만 건너뛰고 나머지는 삽입)
+        """
+        rows = self._test_email_rows(emails)
+        if method == "copy":
+            return self._copy_test_emails(rows)
+        if method == "prepared":
+            return self._upsert_test_emails_prepared(rows)
+        if method != "values":
+            raise ValueError(f"알 수 없는 삽입 방식: {method}")
+
+        conn = self.connection
         cur = conn.cursor()
-        inserted_ids = []
 
         try:
-            for i, email in enumerate(emails):
-                # synthetic_001 -> 90001 형식으로 ID 변환
-                test_id = TEST_ID_START + i + 1
-
-                cur.execute("""
-                    INSERT INTO email
-                    (id, subject, sender_name, sender_address, body_text, received_at, original_uid, is_replied_to)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, FALSE)
-                    ON CONFLICT (id) DO UPDATE SET
-                        subject = EXCLUDED.subject,
-                        sender_name = EXCLUDED.sender_name,
-                        sender_address = EXCLUDED.sender_address,
-                        body_text = EXCLUDED.body_text,
-                        received_at = EXCLUDED.received_at,
-                        email_type = NULL,
-                        importance_score = NULL,
-                        needs_reply = NULL,
-                        sentiment = NULL,
-                        ai_analysis = NULL,
-                        processing_status = NULL
-                    RETURNING id
-                """, (
-                    test_id,
-                    email.get('subject'),
-                    email.get('sender_name'),
-                    email.get('sender_address'),
-                    email.get('body_text'),
-                    email.get('received_at', datetime.now().isoformat()),
-                    f"test_{email.get('id')}",
-                ))
-                result = cur.fetchone()
-                inserted_ids.append(result['id'])
+            self._skip_commit_fsync(cur)
+
+            # 한 문장으로 일괄 삽입 (page_size 단위로 나눠 전송)
+            execute_values(cur, """
+                INSERT INTO email
+                (id, subject, sender_name, sender_address, body_text, received_at, original_uid, is_replied_to)
+                VALUES %s
+            """ + self._UPSERT_CLAUSE, rows, template="(%s, %s, %s, %s, %s, %s, %s, FALSE)", page_size=1000)
+            inserted_ids = [row[0] for row in rows]
 
             conn.commit()
             print(f"✅ {len(inserted_ids)}개 테스트 이메일 DB 삽입 완료")
@@ -116,70 +315,164 @@ class TestDatabaseManager:
             raise e
         finally:
             cur.close()
-            conn.close()
+
+    def _upsert_test_emails_prepared(self, rows: List[tuple]) -> List[int]:
+        """
+        PREPARE한 upsert 문을 행마다 실행 (parse/plan은 연결당 1번)
+
+        행마다 SAVEPOINT를 잡아서 실패한 행만 되돌리고 나머지는 그대로 커밋합니다.
+        """
+        conn = self.connection
+        cur = conn.cursor()
+        inserted_ids = []
+        prepared = False
+
+        try:
+            self._skip_commit_fsync(cur)
+            cur.execute("""
+                PREPARE ins_test_email (integer, text, text, text, text, timestamp, text) AS
+                INSERT INTO email
+                (id, subject, sender_name, sender_address, body_text, received_at, original_uid, is_replied_to)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, FALSE)
+            """ + self._UPSERT_CLAUSE)
+            prepared = True
+
+            for row in rows:
+                cur.execute("SAVEPOINT ins_test_email_row")
+                try:
+                    cur.execute("EXECUTE ins_test_email (%s, %s, %s, %s, %s, %s, %s)", row)
+                    inserted_ids.append(row[0])
+                    cur.execute("RELEASE SAVEPOINT ins_test_email_row")
+                except psycopg2.Error as e:
+                    cur.execute("ROLLBACK TO SAVEPOINT ins_test_email_row")
+                    print(f"  [WARN] 테스트 이메일 삽입 실패 (ID: {row[0]}): {e}")
+
+            cur.execute("DEALLOCATE ins_test_email")
+            conn.commit()
+            print(f"✅ {len(inserted_ids)}/{len(rows)}개 테스트 이메일 DB 삽입 완료")
+            return inserted_ids
+
+        except Exception as e:
+            conn.rollback()
+            # PREPARE는 롤백되지 않으므로 재사용 연결에 남지 않게 정리
+            if prepared:
+                try:
+                    cur.execute("DEALLOCATE ins_test_email")
+                    conn.commit()
+                except psycopg2.Error:
+                    conn.rollback()
+            raise e
+        finally:
+            cur.close()
+
+    def _copy_test_emails(self, rows: List[tuple]) -> List[int]:
+        """
+        COPY로 테스트 이메일 일괄 적재 (ID는 Python에서 정하므로 RETURNING 불필요)
+
+        email 행을 지우지 않고 임시 테이블 → upsert로 병합하므로
+        이전 실행의 sent_emails 등 email(id)를 참조하는 행이 남아 있어도 실패하지 않습니다.
+        """
+        conn = self.connection
+        cur = conn.cursor()
+        test_ids = [row[0] for row in rows]
+
+        try:
+            self._skip_commit_fsync(cur)
+
+            # 트랜잭션이 끝나면 사라지는 임시 테이블 (email과 같은 컬럼 타입)
+            cur.execute("""
+                CREATE TEMP TABLE tmp_test_email ON COMMIT DROP AS
+                SELECT id, subject, sender_name, sender_address, body_text, received_at, original_uid, is_replied_to
+                FROM email
+                WITH NO DATA
+            """)
+
+            # NULL 표시는 \N으로 명시 (None → \N → NULL, "" → 따옴표 없는 빈 칸 → 빈 문자열)
+            # 기본 CSV NULL(빈 칸)을 쓰면 빈 제목/본문이 NULL이 되어 values / prepared 방식과 달라짐
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            for row in rows:
+                writer.writerow((*(r"\N" if value is None else value for value in row), "false"))
+            buf.seek(0)
+
+            cur.copy_expert(r"""
+                COPY tmp_test_email
+                (id, subject, sender_name, sender_address, body_text, received_at, original_uid, is_replied_to)
+                FROM STDIN WITH (FORMAT csv, NULL '\N')
+            """, buf)
+
+            # 기존 "values" 방식과 같은 upsert로 병합
+            cur.execute("""
+                INSERT INTO email
+                (id, subject, sender_name, sender_address, body_text, received_at, original_uid, is_replied_to)
+                SELECT id, subject, sender_name, sender_address, body_text, received_at, original_uid, is_replied_to
+                FROM tmp_test_email
+            """ + self._UPSERT_CLAUSE)
+
+            conn.commit()
+            print(f"✅ {len(test_ids)}개 테스트 이메일 DB 삽입 완료 (COPY)")
+            return test_ids
+
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            cur.close()
 
     def delete_test_emails(self, email_ids: List[int]) -> int:
         """테스트 이메일 삭제"""
         if not email_ids:
             return 0
 
-        conn = self.get_connection()
+        conn = self.connection
         cur = conn.cursor()
 
         try:
-            # 관련 reply_drafts 먼저 삭제
-            cur.execute("""
-                DELETE FROM reply_drafts
-                WHERE email_id = ANY(%s)
-            """, (email_ids,))
-
-            # 이메일 삭제
+            # 관련 reply_drafts와 이메일을 한 문장으로 삭제 (데이터 변경 CTE는 참조하지 않아도 실행됨)
             cur.execute("""
+                WITH del_drafts AS (
+                    DELETE FROM reply_drafts
+                    WHERE email_id = ANY(%s)
+                )
                 DELETE FROM email
                 WHERE id = ANY(%s)
-                RETURNING id
-            """, (email_ids,))
-            deleted = cur.fetchall()
+            """, (email_ids, email_ids))
+            deleted = cur.rowcount  # 본 DELETE(email)의 삭제 행 수
             conn.commit()
-            print(f"🗑️ {len(deleted)}개 테스트 이메일 삭제 완료")
-            return len(deleted)
+            print(f"🗑️ {deleted}개 테스트 이메일 삭제 완료")
+            return deleted
 
         except Exception as e:
             conn.rollback()
             raise e
         finally:
             cur.close()
-            conn.close()
 
     def cleanup_all_test_emails(self) -> int:
         """모든 테스트 이메일 삭제 (ID >= TEST_ID_START)"""
-        conn = self.get_connection()
+        conn = self.connection
         cur = conn.cursor()
 
         try:
-            # 관련 reply_drafts 먼저 삭제
-            cur.execute("""
-                DELETE FROM reply_drafts
-                WHERE email_id >= %s
-            """, (TEST_ID_START,))
-
-            # 테스트 이메일 삭제
+            # 관련 reply_drafts와 테스트 이메일을 한 문장으로 삭제
             cur.execute("""
+                WITH del_drafts AS (
+                    DELETE FROM reply_drafts
+                    WHERE email_id >= %s
+                )
                 DELETE FROM email
                 WHERE id >= %s
-                RETURNING id
-            """, (TEST_ID_START,))
-            deleted = cur.fetchall()
+            """, (TEST_ID_START, TEST_ID_START))
+            deleted = cur.rowcount
             conn.commit()
-            print(f"🗑️ 모든 테스트 이메일 삭제 완료: {len(deleted)}개")
-            return len(deleted)
+            print(f"🗑️ 모든 테스트 이메일 삭제 완료: {deleted}개")
+            return deleted
 
         except Exception as e:
             conn.rollback()
             raise e
         finally:
             cur.close()
-            conn.close()
 
 
 class EvaluationRunner:
@@ -190,24 +483,51 @@ class EvaluationRunner:
         '·': '-',      # middle dot -> hyphen
         '–': '-',      # en dash -> hyphen
         '—': '-',      # em dash -> hyphen
-        ''': "'",      # fancy single quote -> simple quote
-        ''': "'",      # fancy single quote -> simple quote
-        '"': '"',      # fancy double quote -> simple quote
-        '"': '"',      # fancy double quote -> simple quote
+        '\u2018': "'",  # fancy single quote -> simple quote
+        '\u2019': "'",  # fancy single quote -> simple quote
+        '\u201c': '"',  # fancy double quote -> simple quote
+        '\u201d': '"',  # fancy double quote -> simple quote
         '…': '...',    # ellipsis -> three dots
         '\r\n': '\n',  # Windows line ending -> Unix
         '\r': '\n',    # old Mac line ending -> Unix
     }
 
-    def __init__(self, phase: str = "phase1_baseline", n8n_url: str = None):
+    # 여러 글자 키는 str.replace로 먼저 처리 ('\r\n'이 '\r' 규칙보다 우선), 한 글자 키는 str.translate 1번
+    _SANITIZE_MULTI = tuple((k, v) for k, v in SPECIAL_CHAR_MAP.items() if len(k) > 1)
+    _SANITIZE_TABLE = str.maketrans({k: v for k, v in SPECIAL_CHAR_MAP.items() if len(k) == 1})
+
+    def __init__(
+        self,
+        phase: str = "phase1_baseline",
+        n8n_url: str = None,
+        cache_dir: Optional[str] = None,
+        semantic_threshold: float = 0.0,
+        max_workers: int = 5,
+        requests_per_minute: float = 15,
+        judge_model: Optional[str] = None
+    ):
         # n8n URL 환경변수 또는 기본값 사용 (Docker 네트워크 내에서는 n8n 컨테이너 이름 사용)
         if n8n_url is None:
             n8n_url = os.getenv("N8N_URL", "http://n8n:5678")
         self.phase = phase
         self.n8n_url = n8n_url
-        self.evaluator = PerformanceEvaluator()
+        self.evaluator = PerformanceEvaluator(cache_dir=cache_dir, semantic_threshold=semantic_threshold)
+        # 답변 평가(LLM-as-Judge) Gemini 모델 (None이면 답변 초안만 기록)
+        self.judge_model = judge_model
         self.db_manager = TestDatabaseManager()
 
+        # Gemini 무료 tier Rate Limit: 분당 20회 → 안전하게 분당 15회 (요청 간격 4초)
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = RequestRateLimiter(requests_per_minute)
+
+        # webhook 호출은 하나의 Session으로 keep-alive 연결 재사용 (스레드 풀 크기만큼 연결 풀 확보)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(16, self.max_workers))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # 명시적으로 UTF-8 인코딩 및 Content-Type 설정
+        self.session.headers.update({'Content-Type': 'application/json; charset=utf-8'})
+
         self.test_email_ids = []  # 삽입된 테스트 이메일 ID 추적
         self.id_mapping = {}  # synthetic_id -> db_id 매핑
         self.results = {
@@ -219,13 +539,44 @@ class EvaluationRunner:
             "errors": []
         }
 
+        # 평가 결과는 한 줄씩 jsonl에 바로 기록 (중간에 죽어도 남음), save_results에서 한 번에 합침
+        self.results_log_file = RESULTS_DIR / f"{phase}.jsonl"
+        self._results_log = None
+
+    def _record_result(self, kind: str, record: Dict) -> None:
+        """평가 결과 1건을 jsonl에 추가 (kind: analysis_results / reply_results / errors)"""
+        if self._results_log is None:
+            self.results_log_file.parent.mkdir(parents=True, exist_ok=True)
+            self._results_log = open(self.results_log_file, 'wb')  # 실행마다 새로 기록
+
+        self._results_log.write(_encode_payload({"kind": kind, "record": record}) + b"\n")
+        self._results_log.flush()
+
+    def _collect_results(self) -> None:
+        """jsonl에 기록한 결과를 self.results 목록으로 합치기"""
+        if self._results_log is None:
+            return
+        self._results_log.close()
+        self._results_log = None
+
+        for kind in ("analysis_results", "reply_results", "errors"):
+            self.results[kind] = []
+        with open(self.results_log_file, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    entry = orjson.loads(line) if orjson is not None else json.loads(line)
+                    self.results[entry["kind"]].append(entry["record"])
+
     def sanitize_text(self, text: str) -> str:
         """n8n JSON 파싱 호환성을 위한 특수문자 정제"""
         if not text:
             return text
-        for char, replacement in self.SPECIAL_CHAR_MAP.items():
-            text = text.replace(char, replacement)
-        return text
+        # 바꿀 문자는 '\r'을 빼면 모두 비ASCII라 순수 ASCII 텍스트는 그대로 반환
+        if text.isascii() and '\r' not in text:
+            return text
+        for chars, replacement in self._SANITIZE_MULTI:
+            text = text.replace(chars, replacement)
+        return text.translate(self._SANITIZE_TABLE)
 
     def load_test_data(self) -> Dict:
         """테스트 데이터 로드"""
@@ -233,20 +584,25 @@ class EvaluationRunner:
 
         if not dataset_path.exists():
             print("테스트 데이터셋이 없습니다. 생성 중...")
-            dataset_generator.save_test_dataset()
-            dataset_generator.save_ground_truth()
+            get_dataset_generator().save_all()
 
-        with open(dataset_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        # JSON과 내용이 같은 MessagePack 사본이 있으면 우선 사용
+        return get_dataset_generator().load_test_dataset()
 
     def load_ground_truth(self) -> Dict:
         """Ground Truth 로드"""
-        gt_path = DATA_DIR / "ground_truth.json"
+        # id를 키로 하는 딕셔너리로 한 번에 변환 (컬럼 형식 → 행)
+        return ground_truth_by_id(get_dataset_generator().load_ground_truth())
+
+    @functools.cached_property
+    def dataset(self) -> Dict:
+        """테스트 데이터셋 (EvaluationRunner당 1번만 로드)"""
+        return self.load_test_data()
 
-        with open(gt_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            # id를 키로 하는 딕셔너리로 변환
-            return {gt["id"]: gt for gt in data["ground_truths"]}
+    @functools.cached_property
+    def ground_truth(self) -> Dict:
+        """id → Ground Truth (EvaluationRunner당 1번만 로드)"""
+        return self.load_ground_truth()
 
     def setup_test_data(self, emails: List[Dict]) -> List[Dict]:
         """테스트 데이터를 DB에 삽입하고 ID 매핑 생성"""
@@ -255,15 +611,20 @@ class EvaluationRunner:
         # DB에 삽입
         self.test_email_ids = self.db_manager.insert_test_emails(emails)
 
-        # ID 매핑 생성 (synthetic_001 -> 90001)
+        # ID 매핑 생성 (synthetic_001 -> 90001, 삽입에 실패한 행은 제외)
+        inserted = set(self.test_email_ids)
+        mapped = []
         for i, email in enumerate(emails):
-            db_id = self.test_email_ids[i]
+            db_id = TEST_ID_START + i + 1
+            if db_id not in inserted:
+                continue
             self.id_mapping[email["id"]] = db_id
             # 이메일 데이터에 실제 DB ID 추가
             email["db_id"] = db_id
+            mapped.append(email)
 
         print(f"📊 ID 매핑: {len(self.id_mapping)}개")
-        return emails
+        return mapped
 
     def cleanup_test_data(self):
         """테스트 데이터 정리"""
@@ -295,45 +656,53 @@ class EvaluationRunner:
             print(f"  [WARN] RAG 프롬프트 생성 실패: {e}")
             return None
 
+    def _analyze_payload(self, email_data: Dict) -> Dict:
+        """analyze webhook 요청 본문 (실제 DB ID, 특수문자 정제, RAG 프롬프트 포함)"""
+        return {
+            "email_id": email_data.get("db_id", email_data["id"]),
+            "subject": self.sanitize_text(email_data["subject"]),
+            "sender_name": self.sanitize_text(email_data["sender_name"]),
+            "sender_address": email_data["sender_address"],
+            "body_text": self.sanitize_text(email_data["body_text"]),
+            "rag_prompt": self._get_rag_prompt(email_data)  # RAG 강화 프롬프트 추가
+        }
+
+    def _reply_payload(self, email_data: Dict, tone: str) -> Dict:
+        """generate-reply webhook 요청 본문 (실제 DB ID, 특수문자 정제)"""
+        return {
+            "email_id": email_data.get("db_id", email_data["id"]),
+            "subject": self.sanitize_text(email_data["subject"]),
+            "sender_name": self.sanitize_text(email_data["sender_name"]),
+            "sender_address": email_data["sender_address"],
+            "body_text": self.sanitize_text(email_data["body_text"]),
+            "preferred_tone": tone
+        }
+
+    @staticmethod
+    def _parse_webhook_response(response, failure: str) -> Optional[Dict]:
+        """webhook 응답 처리 (requests / httpx 응답 공통)"""
+        if response.status_code == 200:
+            # 빈 응답 처리
+            if not response.text or response.text.strip() == '':
+                print(f"  [ERROR] 빈 응답 수신")
+                return None
+            return _decode_response(response)
+
+        print(f"  [ERROR] {failure}: {response.status_code} - {response.text[:100]}")
+        return None
+
     def call_analyze_api(self, email_data: Dict) -> Optional[Dict]:
         """n8n analyze webhook 호출 (실제 DB ID 사용, RAG 프롬프트 포함)"""
         try:
-            webhook_url = f"{self.n8n_url}/webhook/analyze"
-
-            # 실제 DB ID 사용
-            db_id = email_data.get("db_id", email_data["id"])
-
-            # RAG 강화 프롬프트 생성
-            rag_prompt = self._get_rag_prompt(email_data)
-
-            # 특수문자 정제 적용
-            payload = {
-                "email_id": db_id,
-                "subject": self.sanitize_text(email_data["subject"]),
-                "sender_name": self.sanitize_text(email_data["sender_name"]),
-                "sender_address": email_data["sender_address"],
-                "body_text": self.sanitize_text(email_data["body_text"]),
-                "rag_prompt": rag_prompt  # RAG 강화 프롬프트 추가
-            }
-
-            # 명시적으로 UTF-8 인코딩 및 Content-Type 설정
-            headers = {'Content-Type': 'application/json; charset=utf-8'}
-            response = requests.post(
-                webhook_url,
-                data=json.dumps(payload, ensure_ascii=False).encode('utf-8'),
-                headers=headers,
+            payload = self._analyze_payload(email_data)
+
+            self.rate_limiter.acquire()
+            response = self.session.post(
+                f"{self.n8n_url}/webhook/analyze",
+                data=_encode_payload(payload),
                 timeout=60
             )
-
-            if response.status_code == 200:
-                # 빈 응답 처리
-                if not response.text or response.text.strip() == '':
-                    print(f"  [ERROR] 빈 응답 수신")
-                    return None
-                return response.json()
-            else:
-                print(f"  [ERROR] 분석 실패: {response.status_code} - {response.text[:100]}")
-                return None
+            return self._parse_webhook_response(response, "분석 실패")
 
         except requests.exceptions.Timeout:
             print(f"  [ERROR] 타임아웃: {email_data['id']}")
@@ -345,42 +714,62 @@ class EvaluationRunner:
             print(f"  [ERROR] 예외: {e}")
             return None
 
+    async def acall_analyze_api(self, client, email_data: Dict) -> Optional[Dict]:
+        """call_analyze_api의 async 변형 (httpx.AsyncClient 사용)"""
+        try:
+            # RAG 프롬프트 생성은 동기 코드라 스레드에서 실행 (이벤트 루프를 막지 않음)
+            payload = await asyncio.to_thread(self._analyze_payload, email_data)
+
+            await self.rate_limiter.acquire_async()
+            response = await client.post(
+                f"{self.n8n_url}/webhook/analyze",
+                content=_encode_payload(payload),
+                timeout=60
+            )
+            return self._parse_webhook_response(response, "분석 실패")
+
+        except httpx.TimeoutException:
+            print(f"  [ERROR] 타임아웃: {email_data['id']}")
+            return None
+        except json.JSONDecodeError as e:
+            print(f"  [ERROR] JSON 파싱 실패: {e}")
+            return None
+        except Exception as e:
+            print(f"  [ERROR] 예외: {e}")
+            return None
+
     def call_reply_api(self, email_data: Dict, tone: str = "formal") -> Optional[Dict]:
         """n8n generate-reply webhook 호출"""
         try:
-            webhook_url = f"{self.n8n_url}/webhook/generate-reply"
-
-            # 실제 DB ID 사용
-            db_id = email_data.get("db_id", email_data["id"])
-
-            # 특수문자 정제 적용
-            payload = {
-                "email_id": db_id,
-                "subject": self.sanitize_text(email_data["subject"]),
-                "sender_name": self.sanitize_text(email_data["sender_name"]),
-                "sender_address": email_data["sender_address"],
-                "body_text": self.sanitize_text(email_data["body_text"]),
-                "preferred_tone": tone
-            }
-
-            # 명시적으로 UTF-8 인코딩 및 Content-Type 설정
-            headers = {'Content-Type': 'application/json; charset=utf-8'}
-            response = requests.post(
-                webhook_url,
-                data=json.dumps(payload, ensure_ascii=False).encode('utf-8'),
-                headers=headers,
+            payload = self._reply_payload(email_data, tone)
+
+            self.rate_limiter.acquire()
+            response = self.session.post(
+                f"{self.n8n_url}/webhook/generate-reply",
+                data=_encode_payload(payload),
                 timeout=90
             )
+            return self._parse_webhook_response(response, "답변 생성 실패")
 
-            if response.status_code == 200:
-                # 빈 응답 처리
-                if not response.text or response.text.strip() == '':
-                    print(f"  [ERROR] 빈 응답 수신")
-                    return None
-                return response.json()
-            else:
-                print(f"  [ERROR] 답변 생성 실패: {response.status_code}")
-                return None
+        except json.JSONDecodeError as e:
+            print(f"  [ERROR] JSON 파싱 실패: {e}")
+            return None
+        except Exception as e:
+            print(f"  [ERROR] 예외: {e}")
+            return None
+
+    async def acall_reply_api(self, client, email_data: Dict, tone: str = "formal") -> Optional[Dict]:
+        """call_reply_api의 async 변형 (httpx.AsyncClient 사용)"""
+        try:
+            payload = self._reply_payload(email_data, tone)
+
+            await self.rate_limiter.acquire_async()
+            response = await client.post(
+                f"{self.n8n_url}/webhook/generate-reply",
+                content=_encode_payload(payload),
+                timeout=90
+            )
+            return self._parse_webhook_response(response, "답변 생성 실패")
 
         except json.JSONDecodeError as e:
             print(f"  [ERROR] JSON 파싱 실패: {e}")
@@ -389,14 +778,38 @@ class EvaluationRunner:
             print(f"  [ERROR] 예외: {e}")
             return None
 
+    def _map_webhook_calls(self, call: Callable, acall: Callable, emails: List[Dict]) -> List[Optional[Dict]]:
+        """
+        webhook 호출을 동시에 실행하고 결과를 입력 순서대로 반환
+
+        httpx가 있으면 asyncio.gather + Semaphore(max_workers), 없으면 스레드 풀에서 call을 실행합니다.
+        호출 시작 간격은 두 경우 모두 rate_limiter가 제한합니다.
+        """
+        if httpx is None:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                return list(executor.map(call, emails))
+
+        async def gather_all() -> List[Optional[Dict]]:
+            sem = asyncio.Semaphore(self.max_workers)
+            limits = httpx.Limits(max_connections=self.max_workers, max_keepalive_connections=self.max_workers)
+
+            async with httpx.AsyncClient(limits=limits, headers=dict(self.session.headers)) as client:
+                async def bounded(email: Dict) -> Optional[Dict]:
+                    async with sem:
+                        return await acall(client, email)
+
+                return await asyncio.gather(*(bounded(email) for email in emails))
+
+        return asyncio.run(gather_all())
+
     def run_analysis_evaluation(self, limit: Optional[int] = None, cleanup: bool = True):
         """이메일 분석 성능 평가 실행"""
         print("\n" + "=" * 60)
         print(f"📊 이메일 분석 평가 시작 (Phase: {self.phase})")
         print("=" * 60)
 
-        dataset = self.load_test_data()
-        ground_truths = self.load_ground_truth()
+        dataset = self.dataset
+        ground_truths = self.ground_truth
 
         emails = dataset["emails"]
         if limit:
@@ -409,31 +822,38 @@ class EvaluationRunner:
         success = 0
         failed = 0
 
-        # Gemini 무료 tier Rate Limit: 분당 20회
-        # 안전하게 4초 딜레이 (60초 / 15회 = 4초)
-        REQUEST_DELAY = 4  # seconds
         RETRY_DELAY = 45  # seconds (Rate Limit 에러 시 - 넉넉하게)
 
-        try:
-            for i, email in enumerate(emails):
-                synthetic_id = email["id"]  # 원본 ID (synthetic_001)
-                db_id = email["db_id"]  # DB ID (90001)
+        def analyze(email: Dict) -> Optional[Dict]:
+            # API 호출 (실패 시 1회 재시도)
+            ai_result = self.call_analyze_api(email)
 
-                print(f"\n[{i + 1}/{total}] 분석 중: {email['subject'][:40]}... (DB ID: {db_id})")
+            # 빈 응답이면 Rate Limit 가능성 - 재시도
+            if ai_result is None:
+                print(f"  🔄 재시도 중: {email['id']} ({RETRY_DELAY}초 대기)")
+                time.sleep(RETRY_DELAY)
+                ai_result = self.call_analyze_api(email)
+            return ai_result
 
-                # Rate Limit 방지: 첫 번째 요청 이후부터 딜레이 적용
-                if i > 0:
-                    print(f"  ⏳ Rate Limit 대기 중... ({REQUEST_DELAY}초)")
-                    time.sleep(REQUEST_DELAY)
+        async def aanalyze(client, email: Dict) -> Optional[Dict]:
+            ai_result = await self.acall_analyze_api(client, email)
 
-                # API 호출 (실패 시 1회 재시도)
-                ai_result = self.call_analyze_api(email)
+            if ai_result is None:
+                print(f"  🔄 재시도 중: {email['id']} ({RETRY_DELAY}초 대기)")
+                await asyncio.sleep(RETRY_DELAY)
+                ai_result = await self.acall_analyze_api(client, email)
+            return ai_result
 
-                # 빈 응답이면 Rate Limit 가능성 - 재시도
-                if ai_result is None:
-                    print(f"  🔄 재시도 중... ({RETRY_DELAY}초 대기)")
-                    time.sleep(RETRY_DELAY)
-                    ai_result = self.call_analyze_api(email)
+        try:
+            # 호출은 동시에 실행 (시작 간격은 rate_limiter가 제한), 평가는 원래 순서대로
+            print(f"\n🚀 {total}건 분석 요청 (동시 {self.max_workers}개, 분당 {self.rate_limiter.requests_per_minute}회)")
+            ai_results = self._map_webhook_calls(analyze, aanalyze, emails)
+
+            for i, (email, ai_result) in enumerate(zip(emails, ai_results)):
+                synthetic_id = email["id"]  # 원본 ID (synthetic_001)
+                db_id = email["db_id"]  # DB ID (90001)
+
+                print(f"\n[{i + 1}/{total}] 분석 결과: {email['subject'][:40]}... (DB ID: {db_id})")
 
                 if ai_result and ai_result.get("success") is not False:
                     # Ground Truth 가져오기
@@ -459,7 +879,7 @@ class EvaluationRunner:
                         }
                     )
 
-                    self.results["analysis_results"].append({
+                    self._record_result("analysis_results", {
                         "email_id": synthetic_id,
                         "db_id": db_id,
                         "subject": email["subject"],
@@ -474,7 +894,7 @@ class EvaluationRunner:
 
                 else:
                     failed += 1
-                    self.results["errors"].append({
+                    self._record_result("errors", {
                         "email_id": synthetic_id,
                         "db_id": db_id,
                         "error": "API 호출 실패"
@@ -503,7 +923,7 @@ class EvaluationRunner:
         print(f"✍️ 답변 생성 평가 시작 (Phase: {self.phase})")
         print("=" * 60)
 
-        dataset = self.load_test_data()
+        dataset = self.dataset
 
         # needs_reply가 True인 이메일만 선택
         emails = [e for e in dataset["emails"] if e["ground_truth"].get("needs_reply")]
@@ -521,27 +941,36 @@ class EvaluationRunner:
 
         total = len(emails)
         success = 0
+        judge_items = []
 
         try:
-            for i, email in enumerate(emails):
+            # 호출은 동시에 실행 (시작 간격은 rate_limiter가 제한), 결과는 원래 순서대로
+            print(f"\n🚀 {total}건 답변 생성 요청 (동시 {self.max_workers}개, 분당 {self.rate_limiter.requests_per_minute}회)")
+            reply_results = self._map_webhook_calls(self.call_reply_api, self.acall_reply_api, emails)
+            # 모든 호출이 끝난 시각 (행마다 datetime.now()를 다시 부르지 않음)
+            generated_at = datetime.now().isoformat()
+
+            for i, (email, reply_result) in enumerate(zip(emails, reply_results)):
                 synthetic_id = email["id"]
                 db_id = email.get("db_id", self.id_mapping.get(synthetic_id))
 
-                print(f"\n[{i + 1}/{total}] 답변 생성 중: {email['subject'][:40]}... (DB ID: {db_id})")
-
-                # API 호출
-                reply_result = self.call_reply_api(email)
+                print(f"\n[{i + 1}/{total}] 답변 생성 결과: {email['subject'][:40]}... (DB ID: {db_id})")
 
                 if reply_result and reply_result.get("success") is not False:
-                    self.results["reply_results"].append({
+                    self._record_result("reply_results", {
                         "email_id": synthetic_id,
                         "db_id": db_id,
                         "subject": email["subject"],
                         "reply_drafts": reply_result.get("reply_drafts", {}),
-                        "generated_at": datetime.now().isoformat()
+                        "generated_at": generated_at
                     })
                     success += 1
                     print(f"  ✅ 3가지 톤 답변 생성 완료")
+                    judge_items.extend(
+                        {"email_id": db_id, "original_email": email, "generated_reply": reply, "target_tone": tone}
+                        for tone, reply in (reply_result.get("reply_drafts") or {}).items()
+                        if reply
+                    )
                 else:
                     print(f"  ❌ 실패")
 
@@ -549,21 +978,62 @@ class EvaluationRunner:
             print(f"✍️ 답변 생성 완료: 성공 {success}/{total}")
             print("-" * 60)
 
+            if self.judge_model and judge_items:
+                self.judge_replies(judge_items)
+
         finally:
             # 테스트 데이터 정리
             if cleanup:
                 self.cleanup_test_data()
 
+    def judge_replies(self, items: List[Dict]) -> Dict:
+        """
+        생성된 답변을 LLM-as-Judge(Gemini)로 평가하고 reply_statistics에 기록
+
+        evaluator.evaluate_replies_batch를 쓰므로 --cache-dir / --semantic-threshold 캐시에
+        적중한 답변은 LLM을 다시 호출하지 않습니다. (Judge 호출도 rate_limiter가 간격을 제한)
+        """
+        if genai is None:
+            raise RuntimeError("google-generativeai가 설치되지 않아 답변 평가를 할 수 없습니다")
+
+        genai.configure(api_key=os.getenv("MY_GEMINI_API_KEY", ""))
+        model = genai.GenerativeModel(self.judge_model)
+
+        async def judge(prompt: str) -> str:
+            await self.rate_limiter.acquire_async()
+            response = await model.generate_content_async(prompt)
+            return response.text
+
+        print(f"\n⚖️ 답변 {len(items)}건 LLM-as-Judge 평가 중 (모델: {self.judge_model})")
+        asyncio.run(self.evaluator.evaluate_replies_batch(
+            items, judge, concurrency=self.max_workers, provider="gemini", model=self.judge_model
+        ))
+
+        stats = self.evaluator.get_reply_statistics()
+        self.results["reply_statistics"] = stats
+        print(f"⚖️ 답변 평가 완료: 평균 {stats.get('average_score', 0)}점")
+        return stats
+
     def save_results(self):
-        """결과 저장"""
+        """결과 저장 (jsonl에 쌓인 결과를 합쳐서 최종 JSON 1번 저장)"""
+        self._collect_results()
         self.results["completed_at"] = datetime.now().isoformat()
 
         # 결과 파일 저장
         results_file = RESULTS_DIR / f"{self.phase}.json"
         results_file.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(results_file, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, ensure_ascii=False, indent=2)
+        _write_json(results_file, self.results, pretty=True)
+
+        # Phase 비교용 통계만 따로 저장 (compare_phases가 전체 결과 목록을 파싱하지 않도록)
+        _write_json(RESULTS_DIR / f"{self.phase}_stats.json", {
+            "phase": self.phase,
+            "completed_at": self.results["completed_at"],
+            "analysis_statistics": self.results.get("analysis_statistics", {}),
+        })
+
+        # 최종 JSON에 모두 들어갔으므로 중간 기록 삭제
+        self.results_log_file.unlink(missing_ok=True)
 
         print(f"\n💾 결과 저장: {results_file}")
 
@@ -573,80 +1043,70 @@ class EvaluationRunner:
         """마크다운 리포트 생성"""
         stats = self.results.get("analysis_statistics", {})
         breakdown = stats.get("breakdown", {})
+        generated_at = datetime.now().isoformat()
+        completed_at = self.results.get('completed_at') or generated_at
+
+        ctx = {
+            "phase": self.phase,
+            "started_at": self.results.get('started_at', 'N/A'),
+            "completed_at": completed_at,
+            "count": stats.get('count', 0),
+            "average_score": stats.get('average_score', 0),
+            "median_score": stats.get('median_score', 0),
+            "min_score": stats.get('min_score', 0),
+            "max_score": stats.get('max_score', 0),
+            "std_dev": stats.get('std_dev', 0),
+            "generated_at": generated_at,
+        }
+        for field in ("email_type", "importance", "needs_reply", "sentiment"):
+            value = breakdown.get(f"{field}_avg", 0)
+            ctx[f"{field}_avg"] = value
+            ctx[f"{field}_pct"] = value * 4
+            ctx[f"{field}_bar"] = _bar(value)
+        for field, advice in _REPORT_SUGGESTIONS.items():
+            ctx[f"{field}_suggestion"] = advice if ctx[f"{field}_avg"] < 20 else "양호"
 
-        report = f"""# 성능 평가 리포트: {self.phase}
-
-## 개요
-- **평가 일시**: {self.results.get('started_at', 'N/A')}
-- **완료 일시**: {self.results.get('completed_at', 'N/A')}
-- **Phase**: {self.phase}
-
----
-
-## 이메일 분석 성능
+        errors = self.results.get("errors")
+        ctx["errors"] = "".join(
+            f"- `{error['email_id']}`: {error['error']}\n" for error in errors
+        ) if errors else "없음\n"
 
-### 전체 통계
-| 항목 | 값 |
-|------|-----|
-| 평가 건수 | {stats.get('count', 0)} |
-| 평균 점수 | {stats.get('average_score', 0)}/100 |
-| 중앙값 | {stats.get('median_score', 0)} |
-| 최소/최대 | {stats.get('min_score', 0)} / {stats.get('max_score', 0)} |
-| 표준편차 | {stats.get('std_dev', 0)} |
+        report = _REPORT_TMPL.format_map(ctx)
 
-### 항목별 점수 (25점 만점)
-| 항목 | 평균 점수 | 정확도 |
-|------|----------|--------|
-| email_type | {breakdown.get('email_type_avg', 0)} | {breakdown.get('email_type_avg', 0) / 25 * 100:.1f}% |
-| importance_score | {breakdown.get('importance_avg', 0)} | {breakdown.get('importance_avg', 0) / 25 * 100:.1f}% |
-| needs_reply | {breakdown.get('needs_reply_avg', 0)} | {breakdown.get('needs_reply_avg', 0) / 25 * 100:.1f}% |
-| sentiment | {breakdown.get('sentiment_avg', 0)} | {breakdown.get('sentiment_avg', 0) / 25 * 100:.1f}% |
+        # 리포트 저장
+        report_dir = REPORTS_DIR / self.phase
+        report_dir.mkdir(parents=True, exist_ok=True)
+        report_file = report_dir / "analysis_report.md"
 
-### 시각화
-```
-email_type      {'█' * int(breakdown.get('email_type_avg', 0))}{'░' * (25 - int(breakdown.get('email_type_avg', 0)))} {breakdown.get('email_type_avg', 0)}/25
-importance      {'█' * int(breakdown.get('importance_avg', 0))}{'░' * (25 - int(breakdown.get('importance_avg', 0)))} {breakdown.get('importance_avg', 0)}/25
-needs_reply     {'█' * int(breakdown.get('needs_reply_avg', 0))}{'░' * (25 - int(breakdown.get('needs_reply_avg', 0)))} {breakdown.get('needs_reply_avg', 0)}/25
-sentiment       {'█' * int(breakdown.get('sentiment_avg', 0))}{'░' * (25 - int(breakdown.get('sentiment_avg', 0)))} {breakdown.get('sentiment_avg', 0)}/25
-```
+        report_file.write_text(report, encoding='utf-8')
 
----
+        print(f"📝 리포트 저장: {report_file}")
 
-## 상세 결과
+        return report
 
-### 오류 발생 건
-"""
-        if self.results.get("errors"):
-            for error in self.results["errors"]:
-                report += f"- `{error['email_id']}`: {error['error']}\n"
-        else:
-            report += "없음\n"
 
-        report += f"""
----
+@functools.lru_cache(maxsize=4)
+def _load_phase_results(filepath: Path, mtime_ns: int) -> Dict:
+    """Phase 결과 파일 로드 (경로 + 수정 시각 기준 캐시, 파일이 바뀌면 다시 읽음)"""
+    return _read_json(filepath)
 
-## 개선 제안
 
-1. **email_type 정확도 개선**: {"프롬프트에 분류 예시 추가 필요" if breakdown.get('email_type_avg', 0) < 20 else "양호"}
-2. **importance 정확도 개선**: {"중요도 기준 명확화 필요" if breakdown.get('importance_avg', 0) < 20 else "양호"}
-3. **sentiment 정확도 개선**: {"감정 분석 프롬프트 보강 필요" if breakdown.get('sentiment_avg', 0) < 20 else "양호"}
+def _load_phase_statistics(results_file: Path) -> Dict:
+    """
+    Phase 분석 통계 로드
 
----
+    {phase}_stats.json이 결과 파일보다 최신이면 그것만 읽고,
+    없으면 (이전 버전에서 저장한 결과) 전체 결과 파일에서 analysis_statistics를 꺼냅니다.
+    """
+    stats_file = results_file.with_name(f"{results_file.stem}_stats.json")
+    results_mtime = results_file.stat().st_mtime_ns
 
-*Generated at {datetime.now().isoformat()}*
-"""
+    if stats_file.exists():
+        stats_mtime = stats_file.stat().st_mtime_ns
+        if stats_mtime >= results_mtime:
+            return _load_phase_results(stats_file, stats_mtime).get("analysis_statistics", {})
 
-        # 리포트 저장
-        report_dir = REPORTS_DIR / self.phase
-        report_dir.mkdir(parents=True, exist_ok=True)
-        report_file = report_dir / "analysis_report.md"
-
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write(report)
-
-        print(f"📝 리포트 저장: {report_file}")
-
-        return report
+    return _load_phase_results(results_file, results_mtime).get("analysis_statistics", {})
 
 
 def compare_phases(phase1: str = "phase1_baseline", phase2: str = "phase2_with_rag"):
@@ -667,14 +1127,9 @@ def compare_phases(phase1: str = "phase1_baseline", phase2: str = "phase2_with_r
         print(f"❌ {phase2} 결과 파일 없음")
         return
 
-    with open(phase1_file, 'r', encoding='utf-8') as f:
-        p1_data = json.load(f)
-
-    with open(phase2_file, 'r', encoding='utf-8') as f:
-        p2_data = json.load(f)
-
-    p1_stats = p1_data.get("analysis_statistics", {})
-    p2_stats = p2_data.get("analysis_statistics", {})
+    generated_at = datetime.now().isoformat()
+    p1_stats = _load_phase_statistics(phase1_file)
+    p2_stats = _load_phase_statistics(phase2_file)
 
     # 비교 리포트 생성
     p1_avg = p1_stats.get('average_score', 0)
@@ -687,7 +1142,7 @@ def compare_phases(phase1: str = "phase1_baseline", phase2: str = "phase2_with_r
 ## 개요
 - **Phase 1**: {phase1}
 - **Phase 2**: {phase2}
-- **비교 일시**: {datetime.now().isoformat()}
+- **비교 일시**: {generated_at}
 
 ---
 
@@ -722,12 +1177,12 @@ def compare_phases(phase1: str = "phase1_baseline", phase2: str = "phase2_with_r
 
 ### {phase1} (Baseline)
 ```
-평균: {'█' * int(p1_avg / 4)}{'░' * (25 - int(p1_avg / 4))} {p1_avg}/100
+평균: {_bar(p1_avg / 4)} {p1_avg}/100
 ```
 
 ### {phase2} (개선)
 ```
-평균: {'█' * int(p2_avg / 4)}{'░' * (25 - int(p2_avg / 4))} {p2_avg}/100
+평균: {_bar(p2_avg / 4)} {p2_avg}/100
 ```
 
 ### 개선율
@@ -741,7 +1196,7 @@ def compare_phases(phase1: str = "phase1_baseline", phase2: str = "phase2_with_r
 
 {"✅ RAG 적용으로 성능이 개선되었습니다." if improvement > 0 else "⚠️ 추가 튜닝이 필요합니다."}
 
-*Generated at {datetime.now().isoformat()}*
+*Generated at {generated_at}*
 """
 
     # 비교 리포트 저장
@@ -758,6 +1213,7 @@ def cleanup_test_data():
     print("\n🧹 테스트 데이터 정리 중...")
     db_manager = TestDatabaseManager()
     deleted = db_manager.cleanup_all_test_emails()
+    db_manager.close()
     print(f"✅ 완료: {deleted}개 삭제")
 
 
@@ -790,6 +1246,39 @@ def main():
         action="store_true",
         help="테스트 데이터 생성만 수행"
     )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="--generate-data 시 JSON을 들여쓰기해서 저장 (사람이 읽는 용도)"
+    )
+    parser.add_argument(
+        "--judge-model",
+        default=os.getenv("MY_JUDGE_MODEL"),
+        help="답변 평가(LLM-as-Judge)에 쓸 Gemini 모델 (예: gemini-1.5-flash, 지정하지 않으면 답변 초안만 기록)"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="답변 평가(LLM-as-Judge) 결과 캐시 폴더 (지정 시 같은 입력은 LLM 재호출 생략)"
+    )
+    parser.add_argument(
+        "--semantic-threshold",
+        type=float,
+        default=0.0,
+        help="유사 답변 평가 재사용 기준 코사인 유사도 (예: 0.95, 0이면 비활성화)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=5,
+        help="동시 webhook 호출 수"
+    )
+    parser.add_argument(
+        "--rpm",
+        type=float,
+        default=15,
+        help="분당 최대 webhook 호출 수 (Gemini Rate Limit 고려)"
+    )
     parser.add_argument(
         "--cleanup",
         action="store_true",
@@ -803,10 +1292,13 @@ def main():
 
     args = parser.parse_args()
 
+    if (args.cache_dir or args.semantic_threshold) and not args.judge_model:
+        parser.error("--cache-dir / --semantic-threshold는 답변 평가 캐시이므로 --judge-model과 함께 지정하세요")
+
     if args.generate_data:
         print("📦 테스트 데이터 생성 중...")
-        dataset_generator.save_test_dataset()
-        dataset_generator.save_ground_truth()
+        # msgspec 설치 시 MessagePack 사본도 저장 (로드할 때 JSON보다 우선 사용)
+        get_dataset_generator().save_all(pretty=args.pretty)
         print("✅ 완료!")
         print(f"   - {DATA_DIR / 'test_dataset.json'}")
         print(f"   - {DATA_DIR / 'ground_truth.json'}")
@@ -821,7 +1313,14 @@ def main():
         return
 
     # 평가 실행
-    runner = EvaluationRunner(phase=args.phase)
+    runner = EvaluationRunner(
+        phase=args.phase,
+        cache_dir=args.cache_dir,
+        semantic_threshold=args.semantic_threshold,
+        max_workers=args.workers,
+        requests_per_minute=args.rpm,
+        judge_model=args.judge_model
+    )
 
     # cleanup 여부 결정
     should_cleanup = not args.no_cleanup
@@ -1,10 +1,30 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Optional
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
+from typing import Optional
+import asyncio
 import sys
+import json
+import threading
+import time
+from datetime import date
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from pathlib import Path
 import logging
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:  # httpx가 없으면 requests 세션을 스레드에서 호출
+    httpx = None
+
 logger = logging.getLogger(__name__)
 
 # 프로젝트 루트를 PYTHONPATH에 추가
@@ -12,6 +32,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from src.models.schemas import (
     EmailInDB,
+    EMAILS_ADAPTER,
     EmailAnalysis,
     ReplyRequest,
     ReplyResponse,
@@ -19,10 +40,69 @@ from src.models.schemas import (
     SendReplyRequest
 )
 from src.services.db_service import db
+from src.services.analysis_cache import rag_cache, make_rag_cache_key
 from src.config import settings
-from src.agents.email_processor import email_processor
+from src.agents.email_processor import get_email_processor
 from src.tools.n8n_tools import n8n_tools
 
+# n8n webhook 호출용 세션 (keep-alive 연결 재사용)
+# 재시도는 연결 실패에만 (read=0: 요청이 n8n에 도달한 뒤에는 메일 중복 발송 방지를 위해 재시도하지 않음)
+_n8n_session = requests.Session()
+_n8n_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, read=0, backoff_factor=0.2)
+)
+_n8n_session.mount("http://", _n8n_adapter)
+_n8n_session.mount("https://", _n8n_adapter)
+
+# webhook 연결 timeout (읽기 timeout은 엔드포인트별: 발송 10초, 답변 생성 90초)
+N8N_CONNECT_TIMEOUT = 3.05
+
+
+class N8nCircuitOpenError(Exception):
+    """n8n 회로 차단 중 (webhook을 호출하지 않고 바로 실패)"""
+
+
+class CircuitBreaker:
+    """
+    연속 실패 회로 차단기
+
+    fail_max번 연속 실패(timeout/연결 실패/5xx)하면 reset_timeout초 동안 호출 없이 바로 실패시키고,
+    그 뒤 첫 호출이 성공하면 닫힙니다. n8n 장애 시 요청마다 timeout까지 기다리지 않도록 합니다.
+    """
+
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 30.0):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """차단 중이면 N8nCircuitOpenError"""
+        with self._lock:
+            if self._opened_at is not None and time.monotonic() - self._opened_at < self.reset_timeout:
+                raise N8nCircuitOpenError(f"n8n 회로 차단 중 ({self.reset_timeout:.0f}초 후 재시도)")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.fail_max:
+                self._opened_at = time.monotonic()
+
+
+n8n_breaker = CircuitBreaker(fail_max=5, reset_timeout=30)
+
+# n8n 호출 예외 (httpx / requests 공통으로 잡기 위한 튜플, 회로 차단도 연결 실패로 취급)
+N8N_TIMEOUT_ERRORS = (requests.exceptions.Timeout,) + ((httpx.TimeoutException,) if httpx else ())
+N8N_REQUEST_ERRORS = (requests.exceptions.RequestException, N8nCircuitOpenError) + ((httpx.RequestError,) if httpx else ())
+
 # RAG 서비스 (지연 로딩)
 _rag_service = None
 
@@ -41,9 +121,79 @@ def get_rag_service():
 app = FastAPI(
     title="AI Email Assistant API",
     description="LangGraph + n8n 하이브리드 AI 메일 비서 시스템",
-    version="2.0.0"
+    version="2.0.0",
+    # orjson이 있으면 응답 직렬화에 사용 (datetime도 ISO-8601로 바로 직렬화)
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse
 )
 
+@app.on_event("startup")
+async def open_n8n_http_client():
+    """webhook 프록시 엔드포인트용 httpx.AsyncClient 생성 (앱 수명 동안 공유)"""
+    if httpx is not None:
+        app.state.n8n_http = httpx.AsyncClient(
+            timeout=90,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+        )
+
+
+@app.on_event("startup")
+async def warm_db_pool():
+    """PostgreSQL 커넥션 풀 미리 열기 (첫 요청의 연결 비용 제거)"""
+    try:
+        await asyncio.to_thread(db.open_pool)
+    except Exception as e:
+        # DB가 아직 뜨지 않았으면 첫 요청에서 다시 시도
+        logger.warning(f"DB 커넥션 풀 초기화 실패: {e}")
+
+
+@app.on_event("shutdown")
+async def close_n8n_client():
+    """예약된 답변 발송을 마치고 n8n async 클라이언트 연결 정리"""
+    await get_email_processor().drain()
+    await n8n_tools.aclose()
+    client = getattr(app.state, "n8n_http", None)
+    if client is not None:
+        await client.aclose()
+
+
+@app.on_event("shutdown")
+async def close_db_pool():
+    """커넥션 풀의 연결 정리 (예약 발송 drain 이후에 실행되도록 뒤에 등록)"""
+    db.close_pool()
+
+
+async def _post_n8n(webhook_url: str, payload: dict, timeout: float):
+    """
+    n8n webhook POST (이벤트 루프를 막지 않음)
+
+    공유 httpx.AsyncClient로 await하고, httpx가 없으면 requests 세션 호출을 스레드로 넘깁니다.
+    반환값은 httpx / requests 응답 (status_code, text, json() 공통)
+
+    timeout은 읽기 timeout이고 연결 timeout은 N8N_CONNECT_TIMEOUT으로 짧게 둡니다.
+    n8n_breaker가 열려 있으면 소켓을 건드리지 않고 N8nCircuitOpenError를 냅니다.
+    """
+    n8n_breaker.before_call()
+
+    client = getattr(app.state, "n8n_http", None)
+    try:
+        if client is None:
+            response = await asyncio.to_thread(
+                _n8n_session.post, webhook_url, json=payload, timeout=(N8N_CONNECT_TIMEOUT, timeout)
+            )
+        else:
+            response = await client.post(
+                webhook_url, json=payload, timeout=httpx.Timeout(timeout, connect=N8N_CONNECT_TIMEOUT)
+            )
+    except N8N_REQUEST_ERRORS:
+        n8n_breaker.record_failure()
+        raise
+
+    if response.status_code >= 500:
+        n8n_breaker.record_failure()
+    else:
+        n8n_breaker.record_success()
+    return response
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -62,12 +212,12 @@ async def root():
     }
 
 @app.get("/health")
-async def health_check():
+def health_check():
     """헬스 체크"""
     try:
-        # DB 연결 테스트
-        conn = db.get_connection()
-        conn.close()
+        # DB 연결 테스트 (풀 연결이 살아 있는지 쿼리로 확인)
+        with db.connection() as conn, conn.cursor() as cur:
+            cur.execute("SELECT 1")
 
         # RAG 상태 확인
         rag = get_rag_service()
@@ -95,10 +245,8 @@ async def sync_emails():
     4. 사용자에게 결과 반환 (승인 대기)
     """
     try:
-        from datetime import date
-
         # LangGraph Supervisor 실행
-        result = email_processor.process_new_emails()
+        result = await get_email_processor().process_new_emails_async()
 
         # 결과 정리
         new_emails = len(result.get("email_ids", []))
@@ -124,10 +272,36 @@ async def sync_emails():
             detail=f"이메일 처리 실패: {str(e)}"
         )
 
+@app.post("/sync-emails/stream")
+async def sync_emails_stream():
+    """
+    /sync-emails의 스트리밍 버전 (Server-Sent Events)
+
+    LangGraph 노드가 끝날 때마다 {"node": 이름, "update": 부분 결과} 이벤트를 보냅니다.
+    분류 결과는 답변 초안 생성이 끝나기 전에 먼저 전달됩니다.
+    """
+    def _encode(event: dict) -> str:
+        if orjson is not None:
+            return orjson.dumps(event, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        return json.dumps(event, ensure_ascii=False, default=str)
+
+    async def event_stream():
+        try:
+            async for step in get_email_processor().stream_new_emails():
+                for node, update in step.items():
+                    data = _encode({"node": node, "update": update})
+                    yield f"data: {data}\n\n"
+        except Exception as e:
+            logger.error(f"sync-emails 스트리밍 실패: {e}")
+            data = _encode({"node": "error", "update": {"error": str(e)}})
+            yield f"data: {data}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
 # ========== 이메일 조회 API ==========
 
-@app.get("/emails", response_model=List[dict])
-async def get_emails(
+@app.get("/emails", response_model=None)
+def get_emails(
     limit: int = 50,
     offset: int = 0,
     analyzed_only: bool = False
@@ -138,15 +312,18 @@ async def get_emails(
     - **limit**: 조회할 이메일 개수 (기본 50)
     - **offset**: 시작 위치 (페이징)
     - **analyzed_only**: True이면 분석된 이메일만 조회
+
+    EMAILS_ADAPTER로 목록 전체를 한 번에 검증 + JSON 직렬화 (FastAPI의 항목별 검증/인코딩 생략)
     """
     try:
         emails = db.get_emails(limit=limit, offset=offset, analyzed_only=analyzed_only)
-        return emails
+        body = EMAILS_ADAPTER.dump_json(EMAILS_ADAPTER.validate_python(emails))
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/emails/{email_id}")
-async def get_email(email_id: int):
+def get_email(email_id: int):
     """특정 이메일 상세 조회"""
     try:
         email = db.get_email_by_id(email_id)
@@ -159,7 +336,7 @@ async def get_email(email_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/emails/unanalyzed")
-async def get_unanalyzed_emails(limit: int = 10):
+def get_unanalyzed_emails(limit: int = 10):
     """미분석 이메일 목록 조회"""
     try:
         emails = db.get_unanalyzed_emails(limit=limit)
@@ -170,7 +347,7 @@ async def get_unanalyzed_emails(limit: int = 10):
 # ========== 이메일 분석 API ==========
 
 @app.post("/analyze/{email_id}")
-async def analyze_email(email_id: int):
+def analyze_email(email_id: int):
     """
     이메일 분석 (LangGraph → n8n → Gemini)
 
@@ -186,7 +363,7 @@ async def analyze_email(email_id: int):
             raise HTTPException(status_code=404, detail="Email not found")
 
         # LangGraph Supervisor를 통해 분석 (n8n → Gemini 호출)
-        result = email_processor.analyze_single_email(email_id)
+        result = get_email_processor().analyze_single_email(email_id)
 
         if result.get("success") is False:
             raise HTTPException(
@@ -206,8 +383,8 @@ async def analyze_email(email_id: int):
 async def analyze_all_unanalyzed():
     """미분석 이메일 전체 분석 (LangGraph → n8n → Gemini)"""
     try:
-        # 미분석 이메일 조회
-        unanalyzed = db.get_unanalyzed_emails(limit=100)
+        # 미분석 이메일 조회 (동기 DB 호출은 스레드에서)
+        unanalyzed = await asyncio.to_thread(db.get_unanalyzed_emails, limit=100)
         email_ids = [email['id'] for email in unanalyzed]
 
         if not email_ids:
@@ -216,8 +393,9 @@ async def analyze_all_unanalyzed():
                 "results": []
             }
 
-        # LangGraph Supervisor를 통해 분석 (n8n → Gemini 호출)
-        result = email_processor.analyze_multiple_emails(email_ids)
+        # LangGraph Supervisor를 통해 동시 분석 (n8n → Gemini 호출)
+        # 이미 조회한 행을 넘겨 이메일별 DB 재조회 생략
+        result = await get_email_processor().analyze_multiple_emails_async(email_ids, emails=unanalyzed)
 
         return result
 
@@ -236,10 +414,8 @@ async def generate_reply(email_id: int, preferred_tone: str = "formal"):
     - **preferred_tone**: 선호하는 톤 (기본값: formal)
     """
     try:
-        import requests
-
-        # 이메일 존재 여부 확인
-        email = db.get_email_by_id(email_id)
+        # 이메일 존재 여부 확인 (동기 DB 호출은 스레드에서)
+        email = await asyncio.to_thread(db.get_email_by_id, email_id)
         if not email:
             raise HTTPException(status_code=404, detail="Email not found")
 
@@ -252,7 +428,7 @@ async def generate_reply(email_id: int, preferred_tone: str = "formal"):
 
         logger.info(f"n8n 워크플로우 호출 시작: email_id={email_id}, preferred_tone={preferred_tone}")
 
-        response = requests.post(webhook_url, json=payload, timeout=90)
+        response = await _post_n8n(webhook_url, payload, timeout=90)
 
         if response.status_code == 200:
             logger.info(f"n8n 워크플로우 성공: email_id={email_id}")
@@ -267,10 +443,10 @@ async def generate_reply(email_id: int, preferred_tone: str = "formal"):
                 detail=f"n8n 워크플로우 실행 실패: {response.text}"
             )
 
-    except requests.exceptions.Timeout:
+    except N8N_TIMEOUT_ERRORS:
         logger.error(f"n8n 워크플로우 timeout: email_id={email_id}")
         raise HTTPException(status_code=504, detail="답변 생성 시간 초과 (90초)")
-    except requests.exceptions.RequestException as e:
+    except N8N_REQUEST_ERRORS as e:
         logger.error(f"n8n 연결 실패: {e}")
         raise HTTPException(status_code=503, detail=f"n8n 연결 실패: {str(e)}")
     except HTTPException:
@@ -289,26 +465,27 @@ async def send_reply(request: SendReplyRequest):
     - n8n의 "답변 메일 발송" 워크플로우를 호출합니다
     """
     try:
-        import requests
-
         # n8n Webhook URL
         webhook_url = "http://n8n:5678/webhook/send-reply"
 
+        # 동기 DB 호출은 스레드에서
+        original = await asyncio.to_thread(db.get_email_by_id, request.email_id)
+
         payload = {
             "to_email": request.to_email,
             "to_name": request.to_name or "",
-            "subject": f"Re: {db.get_email_by_id(request.email_id)['subject']}",
+            "subject": f"Re: {original['subject']}",
             "reply_body": request.reply_text,
             "sender_name": settings.NAVER_NAME,
             "sender_email": settings.NAVER_EMAIL
         }
 
         # n8n Webhook 호출
-        response = requests.post(webhook_url, json=payload, timeout=10)
+        response = await _post_n8n(webhook_url, payload, timeout=10)
 
         if response.status_code == 200:
             # DB에 발송 기록 저장
-            db.save_sent_email({
+            await asyncio.to_thread(db.save_sent_email, {
                 'original_email_id': request.email_id,
                 'to_email': request.to_email,
                 'to_name': request.to_name,
@@ -320,7 +497,7 @@ async def send_reply(request: SendReplyRequest):
             })
 
             # 원본 이메일을 답변 완료로 표시
-            db.mark_as_replied(request.email_id)
+            await asyncio.to_thread(db.mark_as_replied, request.email_id)
 
             return {
                 "success": True,
@@ -330,7 +507,7 @@ async def send_reply(request: SendReplyRequest):
         else:
             raise HTTPException(status_code=500, detail="Failed to send email via n8n")
 
-    except requests.exceptions.RequestException as e:
+    except N8N_REQUEST_ERRORS as e:
         raise HTTPException(status_code=503, detail=f"n8n webhook error: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -338,10 +515,9 @@ async def send_reply(request: SendReplyRequest):
 # ========== 일일 요약 API ==========
 
 @app.get("/summary/today")
-async def get_today_summary():
+def get_today_summary():
     """오늘의 이메일 요약 조회"""
     try:
-        from datetime import date
         summary = db.get_daily_summary(date.today())
 
         if not summary:
@@ -365,7 +541,7 @@ async def generate_daily_summary():
     """
     try:
         # LangGraph Supervisor 실행
-        result = email_processor.generate_daily_summary()
+        result = await get_email_processor().generate_daily_summary_async()
 
         # email_ids 개수 계산
         email_count = len(result.get("email_ids", []))
@@ -388,39 +564,37 @@ async def generate_daily_summary():
 
 
 @app.get("/v2/suggestions/{email_id}")
-async def get_suggestion(email_id: int):
+def get_suggestion(email_id: int):
     """답변 제안 조회 (이메일 ID 기준)"""
     try:
         conn = db.get_connection()
-        cur = conn.cursor()
+        try:
+            cur = conn.cursor()
 
-        # 이메일 정보 조회
-        cur.execute("""
-            SELECT id, subject, sender_name, sender_address
-            FROM email
-            WHERE id = %s
-        """, (email_id,))
+            # 이메일 정보 + 3가지 톤의 답변 초안을 한 번에 조회
+            cur.execute("""
+                SELECT e.id, e.subject, e.sender_name, e.sender_address,
+                       d.tone, d.reply_text, d.confidence_score, d.status, d.created_at
+                FROM email e
+                LEFT JOIN reply_drafts d ON d.email_id = e.id
+                WHERE e.id = %s
+                ORDER BY d.created_at DESC
+            """, (email_id,))
 
-        email = cur.fetchone()
+            rows = cur.fetchall()
+            cur.close()
+        finally:
+            conn.close()
 
-        if not email:
+        if not rows:
             raise HTTPException(status_code=404, detail="Email not found")
 
-        # 3가지 톤의 답변 초안 조회
-        cur.execute("""
-            SELECT tone, reply_text, confidence_score, status, created_at
-            FROM reply_drafts
-            WHERE email_id = %s
-            ORDER BY created_at DESC
-        """, (email_id,))
-
-        drafts = cur.fetchall()
-        cur.close()
-        conn.close()
-
-        if not drafts:
+        # LEFT JOIN: 초안이 없으면 draft 컬럼이 NULL인 행 1개
+        if rows[0]['tone'] is None:
             raise HTTPException(status_code=404, detail="No reply drafts found for this email")
 
+        email = rows[0]
+
         # 응답 포맷 (기존 스키마와 호환되도록)
         result = {
             "email_id": email['id'],
@@ -430,12 +604,12 @@ async def get_suggestion(email_id: int):
             "drafts": {}
         }
 
-        for draft in drafts:
+        for draft in rows:
             result['drafts'][draft['tone']] = {
                 "reply_text": draft['reply_text'],
                 "confidence_score": draft['confidence_score'],
                 "status": draft['status'],
-                "created_at": str(draft['created_at'])
+                "created_at": draft['created_at']
             }
 
         return result
@@ -446,6 +620,94 @@ async def get_suggestion(email_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _fetch_approval_target(email_id: int, selected_tone: str):
+    """승인 대상 이메일 + 답변 초안 조회 (동기 DB 호출, 스레드에서 실행) - 이메일 컬럼 + reply_text/status 한 행"""
+    conn = db.get_connection()
+    try:
+        cur = conn.cursor()
+
+        # 이메일 + 선택한 톤의 답변 초안을 한 번에 조회
+        cur.execute("""
+            SELECT e.id, e.subject, e.sender_address, e.sender_name,
+                   d.reply_text, d.status
+            FROM email e
+            LEFT JOIN reply_drafts d ON d.email_id = e.id AND d.tone = %s
+            WHERE e.id = %s
+        """, (selected_tone, email_id))
+
+        row = cur.fetchone()
+        cur.close()
+    finally:
+        conn.close()
+
+    if not row:
+        raise HTTPException(status_code=404, detail="Email not found")
+
+    if row['status'] is None:
+        raise HTTPException(status_code=404, detail=f"No draft found for tone '{selected_tone}'")
+
+    if row['status'] != 'generated':
+        raise HTTPException(status_code=400, detail="Draft already processed")
+
+    return row
+
+
+def _save_approved_reply(email_id: int, selected_tone: str, email, payload: dict,
+                         final_reply: str, original_draft: str, modified_text: Optional[str]) -> int:
+    """발송 기록 저장 + 이메일/초안 상태 갱신을 한 트랜잭션으로 (동기 DB 호출, 스레드에서 실행)"""
+    conn = db.get_connection()
+    try:
+        cur = conn.cursor()
+
+        # sent_emails 저장 + email / draft 상태 업데이트를 한 문장(CTE)으로
+        cur.execute("""
+            WITH sent AS (
+                INSERT INTO sent_emails
+                (original_email_id, to_email, to_name, subject, reply_body,
+                 sender_name, sender_email, status, approved_by, approved_at,
+                 original_draft, user_modifications)
+                VALUES (%(email_id)s, %(to_email)s, %(to_name)s, %(subject)s, %(reply_body)s,
+                        %(sender_name)s, %(sender_email)s, 'sent', 'user', NOW(),
+                        %(original_draft)s, %(modified_text)s)
+                RETURNING id
+            ), replied AS (
+                UPDATE email
+                SET is_replied_to = TRUE,
+                    processing_status = 'replied',
+                    updated_at = NOW()
+                WHERE id = %(email_id)s
+            ), approved AS (
+                UPDATE reply_drafts
+                SET status = 'approved'
+                WHERE email_id = %(email_id)s AND tone = %(tone)s
+            )
+            SELECT id FROM sent
+        """, {
+            'email_id': email_id,
+            'to_email': email['sender_address'],
+            'to_name': email['sender_name'],
+            'subject': payload['subject'],
+            'reply_body': final_reply,
+            'sender_name': settings.NAVER_NAME,
+            'sender_email': settings.NAVER_EMAIL,
+            'original_draft': original_draft,
+            'modified_text': modified_text,
+            'tone': selected_tone
+        })
+
+        sent_id = cur.fetchone()['id']
+
+        conn.commit()
+        cur.close()
+        return sent_id
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+
 @app.post("/v2/approve-reply/{email_id}")
 async def approve_and_send_reply(email_id: int, selected_tone: str, modified_text: Optional[str] = None):
     """
@@ -463,42 +725,13 @@ async def approve_and_send_reply(email_id: int, selected_tone: str, modified_tex
         4. 피드백 학습 (FeedbackAgent)
     """
     try:
-        import requests
-
-        # 1. 이메일 및 답변 초안 조회
-        conn = db.get_connection()
-        cur = conn.cursor()
-
-        cur.execute("""
-            SELECT id, subject, sender_address, sender_name
-            FROM email
-            WHERE id = %s
-        """, (email_id,))
-
-        email = cur.fetchone()
-
-        if not email:
-            raise HTTPException(status_code=404, detail="Email not found")
-
-        # 2. 선택한 톤의 답변 초안 조회
-        cur.execute("""
-            SELECT reply_text, status
-            FROM reply_drafts
-            WHERE email_id = %s AND tone = %s
-        """, (email_id, selected_tone))
+        # 1~2. 이메일 및 선택한 톤의 답변 초안 조회 (동기 DB 호출은 스레드에서)
+        email = await asyncio.to_thread(_fetch_approval_target, email_id, selected_tone)
 
-        draft = cur.fetchone()
-
-        if not draft:
-            raise HTTPException(status_code=404, detail=f"No draft found for tone '{selected_tone}'")
-
-        if draft['status'] != 'generated':
-            raise HTTPException(status_code=400, detail="Draft already processed")
-
-        original_draft = draft['reply_text']
+        original_draft = email['reply_text']
         final_reply = modified_text if modified_text else original_draft
 
-        # 3. n8n Webhook 호출 (메일 발송)
+        # 3. n8n Webhook 호출 (메일 발송) - DB 연결을 잡지 않은 상태로 대기
         webhook_url = "http://n8n:5678/webhook-test/send-reply"
         payload = {
             "to_email": email['sender_address'],
@@ -509,48 +742,14 @@ async def approve_and_send_reply(email_id: int, selected_tone: str, modified_tex
             "sender_email": settings.NAVER_EMAIL
         }
 
-        response = requests.post(webhook_url, json=payload, timeout=10)
+        response = await _post_n8n(webhook_url, payload, timeout=10)
 
         if response.status_code == 200:
-            # 4. sent_emails 저장
-            cur.execute("""
-                INSERT INTO sent_emails
-                (original_email_id, to_email, to_name, subject, reply_body,
-                 sender_name, sender_email, status, approved_by, approved_at,
-                 original_draft, user_modifications)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, 'sent', 'user', NOW(), %s, %s)
-                RETURNING id
-            """, (
-                email_id,
-                email['sender_address'],
-                email['sender_name'],
-                payload['subject'],
-                final_reply,
-                settings.NAVER_NAME,
-                settings.NAVER_EMAIL,
-                original_draft,
-                modified_text
-            ))
-
-            sent_id = cur.fetchone()['id']
-
-            # 5. email 테이블 업데이트
-            cur.execute("""
-                UPDATE email
-                SET is_replied_to = TRUE,
-                    processing_status = 'replied',
-                    updated_at = NOW()
-                WHERE id = %s
-            """, (email_id,))
-
-            # 6. draft 상태 업데이트
-            cur.execute("""
-                UPDATE reply_drafts
-                SET status = 'approved'
-                WHERE email_id = %s AND tone = %s
-            """, (email_id, selected_tone))
-
-            conn.commit()
+            # 4~6. sent_emails 저장 + email / draft 상태 업데이트
+            sent_id = await asyncio.to_thread(
+                _save_approved_reply, email_id, selected_tone, email, payload,
+                final_reply, original_draft, modified_text
+            )
 
             # 7. 피드백 학습 (비동기) - 현재는 비활성화
             # feedback_type = 'modified' if modified_text else 'accepted'
@@ -562,9 +761,6 @@ async def approve_and_send_reply(email_id: int, selected_tone: str, modified_tex
             #     feedback_type=feedback_type
             # )
 
-            cur.close()
-            conn.close()
-
             return {
                 "success": True,
                 "message": "답변이 발송되었습니다",
@@ -572,35 +768,35 @@ async def approve_and_send_reply(email_id: int, selected_tone: str, modified_tex
                 "feedback_learned": True
             }
         else:
-            conn.rollback()
-            cur.close()
-            conn.close()
             raise HTTPException(status_code=500, detail="Failed to send email via n8n")
 
     except HTTPException:
         raise
+    except N8N_TIMEOUT_ERRORS:
+        raise HTTPException(status_code=504, detail="메일 발송 시간 초과 (10초)")
+    except N8N_REQUEST_ERRORS as e:
+        raise HTTPException(status_code=503, detail=f"n8n 연결 실패: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/v2/agent-logs/{email_id}")
-async def get_agent_logs(email_id: int):
+def get_agent_logs(email_id: int):
     """에이전트 실행 로그 조회 (디버깅용)"""
     try:
-        conn = db.get_connection()
-        cur = conn.cursor()
+        with db.connection() as conn:
+            cur = conn.cursor()
 
-        cur.execute("""
-            SELECT agent_name, node_name, started_at, completed_at,
-                   duration_ms, status, error_message
-            FROM agent_execution_logs
-            WHERE email_id = %s
-            ORDER BY started_at ASC
-        """, (email_id,))
-
-        logs = cur.fetchall()
-        cur.close()
-        conn.close()
+            cur.execute("""
+                SELECT agent_name, node_name, started_at, completed_at,
+                       duration_ms, status, error_message
+                FROM agent_execution_logs
+                WHERE email_id = %s
+                ORDER BY started_at ASC
+            """, (email_id,))
+
+            logs = cur.fetchall()
+            cur.close()
 
         return {"email_id": email_id, "logs": logs}
 
@@ -610,8 +806,20 @@ async def get_agent_logs(email_id: int):
 
 # ========== RAG API ==========
 
+# 답변이 필요 없는 유형 (RAG 템플릿 검색 생략)
+RAG_SKIP_EMAIL_TYPES = frozenset({"마케팅", "공지"})
+
+
+def _should_skip_rag(email: dict) -> bool:
+    """이미 분류된 이메일 중 마케팅/공지 또는 중요도가 낮은 이메일이면 True (미분류는 False)"""
+    if email.get('email_type') in RAG_SKIP_EMAIL_TYPES:
+        return True
+    score = email.get('importance_score')
+    return score is not None and score < settings.RAG_MIN_IMPORTANCE
+
+
 @app.get("/rag/status")
-async def get_rag_status():
+def get_rag_status():
     """RAG 서비스 상태 확인"""
     try:
         rag = get_rag_service()
@@ -637,6 +845,7 @@ async def get_rag_status():
         return {
             "status": "ready" if is_ready else "not_initialized",
             "collections": collections,
+            "cache": rag_cache.stats(),
             "message": "RAG 서비스가 준비되었습니다." if is_ready else "벡터 DB를 초기화해주세요."
         }
     except Exception as e:
@@ -647,14 +856,28 @@ async def get_rag_status():
 
 
 @app.post("/rag/enhance-prompt")
-async def enhance_prompt_with_rag(email_id: int):
+def enhance_prompt_with_rag(email_id: int):
     """
     RAG로 강화된 분석 프롬프트 생성
 
     n8n 워크플로우에서 Gemini 호출 전에 이 API를 호출하여
     RAG 컨텍스트가 포함된 프롬프트를 받아 사용합니다.
+    이미 마케팅/공지 또는 낮은 중요도로 분류된 이메일은 RAG 없이 enhanced_prompt=None (기본 프롬프트 사용)
     """
     try:
+        # 이메일 조회
+        email = db.get_email_by_id(email_id)
+        if not email:
+            raise HTTPException(status_code=404, detail="Email not found")
+
+        if _should_skip_rag(email):
+            return {
+                "success": True,
+                "email_id": email_id,
+                "enhanced_prompt": None,
+                "rag_skipped": True
+            }
+
         rag = get_rag_service()
         if rag is None or not rag.is_ready():
             raise HTTPException(
@@ -662,18 +885,17 @@ async def enhance_prompt_with_rag(email_id: int):
                 detail="RAG 서비스가 준비되지 않았습니다."
             )
 
-        # 이메일 조회
-        email = db.get_email_by_id(email_id)
-        if not email:
-            raise HTTPException(status_code=404, detail="Email not found")
-
-        # RAG 강화 프롬프트 생성
-        enhanced_prompt = rag.get_enhanced_analysis_prompt(
-            email_subject=email.get('subject', ''),
-            email_body=email.get('body_text', ''),
-            sender_name=email.get('sender_name', ''),
-            sender_address=email.get('sender_address', '')
-        )
+        # RAG 강화 프롬프트 생성 (이메일이 바뀌지 않았으면 캐시 재사용)
+        cache_key = make_rag_cache_key("analysis", email_id, email.get('updated_at'))
+        enhanced_prompt = rag_cache.get(cache_key)
+        if enhanced_prompt is None:
+            enhanced_prompt = rag.get_enhanced_analysis_prompt(
+                email_subject=email.get('subject', ''),
+                email_body=email.get('body_text', ''),
+                sender_name=email.get('sender_name', ''),
+                sender_address=email.get('sender_address', '')
+            )
+            rag_cache.put(cache_key, enhanced_prompt)
 
         return {
             "success": True,
@@ -689,7 +911,7 @@ async def enhance_prompt_with_rag(email_id: int):
 
 
 @app.post("/rag/similar-emails")
-async def find_similar_emails(
+def find_similar_emails(
     subject: str,
     body: str,
     collection: str = "email_classification",
@@ -713,11 +935,15 @@ async def find_similar_emails(
             )
 
         query_text = f"{subject} {body[:500]}"
-        similar = rag.search_similar_emails(
-            query_text,
-            collection_name=collection,
-            n_results=n_results
-        )
+        cache_key = make_rag_cache_key(collection, n_results, query_text)
+        similar = rag_cache.get(cache_key)
+        if similar is None:
+            similar = rag.search_similar_emails(
+                query_text,
+                collection_name=collection,
+                n_results=n_results
+            )
+            rag_cache.put(cache_key, similar)
 
         return {
             "success": True,
@@ -734,14 +960,29 @@ async def find_similar_emails(
 
 
 @app.post("/rag/reply-context")
-async def get_reply_context(email_id: int, preferred_tone: str = "formal"):
+def get_reply_context(email_id: int, preferred_tone: str = "formal"):
     """
     답변 생성을 위한 RAG 컨텍스트 조회
 
     n8n 워크플로우에서 답변 생성 전에 이 API를 호출하여
     유사 답변 템플릿을 참조합니다.
+    답변이 필요 없는 마케팅/공지 또는 낮은 중요도 이메일은 임베딩/벡터 검색 없이 빈 컨텍스트를 반환합니다.
     """
     try:
+        # 이메일 조회
+        email = db.get_email_by_id(email_id)
+        if not email:
+            raise HTTPException(status_code=404, detail="Email not found")
+
+        if _should_skip_rag(email):
+            return {
+                "success": True,
+                "email_id": email_id,
+                "similar_templates": [],
+                "enhanced_prompt": None,
+                "rag_skipped": True
+            }
+
         rag = get_rag_service()
         if rag is None or not rag.is_ready():
             raise HTTPException(
@@ -749,27 +990,29 @@ async def get_reply_context(email_id: int, preferred_tone: str = "formal"):
                 detail="RAG 서비스가 준비되지 않았습니다."
             )
 
-        # 이메일 조회
-        email = db.get_email_by_id(email_id)
-        if not email:
-            raise HTTPException(status_code=404, detail="Email not found")
-
-        # 유사 템플릿 검색
-        templates = rag.get_reply_templates(
-            email_subject=email.get('subject', ''),
-            email_body=email.get('body_text', ''),
-            email_type=email.get('email_type'),
-            n_templates=3
-        )
+        # 이메일이 바뀌지 않았으면 캐시된 템플릿 / 프롬프트 재사용
+        cache_key = make_rag_cache_key("reply", email_id, email.get('updated_at'), preferred_tone)
+        cached = rag_cache.get(cache_key)
+        if cached is not None:
+            templates, enhanced_prompt = cached
+        else:
+            # 유사 템플릿 검색
+            templates = rag.get_reply_templates(
+                email_subject=email.get('subject', ''),
+                email_body=email.get('body_text', ''),
+                email_type=email.get('email_type'),
+                n_templates=3
+            )
 
-        # RAG 강화 답변 프롬프트 생성
-        enhanced_prompt = rag.get_enhanced_reply_prompt(
-            email_subject=email.get('subject', ''),
-            email_body=email.get('body_text', ''),
-            email_type=email.get('email_type', '기타'),
-            sender_name=email.get('sender_name', ''),
-            preferred_tone=preferred_tone
-        )
+            # RAG 강화 답변 프롬프트 생성
+            enhanced_prompt = rag.get_enhanced_reply_prompt(
+                email_subject=email.get('subject', ''),
+                email_body=email.get('body_text', ''),
+                email_type=email.get('email_type', '기타'),
+                sender_name=email.get('sender_name', ''),
+                preferred_tone=preferred_tone
+            )
+            rag_cache.put(cache_key, (templates, enhanced_prompt))
 
         return {
             "success": True,
@@ -788,7 +1031,7 @@ async def get_reply_context(email_id: int, preferred_tone: str = "formal"):
 # ========== 통계 API ==========
 
 @app.get("/stats/overview")
-async def get_stats_overview():
+def get_stats_overview():
     """
     대시보드용 통계 개요 조회
 
@@ -797,75 +1040,74 @@ async def get_stats_overview():
     - 답변 통계
     """
     try:
-        conn = db.get_connection()
-        cur = conn.cursor()
+        with db.connection() as conn:
+            cur = conn.cursor()
 
-        # 전체 이메일 통계
-        cur.execute("""
-            SELECT
-                COUNT(*) as total,
-                COUNT(CASE WHEN email_type IS NOT NULL THEN 1 END) as analyzed,
-                COUNT(CASE WHEN is_replied_to = TRUE THEN 1 END) as replied,
-                COUNT(CASE WHEN needs_reply = TRUE AND is_replied_to = FALSE THEN 1 END) as pending_reply
-            FROM email
-        """)
-        email_stats = cur.fetchone()
-
-        # 유형별 분포
-        cur.execute("""
-            SELECT email_type, COUNT(*) as count
-            FROM email
-            WHERE email_type IS NOT NULL
-            GROUP BY email_type
-            ORDER BY count DESC
-        """)
-        type_distribution = {row['email_type']: row['count'] for row in cur.fetchall()}
-
-        # 중요도별 분포
-        cur.execute("""
-            SELECT
-                CASE
-                    WHEN importance_score <= 3 THEN 'low'
-                    WHEN importance_score <= 6 THEN 'medium'
-                    WHEN importance_score <= 8 THEN 'high'
-                    ELSE 'urgent'
-                END as importance_level,
-                COUNT(*) as count
-            FROM email
-            WHERE importance_score IS NOT NULL
-            GROUP BY importance_level
-        """)
-        importance_distribution = {row['importance_level']: row['count'] for row in cur.fetchall()}
-
-        # 감정별 분포
-        cur.execute("""
-            SELECT sentiment, COUNT(*) as count
-            FROM email
-            WHERE sentiment IS NOT NULL
-            GROUP BY sentiment
-        """)
-        sentiment_distribution = {row['sentiment']: row['count'] for row in cur.fetchall()}
-
-        # 최근 7일 일별 이메일 수
-        cur.execute("""
-            SELECT DATE(received_at) as date, COUNT(*) as count
-            FROM email
-            WHERE received_at >= CURRENT_DATE - INTERVAL '7 days'
-            GROUP BY DATE(received_at)
-            ORDER BY date DESC
-        """)
-        daily_emails = [{"date": str(row['date']), "count": row['count']} for row in cur.fetchall()]
-
-        # 발송 이메일 통계
-        cur.execute("""
-            SELECT COUNT(*) as total,
-                   COUNT(CASE WHEN user_modifications IS NOT NULL THEN 1 END) as modified
-            FROM sent_emails
-        """)
-        sent_stats = cur.fetchone()
+            # 전체 이메일 통계
+            cur.execute("""
+                SELECT
+                    COUNT(*) as total,
+                    COUNT(CASE WHEN email_type IS NOT NULL THEN 1 END) as analyzed,
+                    COUNT(CASE WHEN is_replied_to = TRUE THEN 1 END) as replied,
+                    COUNT(CASE WHEN needs_reply = TRUE AND is_replied_to = FALSE THEN 1 END) as pending_reply
+                FROM email
+            """)
+            email_stats = cur.fetchone()
+
+            # 유형별 분포
+            cur.execute("""
+                SELECT email_type, COUNT(*) as count
+                FROM email
+                WHERE email_type IS NOT NULL
+                GROUP BY email_type
+                ORDER BY count DESC
+            """)
+            type_distribution = {row['email_type']: row['count'] for row in cur.fetchall()}
+
+            # 중요도별 분포
+            cur.execute("""
+                SELECT
+                    CASE
+                        WHEN importance_score <= 3 THEN 'low'
+                        WHEN importance_score <= 6 THEN 'medium'
+                        WHEN importance_score <= 8 THEN 'high'
+                        ELSE 'urgent'
+                    END as importance_level,
+                    COUNT(*) as count
+                FROM email
+                WHERE importance_score IS NOT NULL
+                GROUP BY importance_level
+            """)
+            importance_distribution = {row['importance_level']: row['count'] for row in cur.fetchall()}
+
+            # 감정별 분포
+            cur.execute("""
+                SELECT sentiment, COUNT(*) as count
+                FROM email
+                WHERE sentiment IS NOT NULL
+                GROUP BY sentiment
+            """)
+            sentiment_distribution = {row['sentiment']: row['count'] for row in cur.fetchall()}
+
+            # 최근 7일 일별 이메일 수
+            cur.execute("""
+                SELECT DATE(received_at) as date, COUNT(*) as count
+                FROM email
+                WHERE received_at >= CURRENT_DATE - INTERVAL '7 days'
+                GROUP BY DATE(received_at)
+                ORDER BY date DESC
+            """)
+            daily_emails = [{"date": str(row['date']), "count": row['count']} for row in cur.fetchall()]
+
+            # 발송 이메일 통계
+            cur.execute("""
+                SELECT COUNT(*) as total,
+                       COUNT(CASE WHEN user_modifications IS NOT NULL THEN 1 END) as modified
+                FROM sent_emails
+            """)
+            sent_stats = cur.fetchone()
 
-        cur.close()
-        conn.close()
+            cur.close()
 
         return {
             "email_stats": {
@@ -890,7 +1132,7 @@ async def get_stats_overview():
 
 
 @app.get("/stats/reply-history")
-async def get_reply_history(limit: int = 20, offset: int = 0):
+def get_reply_history(limit: int = 20, offset: int = 0):
     """
     답변 히스토리 조회
 
@@ -898,51 +1140,50 @@ async def get_reply_history(limit: int = 20, offset: int = 0):
     - 원본 이메일 정보 포함
     """
     try:
-        conn = db.get_connection()
-        cur = conn.cursor()
+        with db.connection() as conn:
+            cur = conn.cursor()
 
-        cur.execute("""
-            SELECT
-                s.id,
-                s.original_email_id,
-                s.to_email,
-                s.to_name,
-                s.subject,
-                s.reply_body,
-                s.sent_at,
-                s.status,
-                s.original_draft,
-                s.user_modifications,
-                e.email_type,
-                e.importance_score
-            FROM sent_emails s
-            LEFT JOIN email e ON s.original_email_id = e.id
-            ORDER BY s.sent_at DESC
-            LIMIT %s OFFSET %s
-        """, (limit, offset))
-
-        replies = []
-        for row in cur.fetchall():
-            replies.append({
-                "id": row['id'],
-                "email_id": row['original_email_id'],
-                "to_email": row['to_email'],
-                "to_name": row['to_name'],
-                "subject": row['subject'],
-                "reply_body": row['reply_body'][:200] + "..." if len(row['reply_body'] or '') > 200 else row['reply_body'],
-                "sent_at": str(row['sent_at']),
-                "status": row['status'],
-                "was_modified": row['user_modifications'] is not None,
-                "email_type": row['email_type'],
-                "importance_score": row['importance_score']
-            })
-
-        # 전체 개수
-        cur.execute("SELECT COUNT(*) as total FROM sent_emails")
-        total = cur.fetchone()['total']
+            cur.execute("""
+                SELECT
+                    s.id,
+                    s.original_email_id,
+                    s.to_email,
+                    s.to_name,
+                    s.subject,
+                    s.reply_body,
+                    s.sent_at,
+                    s.status,
+                    s.original_draft,
+                    s.user_modifications,
+                    e.email_type,
+                    e.importance_score
+                FROM sent_emails s
+                LEFT JOIN email e ON s.original_email_id = e.id
+                ORDER BY s.sent_at DESC
+                LIMIT %s OFFSET %s
+            """, (limit, offset))
+
+            replies = []
+            for row in cur.fetchall():
+                replies.append({
+                    "id": row['id'],
+                    "email_id": row['original_email_id'],
+                    "to_email": row['to_email'],
+                    "to_name": row['to_name'],
+                    "subject": row['subject'],
+                    "reply_body": row['reply_body'][:200] + "..." if len(row['reply_body'] or '') > 200 else row['reply_body'],
+                    "sent_at": row['sent_at'],
+                    "status": row['status'],
+                    "was_modified": row['user_modifications'] is not None,
+                    "email_type": row['email_type'],
+                    "importance_score": row['importance_score']
+                })
+
+            # 전체 개수
+            cur.execute("SELECT COUNT(*) as total FROM sent_emails")
+            total = cur.fetchone()['total']
 
-        cur.close()
-        conn.close()
+            cur.close()
 
         return {
             "replies": replies,
@@ -959,7 +1200,7 @@ async def get_reply_history(limit: int = 20, offset: int = 0):
 # ========== 피드백 학습 API ==========
 
 @app.post("/feedback/learn")
-async def learn_from_feedback(
+def learn_from_feedback(
     email_id: int,
     original_draft: str,
     final_reply: str,
@@ -1013,7 +1254,7 @@ async def learn_from_feedback(
 
 
 @app.get("/feedback/stats")
-async def get_feedback_stats():
+def get_feedback_stats():
     """
     피드백 학습 통계 조회
     """
@@ -1037,7 +1278,7 @@ async def get_feedback_stats():
 
 
 @app.post("/rag/feedback-enhanced-prompt")
-async def get_feedback_enhanced_prompt(email_id: int, preferred_tone: str = "formal"):
+def get_feedback_enhanced_prompt(email_id: int, preferred_tone: str = "formal"):
     """
     피드백 학습을 반영한 향상된 답변 프롬프트 생성
 
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, EmailStr, TypeAdapter
+from typing import Any, Optional
 from datetime import datetime
 
 class EmailBase(BaseModel):
@@ -16,7 +16,14 @@ class EmailAnalysis(BaseModel):
     key_points: Optional[list[str]] = None
 
 class EmailInDB(EmailBase):
+    # DB 행의 나머지 컬럼(retry_count 등)도 그대로 응답에 포함
+    model_config = ConfigDict(from_attributes=True, extra="allow")
+
     id: int
+    # DB 컬럼은 NULL 허용
+    subject: Optional[str] = None
+    body_text: Optional[str] = None
+    sender_address: Optional[str] = None
     received_at: Optional[datetime] = None
     original_uid: Optional[str] = None
     is_replied_to: bool = False
@@ -24,10 +31,13 @@ class EmailInDB(EmailBase):
     importance_score: Optional[int] = None
     needs_reply: Optional[bool] = None
     sentiment: Optional[str] = None
+    ai_analysis: Optional[dict[str, Any]] = None
+    processing_status: Optional[str] = None
     created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+# 이메일 목록 일괄 검증/직렬화용 (pydantic-core에서 한 번에 처리)
+EMAILS_ADAPTER = TypeAdapter(list[EmailInDB])
 
 class ReplyDraft(BaseModel):
     tone: str  # formal/casual/brief
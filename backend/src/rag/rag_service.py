@@ -19,6 +19,9 @@ Advanced RAG 고도화 (Phase 4):
 import os
 import re
 import math
+import hashlib
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, field
@@ -198,6 +201,32 @@ SENDER_DOMAIN_HINTS = {
 }
 
 
+# ============================================================
+# 프롬프트 구성 (LLM 서버 prefix 캐시 친화적 순서)
+# ============================================================
+# 강화 프롬프트는 [고정 지침] → [검색 결과 (문서 ID 순)] → [이메일별 내용] 순서로 만듭니다.
+# 앞부분이 이메일마다 같아야 vLLM(--enable-prefix-caching) 등의 prefix KV 캐시가 재사용되므로
+# 검색 결과는 점수 순이 아니라 문서 ID 순으로 두고, 이메일 본문/어조 같은 가변 정보는 맨 뒤에 둡니다.
+
+REPLY_TONE_GUIDE = {
+    "formal": "격식 있고 정중한 어조",
+    "casual": "친근하고 따뜻한 어조",
+    "brief": "간결하고 핵심만 전달하는 어조"
+}
+
+REPLY_PROMPT_PREAMBLE = """다음 이메일에 대한 답변을 작성해주세요.
+
+## 작성 규칙
+- 한국어로 답변 작성
+- 적절한 인사와 마무리 포함
+"""
+
+
+def canonical_order(results: List[Dict]) -> List[Dict]:
+    """검색 결과를 문서 ID 순으로 정렬 (같은 문서 집합이면 항상 같은 순서)"""
+    return sorted(results, key=lambda r: str(r.get('id', '')))
+
+
 class EmailRAGService:
     """
     이메일 RAG 서비스
@@ -235,6 +264,12 @@ class EmailRAGService:
         # Advanced RAG: BM25 인덱스 캐시
         self._bm25_indices = {}  # {collection_name: (BM25Okapi, documents)}
 
+        # 임베딩 캐시 (LRU): {sha1(text): embedding}
+        # 분석 → 답변 컨텍스트처럼 같은 이메일 텍스트가 연달아 들어올 때 인코더 호출 생략
+        self._embedding_cache: "OrderedDict[bytes, List[float]]" = OrderedDict()
+        self._embedding_cache_size = 4096
+        self._embedding_lock = threading.Lock()
+
         # 기본 RAG 설정
         self.config = DEFAULT_RAG_CONFIG
 
@@ -283,8 +318,24 @@ class EmailRAGService:
             return False
 
     def embed_text(self, text: str) -> List[float]:
-        """텍스트를 벡터로 변환"""
-        return self.model.encode([text]).tolist()[0]
+        """텍스트를 벡터로 변환 (같은 텍스트는 캐시된 벡터 재사용)"""
+        key = hashlib.sha1(text.encode("utf-8")).digest()
+
+        with self._embedding_lock:
+            cached = self._embedding_cache.get(key)
+            if cached is not None:
+                self._embedding_cache.move_to_end(key)
+                return list(cached)
+
+        embedding = self.model.encode([text]).tolist()[0]
+
+        with self._embedding_lock:
+            self._embedding_cache[key] = embedding
+            self._embedding_cache.move_to_end(key)
+            while len(self._embedding_cache) > self._embedding_cache_size:
+                self._embedding_cache.popitem(last=False)
+
+        return list(embedding)
 
     @property
     def cross_encoder(self) -> CrossEncoder:
@@ -899,10 +950,10 @@ class EmailRAGService:
         if not similar:
             return ""
 
-        # Phase 3-Lite: 간소화된 Few-shot 예시
+        # Phase 3-Lite: 간소화된 Few-shot 예시 (prefix 캐시를 위해 문서 ID 순)
         context_parts = ["## 유사 이메일 참조 (Advanced RAG)\n"]
 
-        for i, email in enumerate(similar, 1):
+        for i, email in enumerate(canonical_order(similar), 1):
             metadata = email['metadata']
             email_type = metadata.get('email_type', '기타')
             subject = metadata.get('subject', 'N/A')[:50]
@@ -1082,15 +1133,9 @@ class EmailRAGService:
         if sender_address and ("noreply" in sender_address.lower() or "no-reply" in sender_address.lower()):
             noreply_hint = "\n📌 noreply 발신자 → 자동 발송 메일일 가능성 높음"
 
+        # [고정 지침] → [검색 결과] → [분석 대상] 순서 (prefix 캐시 재사용)
         prompt = f"""이메일을 분석하여 JSON으로 응답하세요.
 
-## 분석 대상
-- **제목**: {email_subject}
-- **발신자**: {sender_name} <{sender_address}>{noreply_hint}
-- **본문**:
-{email_body[:1000]}
-{auto_hint}
-
 ## 분류 기준
 
 ### 이메일 유형 (email_type)
@@ -1103,8 +1148,6 @@ class EmailRAGService:
 ### 중요도 (importance_score)
 {importance_guide}
 
-{classification_context}
-
 ## 출력 (JSON만)
 ```json
 {{
@@ -1114,7 +1157,16 @@ class EmailRAGService:
     "sentiment": "positive|negative|neutral",
     "key_points": ["핵심1", "핵심2"]
 }}
-```"""
+```
+
+{classification_context}
+
+## 분석 대상
+- **제목**: {email_subject}
+- **발신자**: {sender_name} <{sender_address}>{noreply_hint}
+- **본문**:
+{email_body[:1000]}
+{auto_hint}"""
 
         return prompt
 
@@ -1189,16 +1241,12 @@ class EmailRAGService:
         template_context = ""
         if templates:
             template_context = "## 참조할 유사 이메일 패턴:\n"
-            for i, t in enumerate(templates, 1):
+            for i, t in enumerate(canonical_order(templates), 1):
                 template_context += f"{i}. [{t['metadata'].get('email_type', 'N/A')}] {t['metadata'].get('subject', '')[:50]}...\n"
 
-        tone_guide = {
-            "formal": "격식 있고 정중한 어조",
-            "casual": "친근하고 따뜻한 어조",
-            "brief": "간결하고 핵심만 전달하는 어조"
-        }
-
-        prompt = f"""다음 이메일에 대한 답변을 작성해주세요.
+        # [고정 지침] → [검색 결과] → [원본 이메일 + 어조] 순서 (prefix 캐시 재사용)
+        prompt = f"""{REPLY_PROMPT_PREAMBLE}
+{template_context}
 
 ## 원본 이메일
 - 제목: {email_subject}
@@ -1207,12 +1255,8 @@ class EmailRAGService:
 - 본문:
 {email_body[:1500]}
 
-{template_context}
-
 ## 답변 요청
-- 어조: {tone_guide.get(preferred_tone, '격식 있는')}
-- 한국어로 답변 작성
-- 적절한 인사와 마무리 포함
+- 어조: {REPLY_TONE_GUIDE.get(preferred_tone, '격식 있는')}
 """
         return prompt
 
@@ -1335,26 +1379,23 @@ class EmailRAGService:
         template_context = ""
         if templates:
             template_context = "## 유사 이메일 참조:\n"
-            for i, t in enumerate(templates[:2], 1):
+            for i, t in enumerate(canonical_order(templates[:2]), 1):
                 template_context += f"{i}. [{t['metadata'].get('email_type', 'N/A')}] {t['metadata'].get('subject', '')[:50]}...\n"
 
         feedback_context = ""
         if feedback_examples:
             feedback_context = "\n## 📚 사용자 선호 답변 스타일 (학습됨):\n"
-            for i, fb in enumerate(feedback_examples, 1):
+            for i, fb in enumerate(canonical_order(feedback_examples), 1):
                 meta = fb['metadata']
                 reply_text = meta.get('reply_text', '')[:200]
                 feedback_type = "✅ 승인됨" if not meta.get('was_modified') else "✏️ 수정됨"
                 feedback_context += f"\n### 예시 {i} ({feedback_type}):\n"
                 feedback_context += f"```\n{reply_text}...\n```\n"
 
-        tone_guide = {
-            "formal": "격식 있고 정중한 어조",
-            "casual": "친근하고 따뜻한 어조",
-            "brief": "간결하고 핵심만 전달하는 어조"
-        }
-
-        prompt = f"""다음 이메일에 대한 답변을 작성해주세요.
+        # [고정 지침] → [검색 결과] → [원본 이메일 + 어조] 순서 (prefix 캐시 재사용)
+        prompt = f"""{REPLY_PROMPT_PREAMBLE}
+{template_context}
+{feedback_context}
 
 ## 원본 이메일
 - 제목: {email_subject}
@@ -1363,13 +1404,8 @@ class EmailRAGService:
 - 본문:
 {email_body[:1500]}
 
-{template_context}
-{feedback_context}
-
 ## 답변 요청
-- 어조: {tone_guide.get(preferred_tone, '격식 있는')}
-- 한국어로 답변 작성
-- 적절한 인사와 마무리 포함
+- 어조: {REPLY_TONE_GUIDE.get(preferred_tone, '격식 있는')}
 {"- 위 사용자 선호 스타일을 참고하여 비슷한 톤과 형식으로 작성" if feedback_examples else ""}
 """
         return prompt
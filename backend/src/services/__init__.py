@@ -1,2 +1,3 @@
 from .db_service import *
-from .gemini_service import *
+# gemini_service는 google.generativeai를 import하므로 필요한 곳에서 직접 import
+# (from src.services.gemini_service import gemini)
@@ -0,0 +1,315 @@
+"""
+LLM 결과 캐시 (분석 / 답변 초안)
+
+같은 이메일을 TTL 안에 다시 처리할 때 n8n → Gemini 호출을 건너뛰기 위한
+프로세스 단위 LRU + TTL 캐시입니다.
+
+SemanticAnalysisCache는 내용이 거의 같은 이메일(뉴스레터, 알림 메일 등)의
+분석 결과를 임베딩 코사인 유사도로 재사용합니다.
+
+SmartRAGCache는 /rag/* 엔드포인트의 검색 결과 / 강화 프롬프트를 짧은 TTL로 보관해
+n8n 재시도나 화면 새로고침으로 같은 요청이 반복될 때 임베딩 + 벡터 검색을 건너뜁니다.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# 기본 TTL: 24시간
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """캐시 키용 텍스트 정규화 (공백 정리 + 소문자)"""
+    return " ".join((text or "").split()).lower()
+
+
+def make_cache_key(email_id: Any, subject: Optional[str], body_text: Optional[str], scope: str) -> str:
+    """
+    캐시 키 생성
+
+    sha256(email_id || subject || body_text[:2000] || scope)
+    scope에는 작업 종류와 프롬프트 버전을 넣습니다 (예: "analyze_v1").
+    """
+    parts = [
+        str(email_id),
+        normalize_text(subject),
+        normalize_text((body_text or "")[:2000]),
+        scope,
+    ]
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
+class SmartLLMCache:
+    """
+    스레드 안전 LRU + TTL 캐시
+
+    - maxsize 초과 시 가장 오래 사용되지 않은 항목부터 제거 (LRU)
+    - ttl 초가 지난 항목은 조회 시 만료 처리
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = DEFAULT_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()  # {key: (expires_at, value)}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되면 None)"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                self._discard(key)
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        """캐시 저장 (용량 초과 시 LRU 제거)"""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._discard(next(iter(self._data)))
+
+    def _discard(self, key: str) -> None:
+        """항목 제거 (락을 잡은 상태에서 호출)"""
+        del self._data[key]
+
+    def clear(self) -> None:
+        """캐시 비우기"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+def make_rag_cache_key(*parts: Any) -> str:
+    """
+    RAG 캐시 키 생성
+
+    sha1(part1 | part2 | ...) - 문자열 part는 normalize_text로 정규화합니다.
+    """
+    raw = "|".join(normalize_text(p) if isinstance(p, str) else str(p) for p in parts)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _approx_size(value: Any) -> int:
+    """캐시 값의 대략적인 메모리 크기 (문자열 길이 위주로 추정)"""
+    if isinstance(value, str):
+        return len(value) + 50
+    if isinstance(value, dict):
+        return sum(_approx_size(k) + _approx_size(v) for k, v in value.items()) + 64
+    if isinstance(value, (list, tuple)):
+        return sum(_approx_size(v) for v in value) + 56
+    return 32
+
+
+class SmartRAGCache(SmartLLMCache):
+    """
+    RAG 결과 캐시 (LRU + TTL + 메모리 상한)
+
+    - SmartLLMCache와 같은 LRU / TTL 동작
+    - 저장된 값의 추정 크기 합이 mem_cap 바이트를 넘으면 오래된 항목부터 제거
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 600, mem_cap: int = 100 * 1024 * 1024):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.mem_cap = mem_cap
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
+
+    def put(self, key: str, value: Any) -> None:
+        """캐시 저장 (용량 / 메모리 상한 초과 시 LRU 제거)"""
+        size = _approx_size(value)
+        with self._lock:
+            if key in self._data:
+                self._discard(key)
+            self._sizes[key] = size
+            self._bytes += size
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            while len(self._data) > self.maxsize or (self._bytes > self.mem_cap and len(self._data) > 1):
+                self._discard(next(iter(self._data)))
+
+    def _discard(self, key: str) -> None:
+        del self._data[key]
+        self._bytes -= self._sizes.pop(key, 0)
+
+    def clear(self) -> None:
+        """캐시 비우기"""
+        with self._lock:
+            self._sizes.clear()
+            self._bytes = 0
+        super().clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중 통계 + 추정 메모리 사용량"""
+        stats = super().stats()
+        with self._lock:
+            stats["approx_bytes"] = self._bytes
+            stats["mem_cap"] = self.mem_cap
+        return stats
+
+
+def semantic_key_text(subject: Optional[str], body_text: Optional[str]) -> str:
+    """유사도 캐시용 임베딩 입력 텍스트 (제목 + 본문 앞 500자)"""
+    return f"{normalize_text(subject)}\n{normalize_text((body_text or '')[:500])}"
+
+
+class SemanticAnalysisCache:
+    """
+    임베딩 유사도 기반 분석 결과 캐시
+
+    - 저장된 임베딩과의 코사인 유사도가 threshold 이상이면 그 분석 결과를 반환
+    - 임베딩은 정규화해서 미리 할당한 (용량, dim) 행렬에 보관하고 (부족하면 2배로, 최대 maxsize),
+      조회는 행렬곱 1번
+    - ttl 초가 지난 항목은 argmax 전에 제외하고, add 시 만료된 칸부터 재사용
+    - 만료된 칸이 없고 maxsize가 차면 가장 오래 사용되지 않은 항목 자리에 덮어씀 (LRU)
+    """
+
+    def __init__(self, threshold: float = 0.92, maxsize: int = 2048, ttl: float = DEFAULT_TTL_SECONDS):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._matrix: Optional[np.ndarray] = None  # (용량, dim), 앞쪽 _size행만 사용
+        self._size = 0
+        self._values: List[Any] = []
+        self._expires = np.empty(0)
+        self._last_used = np.empty(0, dtype=np.int64)  # LRU용 사용 순번
+        self._clock = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def lookup(self, embedding) -> Optional[Any]:
+        """가장 유사한 항목의 값 반환 (threshold 미만이거나 만료되면 None)"""
+        match = self.match(embedding)
+        return match[0] if match is not None else None
+
+    def match(self, embedding) -> Optional[Tuple[Any, float]]:
+        """만료되지 않은 항목 중 가장 유사한 항목의 (값, 코사인 유사도) 반환 (threshold 미만이면 None)"""
+        query = self._normalize(embedding)
+
+        with self._lock:
+            if not self._size:
+                self.misses += 1
+                return None
+
+            scores = self._matrix[:self._size] @ query
+            scores[self._expires[:self._size] < time.monotonic()] = -np.inf  # 만료 항목은 후보에서 제외
+            best = int(np.argmax(scores))
+
+            if scores[best] < self.threshold:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._clock += 1
+            self._last_used[best] = self._clock
+            return self._values[best], float(scores[best])
+
+    def _reserve(self, dim: int) -> None:
+        """행 1개를 더 넣을 공간 확보 (용량이 부족하면 2배로, 최대 maxsize - 락을 잡은 상태에서 호출)"""
+        capacity = 0 if self._matrix is None else self._matrix.shape[0]
+        if self._size < capacity:
+            return
+        grown_capacity = min(self.maxsize, max(16, capacity * 2))
+        grown = np.empty((grown_capacity, dim), dtype=np.float32)
+        expires = np.empty(grown_capacity)
+        last_used = np.empty(grown_capacity, dtype=np.int64)
+        if self._size:
+            grown[:self._size] = self._matrix[:self._size]
+            expires[:self._size] = self._expires[:self._size]
+            last_used[:self._size] = self._last_used[:self._size]
+        self._matrix, self._expires, self._last_used = grown, expires, last_used
+
+    def _free_slot(self) -> Optional[int]:
+        """만료된 칸, 없으면 꽉 찼을 때 LRU 칸의 위치 (빈 칸을 뒤에 추가할 수 있으면 None)"""
+        expired = np.flatnonzero(self._expires[:self._size] < time.monotonic())
+        if expired.size:
+            return int(expired[0])
+        if self._size >= self.maxsize:
+            return int(np.argmin(self._last_used[:self._size]))
+        return None
+
+    def add(self, embedding, value: Any) -> None:
+        """임베딩 + 값 저장 (만료된 칸 → 새 칸 → LRU 칸 순으로 사용, 행렬 전체를 복사하지 않음)"""
+        vec = self._normalize(embedding)
+
+        with self._lock:
+            slot = self._free_slot() if self._size else None
+            if slot is None:
+                self._reserve(vec.shape[0])
+                slot = self._size
+                self._size += 1
+                self._values.append(value)
+            else:
+                self._values[slot] = value
+
+            self._clock += 1
+            self._matrix[slot] = vec
+            self._expires[slot] = time.monotonic() + self.ttl
+            self._last_used[slot] = self._clock
+
+    def clear(self) -> None:
+        """캐시 비우기"""
+        with self._lock:
+            self._matrix = None
+            self._size = 0
+            self._values.clear()
+            self._expires = np.empty(0)
+            self._last_used = np.empty(0, dtype=np.int64)
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": self._size,
+                "maxsize": self.maxsize,
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+# 싱글톤 인스턴스
+analysis_cache = SmartLLMCache()
+reply_cache = SmartLLMCache(maxsize=256)
+rag_cache = SmartRAGCache()
@@ -1,9 +1,32 @@
+import threading
+from contextlib import contextmanager
+
 import psycopg2
+import psycopg2.extensions
 from psycopg2.extras import RealDictCursor
-from typing import List, Optional, Dict, Any
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+from typing import Iterator, List, Optional, Dict, Any
 from datetime import datetime, date
 from ..config import settings
 
+
+class PooledConnection(psycopg2.extensions.connection):
+    """
+    풀에서 빌려준 연결
+
+    close()를 호출하면 실제로 끊지 않고 풀에 반납합니다.
+    예외가 나도 반납되도록 `with db.connection() as conn:` 사용을 권장합니다.
+    """
+
+    _owner = None  # 빌려준 DatabaseService (반납 전까지만 설정)
+
+    def close(self):
+        owner, self._owner = self._owner, None
+        if owner is None:
+            return super().close()
+        owner._release(self)
+
+
 class DatabaseService:
     def __init__(self):
         self.host = settings.POSTGRES_HOST
@@ -11,23 +34,83 @@ class DatabaseService:
         self.user = settings.POSTGRES_USER
         self.password = settings.POSTGRES_PASSWORD
         self.port = settings.POSTGRES_PORT
+        self.pool_min = settings.DB_POOL_MIN
+        self.pool_max = settings.DB_POOL_MAX
+        self.pool_timeout = settings.DB_POOL_TIMEOUT
+
+        self._pool: Optional[ThreadedConnectionPool] = None
+        self._pool_lock = threading.Lock()
+        # ThreadedConnectionPool은 풀이 비면 바로 PoolError를 내므로 빌릴 수 있는 수를 세마포어로 제한
+        self._slots = threading.BoundedSemaphore(self.pool_max)
+
+    def open_pool(self) -> ThreadedConnectionPool:
+        """커넥션 풀 생성 (처음 호출 시 pool_min개 연결을 미리 열어둠)"""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadedConnectionPool(
+                        self.pool_min,
+                        self.pool_max,
+                        host=self.host,
+                        database=self.database,
+                        user=self.user,
+                        password=self.password,
+                        port=self.port,
+                        cursor_factory=RealDictCursor,
+                        connection_factory=PooledConnection
+                    )
+        return self._pool
+
+    def close_pool(self):
+        """커넥션 풀의 모든 연결 종료"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.closeall()
 
     def get_connection(self):
-        """PostgreSQL 연결"""
-        return psycopg2.connect(
-            host=self.host,
-            database=self.database,
-            user=self.user,
-            password=self.password,
-            port=self.port,
-            cursor_factory=RealDictCursor
-        )
+        """
+        PostgreSQL 연결 (풀에서 빌려옴, close() 시 반납)
 
-    def get_emails(self, limit: int = 50, offset: int = 0, analyzed_only: bool = False) -> List[Dict[str, Any]]:
-        """이메일 목록 조회"""
+        반드시 close()를 호출해야 하므로 가능하면 connection() 컨텍스트 매니저를 사용하세요.
+        pool_timeout초 안에 빈 연결이 없으면 PoolError
+        """
+        pool = self.open_pool()
+        if not self._slots.acquire(timeout=self.pool_timeout):
+            raise PoolError(
+                f"DB 커넥션 풀 대기 시간 초과 ({self.pool_timeout}초, 최대 {self.pool_max}개 사용 중)"
+            )
+        try:
+            conn = pool.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+        conn._owner = self
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[PooledConnection]:
+        """풀 연결 컨텍스트 매니저 (예외가 나도 반납, 커밋 안 된 트랜잭션은 롤백)"""
         conn = self.get_connection()
-        cur = conn.cursor()
+        try:
+            yield conn
+        finally:
+            if conn._owner is not None:  # 블록 안에서 이미 close()했으면 다시 반납하지 않음
+                conn.close()
+
+    def _release(self, conn: PooledConnection):
+        """연결 반납 (진행 중인 트랜잭션은 풀에서 롤백, 끊긴 연결은 버림)"""
+        try:
+            pool = self._pool
+            if pool is None or pool.closed:
+                conn.close()
+            else:
+                pool.putconn(conn, close=bool(conn.closed))
+        finally:
+            self._slots.release()
 
+    def get_emails(self, limit: int = 50, offset: int = 0, analyzed_only: bool = False) -> List[Dict[str, Any]]:
+        """이메일 목록 조회"""
         query = """
             SELECT * FROM email
             WHERE 1=1
@@ -37,60 +120,89 @@ class DatabaseService:
 
         query += " ORDER BY received_at DESC LIMIT %s OFFSET %s"
 
-        cur.execute(query, (limit, offset))
-        emails = cur.fetchall()
-        cur.close()
-        conn.close()
-        return emails
+        with self.connection() as conn, conn.cursor() as cur:
+            cur.execute(query, (limit, offset))
+            return cur.fetchall()
 
     def get_email_by_id(self, email_id: int) -> Optional[Dict[str, Any]]:
         """특정 이메일 조회"""
-        conn = self.get_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT * FROM email WHERE id = %s", (email_id,))
-        email = cur.fetchone()
-        cur.close()
-        conn.close()
-        return email
+        with self.connection() as conn, conn.cursor() as cur:
+            cur.execute("SELECT * FROM email WHERE id = %s", (email_id,))
+            return cur.fetchone()
 
     def get_unanalyzed_emails(self, limit: int = 10) -> List[Dict[str, Any]]:
         """미분석 이메일 조회"""
-        conn = self.get_connection()
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT * FROM email
-            WHERE email_type IS NULL
-            ORDER BY received_at DESC
-            LIMIT %s
-        """, (limit,))
-        emails = cur.fetchall()
-        cur.close()
-        conn.close()
-        return emails
+        with self.connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                SELECT * FROM email
+                WHERE email_type IS NULL
+                ORDER BY received_at DESC
+                LIMIT %s
+            """, (limit,))
+            return cur.fetchall()
 
     def get_emails_by_ids(self, email_ids: List[int]) -> List[Dict[str, Any]]:
         """특정 ID 리스트의 이메일 조회"""
         if not email_ids:
             return []
 
-        conn = self.get_connection()
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT * FROM email
-            WHERE id = ANY(%s)
-            ORDER BY received_at DESC
-        """, (email_ids,))
-        emails = cur.fetchall()
-        cur.close()
-        conn.close()
-        return emails
+        with self.connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                SELECT * FROM email
+                WHERE id = ANY(%s)
+                ORDER BY received_at DESC
+            """, (email_ids,))
+            return cur.fetchall()
+
+    def get_emails_for_classification(self, email_ids: List[int], body_limit: int = 2000) -> List[Dict[str, Any]]:
+        """분류에 필요한 컬럼만 조회 (본문은 앞 body_limit자까지)"""
+        if not email_ids:
+            return []
+
+        with self.connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                SELECT id, subject, sender_name, sender_address,
+                       LEFT(body_text, %s) AS body_text, received_at
+                FROM email
+                WHERE id = ANY(%s::int[])
+                ORDER BY received_at DESC
+            """, (body_limit, email_ids))
+            return cur.fetchall()
+
+    def get_unclassified_ids(self, email_ids: List[int], since: date) -> List[int]:
+        """
+        email_ids 중 분류가 필요한 ID만 반환 (입력 순서 유지)
+
+        email_type이 없거나, 분석 결과가 since 이전에 저장된 이메일
+        """
+        if not email_ids:
+            return []
+
+        with self.connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                SELECT id FROM email
+                WHERE id = ANY(%s::int[])
+                  AND (email_type IS NULL OR COALESCE(updated_at, created_at) < %s)
+            """, (email_ids, since))
+            todo = {row['id'] for row in cur.fetchall()}
+        return [email_id for email_id in email_ids if email_id in todo]
+
+    def get_classifications_for(self, email_ids: List[int]) -> List[Dict[str, Any]]:
+        """저장된 분석 결과 조회"""
+        if not email_ids:
+            return []
+
+        with self.connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                SELECT id, email_type, importance_score, needs_reply, sentiment, ai_analysis
+                FROM email
+                WHERE id = ANY(%s::int[])
+            """, (list(email_ids),))
+            return cur.fetchall()
 
     def update_email_analysis(self, email_id: int, analysis: Dict[str, Any]) -> bool:
         """이메일 분석 결과 저장"""
-        conn = self.get_connection()
-        cur = conn.cursor()
-
-        try:
+        with self.connection() as conn, conn.cursor() as cur:
             cur.execute("""
                 UPDATE email
                 SET email_type = %s,
@@ -108,87 +220,59 @@ class DatabaseService:
                 email_id
             ))
             conn.commit()
-            cur.close()
-            conn.close()
-            return True
-        except Exception as e:
-            conn.rollback()
-            cur.close()
-            conn.close()
-            raise e
+        return True
 
     def get_daily_summary(self, summary_date: date = None) -> Optional[Dict[str, Any]]:
         """일일 요약 조회"""
         if summary_date is None:
             summary_date = date.today()
 
-        conn = self.get_connection()
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT * FROM daily_summaries
-            WHERE summary_date = %s
-        """, (summary_date,))
-        summary = cur.fetchone()
-        cur.close()
-        conn.close()
-        return summary
+        with self.connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                SELECT * FROM daily_summaries
+                WHERE summary_date = %s
+            """, (summary_date,))
+            return cur.fetchone()
 
     def save_sent_email(self, email_data: Dict[str, Any]) -> int:
         """발송된 이메일 저장"""
-        conn = self.get_connection()
-        cur = conn.cursor()
-
-        cur.execute("""
-            INSERT INTO sent_emails
-            (original_email_id, to_email, to_name, subject, reply_body, sender_name, sender_email, status)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-        """, (
-            email_data.get('original_email_id'),
-            email_data.get('to_email'),
-            email_data.get('to_name'),
-            email_data.get('subject'),
-            email_data.get('reply_body'),
-            email_data.get('sender_name'),
-            email_data.get('sender_email'),
-            email_data.get('status', 'sent')
-        ))
-
-        sent_id = cur.fetchone()['id']
-        conn.commit()
-        cur.close()
-        conn.close()
+        with self.connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO sent_emails
+                (original_email_id, to_email, to_name, subject, reply_body, sender_name, sender_email, status)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING id
+            """, (
+                email_data.get('original_email_id'),
+                email_data.get('to_email'),
+                email_data.get('to_name'),
+                email_data.get('subject'),
+                email_data.get('reply_body'),
+                email_data.get('sender_name'),
+                email_data.get('sender_email'),
+                email_data.get('status', 'sent')
+            ))
+
+            sent_id = cur.fetchone()['id']
+            conn.commit()
         return sent_id
 
     def mark_as_replied(self, email_id: int) -> bool:
         """이메일을 답변 완료로 표시"""
-        conn = self.get_connection()
-        cur = conn.cursor()
-
-        try:
+        with self.connection() as conn, conn.cursor() as cur:
             cur.execute("""
                 UPDATE email
                 SET is_replied_to = TRUE
                 WHERE id = %s
             """, (email_id,))
             conn.commit()
-            cur.close()
-            conn.close()
-            return True
-        except Exception as e:
-            conn.rollback()
-            cur.close()
-            conn.close()
-            raise e
+        return True
 
     # ========== 테스트용 메서드 ==========
 
     def insert_test_email(self, email_data: Dict[str, Any]) -> int:
         """테스트 이메일 삽입 (평가용)"""
-        conn = self.get_connection()
-        cur = conn.cursor()
-
-        try:
+        with self.connection() as conn, conn.cursor() as cur:
             cur.execute("""
                 INSERT INTO email
                 (id, subject, sender_name, sender_address, body_text, received_at, original_uid, is_replied_to)
@@ -211,24 +295,14 @@ class DatabaseService:
             ))
             result = cur.fetchone()
             conn.commit()
-            cur.close()
-            conn.close()
-            return result['id']
-        except Exception as e:
-            conn.rollback()
-            cur.close()
-            conn.close()
-            raise e
+        return result['id']
 
     def delete_test_emails(self, email_ids: List[int]) -> int:
         """테스트 이메일 삭제 (평가용)"""
         if not email_ids:
             return 0
 
-        conn = self.get_connection()
-        cur = conn.cursor()
-
-        try:
+        with self.connection() as conn, conn.cursor() as cur:
             # 관련 reply_drafts 먼저 삭제
             cur.execute("""
                 DELETE FROM reply_drafts
@@ -243,24 +317,13 @@ class DatabaseService:
             """, (email_ids,))
             deleted = cur.fetchall()
             conn.commit()
-            cur.close()
-            conn.close()
-            return len(deleted)
-        except Exception as e:
-            conn.rollback()
-            cur.close()
-            conn.close()
-            raise e
+        return len(deleted)
 
     def get_max_email_id(self) -> int:
         """현재 최대 이메일 ID 조회"""
-        conn = self.get_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT COALESCE(MAX(id), 0) as max_id FROM email")
-        result = cur.fetchone()
-        cur.close()
-        conn.close()
-        return result['max_id']
+        with self.connection() as conn, conn.cursor() as cur:
+            cur.execute("SELECT COALESCE(MAX(id), 0) as max_id FROM email")
+            return cur.fetchone()['max_id']
 
 
 # 싱글톤 인스턴스
@@ -1,24 +1,24 @@
 import google.generativeai as genai
 from typing import Dict, Any
 from ..config import settings
+from .analysis_cache import SmartLLMCache, make_cache_key
 import json
+import re
 
-class GeminiService:
-    def __init__(self):
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel('gemini-pro')
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
-    def analyze_email(self, subject: str, body: str, sender: str) -> Dict[str, Any]:
-        """
-        이메일 분석 (유형, 중요도, 답변 필요 여부, 감정)
-        """
-        prompt = f"""
+# 분석 프롬프트 템플릿 (모듈 로드 시 1번만 생성)
+ANALYZE_PROMPT_TEMPLATE = """
 다음 이메일을 분석하고 JSON 형식으로 답변해주세요:
 
 발신자: {sender}
 제목: {subject}
 본문:
-{body[:1000]}
+{body}
 
 다음 형식으로 답변해주세요:
 {{
@@ -37,21 +37,89 @@ class GeminiService:
 - 중요도: 긴급성, 업무 관련성, 발신자 중요도 고려
 """
 
-        try:
-            response = self.model.generate_content(prompt)
-            result_text = response.text.strip()
+# 답변 프롬프트 템플릿
+REPLY_PROMPT_TEMPLATE = """
+다음 이메일에 대한 답변을 작성해주세요:
+
+발신자: {sender}
+제목: {subject}
+본문:
+{body}
+
+요구사항:
+- {tone_instruction}
+- 본문의 핵심 내용에 대해 답변
+- 한국어로 작성
+- 답변만 출력 (인사말 포함)
+
+답변:
+"""
+
+TONE_INSTRUCTIONS = {
+    "formal": "격식 있고 공손한 어조로 답변을 작성해주세요.",
+    "casual": "친근하고 편안한 어조로 답변을 작성해주세요.",
+    "brief": "간결하고 요점만 담은 답변을 작성해주세요."
+}
+
+# 응답의 ```json ... ``` 코드 펜스 제거용
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", re.M)
+
+# 분류 캐시 scope (ANALYZE_PROMPT_TEMPLATE이나 모델을 바꾸면 올려서 캐시 무효화)
+CLASSIFY_CACHE_SCOPE = "classify_gemini-pro_v1"
+
+
+class GeminiService:
+    def __init__(self):
+        # genai.configure / 모델 생성은 첫 사용 시 (_ensure_configured)
+        self._configured = False
+        self._model = None
 
-            # JSON 파싱 시도
-            if result_text.startswith("```json"):
-                result_text = result_text[7:]
-            if result_text.endswith("```"):
-                result_text = result_text[:-3]
-            result_text = result_text.strip()
+        # 분류 Gemini 호출 결과(response.text) LRU + TTL 캐시 (재시도/테스트 반복 시 재호출 방지)
+        self._classify_cache = SmartLLMCache(maxsize=4096)
 
-            analysis = json.loads(result_text)
+    def _ensure_configured(self):
+        """API 키 설정 + 모델 생성 (최초 1회)"""
+        if self._configured:
+            return
+
+        genai.configure(api_key=settings.GEMINI_API_KEY)
+        self._model = genai.GenerativeModel('gemini-pro')
+        self._configured = True
+
+    @property
+    def model(self):
+        self._ensure_configured()
+        return self._model
+
+    def _classify(self, sender: str, subject: str, body: str) -> str:
+        """
+        분류 Gemini 호출 (같은 발신자/제목/본문은 TTL 안에 다시 호출하지 않음)
+
+        예외는 캐시되지 않으므로 일시적 실패 후 재시도는 실제로 호출됩니다.
+        """
+        key = make_cache_key(sender, subject, body, CLASSIFY_CACHE_SCOPE)
+        text = self._classify_cache.get(key)
+        if text is None:
+            prompt = ANALYZE_PROMPT_TEMPLATE.format(sender=sender, subject=subject, body=body)
+            text = self.model.generate_content(prompt).text
+            self._classify_cache.put(key, text)
+        return text
+
+    def analyze_email(self, subject: str, body: str, sender: str) -> Dict[str, Any]:
+        """
+        이메일 분석 (유형, 중요도, 답변 필요 여부, 감정)
+        """
+        body = (body or "")[:1000]
+
+        try:
+            text = self._classify(sender, subject, body)
+            # 코드 펜스 제거 후 JSON 파싱
+            result_text = _FENCE_RE.sub("", text.strip()).strip()
+
+            analysis = _json_loads(result_text)
             return analysis
 
-        except json.JSONDecodeError as e:
+        except ValueError as e:  # JSONDecodeError
             # JSON 파싱 실패 시 기본값 반환
             return {
                 "email_type": "기타",
@@ -68,28 +136,12 @@ class GeminiService:
         이메일 답변 생성
         tone: formal(격식), casual(친근함), brief(간결함)
         """
-        tone_instructions = {
-            "formal": "격식 있고 공손한 어조로 답변을 작성해주세요.",
-            "casual": "친근하고 편안한 어조로 답변을 작성해주세요.",
-            "brief": "간결하고 요점만 담은 답변을 작성해주세요."
-        }
-
-        prompt = f"""
-다음 이메일에 대한 답변을 작성해주세요:
-
-발신자: {sender}
-제목: {subject}
-본문:
-{body[:1000]}
-
-요구사항:
-- {tone_instructions.get(tone, tone_instructions['formal'])}
-- 본문의 핵심 내용에 대해 답변
-- 한국어로 작성
-- 답변만 출력 (인사말 포함)
-
-답변:
-"""
+        prompt = REPLY_PROMPT_TEMPLATE.format(
+            sender=sender,
+            subject=subject,
+            body=(body or "")[:1000],
+            tone_instruction=TONE_INSTRUCTIONS.get(tone, TONE_INSTRUCTIONS['formal'])
+        )
 
         try:
             response = self.model.generate_content(prompt)
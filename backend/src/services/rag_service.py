@@ -38,26 +38,25 @@ class RAGService:
             return []
 
         # 2. 같은 유형의 과거 이메일 조회 (이미 분석된 것만)
-        conn = db.get_connection()
-        cur = conn.cursor()
-
-        query = """
-            SELECT id, subject, body_text, sender_name, sender_address,
-                   email_type, importance_score, needs_reply,
-                   ai_analysis
-            FROM email
-            WHERE id != %s
-              AND email_type = %s
-              AND email_type IS NOT NULL
-              AND is_replied_to = TRUE
-            ORDER BY received_at DESC
-            LIMIT 50
-        """
-
-        cur.execute(query, (email_id, current_email.get('email_type', '기타')))
-        past_emails = cur.fetchall()
-        cur.close()
-        conn.close()
+        with db.connection() as conn:
+            cur = conn.cursor()
+
+            query = """
+                SELECT id, subject, body_text, sender_name, sender_address,
+                       email_type, importance_score, needs_reply,
+                       ai_analysis
+                FROM email
+                WHERE id != %s
+                  AND email_type = %s
+                  AND email_type IS NOT NULL
+                  AND is_replied_to = TRUE
+                ORDER BY received_at DESC
+                LIMIT 50
+            """
+
+            cur.execute(query, (email_id, current_email.get('email_type', '기타')))
+            past_emails = cur.fetchall()
+            cur.close()
 
         if not past_emails:
             return []
@@ -142,28 +141,27 @@ class RAGService:
         Returns:
             답변 패턴 딕셔너리
         """
-        conn = db.get_connection()
-        cur = conn.cursor()
+        with db.connection() as conn:
+            cur = conn.cursor()
 
-        query = """
-            SELECT id, email_type, sender_category, reply_template,
-                   preferred_tone, common_phrases, usage_count, success_rate
-            FROM reply_patterns
-            WHERE email_type = %s
-        """
+            query = """
+                SELECT id, email_type, sender_category, reply_template,
+                       preferred_tone, common_phrases, usage_count, success_rate
+                FROM reply_patterns
+                WHERE email_type = %s
+            """
 
-        params = [email_type]
+            params = [email_type]
 
-        if sender_category:
-            query += " AND sender_category = %s"
-            params.append(sender_category)
+            if sender_category:
+                query += " AND sender_category = %s"
+                params.append(sender_category)
 
-        query += " ORDER BY success_rate DESC, usage_count DESC LIMIT 1"
+            query += " ORDER BY success_rate DESC, usage_count DESC LIMIT 1"
 
-        cur.execute(query, params)
-        pattern = cur.fetchone()
-        cur.close()
-        conn.close()
+            cur.execute(query, params)
+            pattern = cur.fetchone()
+            cur.close()
 
         return pattern
 
@@ -174,63 +172,61 @@ class RAGService:
         Args:
             feedback_id: 피드백 ID
         """
-        conn = db.get_connection()
-        cur = conn.cursor()
+        with db.connection() as conn:
+            cur = conn.cursor()
 
-        # 1. 피드백 조회
-        cur.execute("""
-            SELECT uf.*, e.email_type, e.sender_address
-            FROM user_feedback uf
-            JOIN email e ON uf.email_id = e.id
-            WHERE uf.id = %s
-        """, (feedback_id,))
-
-        feedback = cur.fetchone()
-
-        if not feedback or feedback['feedback_type'] == 'rejected':
-            cur.close()
-            conn.close()
-            return
-
-        # 2. 답변 패턴 업데이트 또는 생성
-        email_type = feedback['email_type']
+            # 1. 피드백 조회
+            cur.execute("""
+                SELECT uf.*, e.email_type, e.sender_address
+                FROM user_feedback uf
+                JOIN email e ON uf.email_id = e.id
+                WHERE uf.id = %s
+            """, (feedback_id,))
 
-        # 기존 패턴 조회
-        cur.execute("""
-            SELECT id, usage_count, success_rate
-            FROM reply_patterns
-            WHERE email_type = %s
-            LIMIT 1
-        """, (email_type,))
+            feedback = cur.fetchone()
 
-        existing_pattern = cur.fetchone()
+            if not feedback or feedback['feedback_type'] == 'rejected':
+                cur.close()
+                return
 
-        if existing_pattern:
-            # 기존 패턴 업데이트
-            new_usage = existing_pattern['usage_count'] + 1
-            new_success_rate = (
-                (existing_pattern['success_rate'] * existing_pattern['usage_count'] +
-                 (1.0 if feedback['feedback_type'] == 'accepted' else 0.8)) / new_usage
-            )
+            # 2. 답변 패턴 업데이트 또는 생성
+            email_type = feedback['email_type']
 
+            # 기존 패턴 조회
             cur.execute("""
-                UPDATE reply_patterns
-                SET usage_count = %s,
-                    success_rate = %s,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE id = %s
-            """, (new_usage, new_success_rate, existing_pattern['id']))
-        else:
-            # 새 패턴 생성
-            cur.execute("""
-                INSERT INTO reply_patterns
-                (email_type, reply_template, preferred_tone, usage_count, success_rate)
-                VALUES (%s, %s, 'formal', 1, 1.0)
-            """, (email_type, feedback['modified_draft']))
+                SELECT id, usage_count, success_rate
+                FROM reply_patterns
+                WHERE email_type = %s
+                LIMIT 1
+            """, (email_type,))
+
+            existing_pattern = cur.fetchone()
+
+            if existing_pattern:
+                # 기존 패턴 업데이트
+                new_usage = existing_pattern['usage_count'] + 1
+                new_success_rate = (
+                    (existing_pattern['success_rate'] * existing_pattern['usage_count'] +
+                     (1.0 if feedback['feedback_type'] == 'accepted' else 0.8)) / new_usage
+                )
+
+                cur.execute("""
+                    UPDATE reply_patterns
+                    SET usage_count = %s,
+                        success_rate = %s,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = %s
+                """, (new_usage, new_success_rate, existing_pattern['id']))
+            else:
+                # 새 패턴 생성
+                cur.execute("""
+                    INSERT INTO reply_patterns
+                    (email_type, reply_template, preferred_tone, usage_count, success_rate)
+                    VALUES (%s, %s, 'formal', 1, 1.0)
+                """, (email_type, feedback['modified_draft']))
 
-        conn.commit()
-        cur.close()
-        conn.close()
+            conn.commit()
+            cur.close()
 
         print(f"[RAG] 피드백 {feedback_id}로부터 학습 완료")
 
@@ -245,22 +241,21 @@ class RAGService:
         Returns:
             과거 답변 리스트
         """
-        conn = db.get_connection()
-        cur = conn.cursor()
+        with db.connection() as conn:
+            cur = conn.cursor()
 
-        cur.execute("""
-            SELECT se.subject, se.reply_body, se.sent_at, e.email_type
-            FROM sent_emails se
-            JOIN email e ON se.original_email_id = e.id
-            WHERE se.to_email = %s
-              AND se.status = 'sent'
-            ORDER BY se.sent_at DESC
-            LIMIT %s
-        """, (sender_address, limit))
-
-        past_replies = cur.fetchall()
-        cur.close()
-        conn.close()
+            cur.execute("""
+                SELECT se.subject, se.reply_body, se.sent_at, e.email_type
+                FROM sent_emails se
+                JOIN email e ON se.original_email_id = e.id
+                WHERE se.to_email = %s
+                  AND se.status = 'sent'
+                ORDER BY se.sent_at DESC
+                LIMIT %s
+            """, (sender_address, limit))
+
+            past_replies = cur.fetchall()
+            cur.close()
 
         return past_replies
 
@@ -6,13 +6,44 @@ n8n의 4가지 기본 에이전트를 Python 함수로 호출할 수 있게 합
 2. SendEmailAgent - 메일 발송
 3. SummarizeEmailAgent - 메일 요약
 4. GenerateReplyAgent - 답변 생성
+5. AnalyzeEmailAgent - 이메일 분석 (단건 / 일괄)
 """
 
+import asyncio
+import json
 import requests
 from typing import List, Dict, Optional
 from datetime import date
 import logging
 
+try:
+    import httpx
+except ImportError:  # async 변형은 httpx가 있을 때만 사용 가능
+    httpx = None
+
+try:
+    import h2  # noqa: F401  (httpx HTTP/2 지원)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    _json_loads = json.loads
+
+from ..services.db_service import db
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +57,61 @@ class N8nToolWrapper:
         """
         self.base_url = base_url
 
+        # 동기 호출용 세션 (TCP 연결 재사용)
+        self._session = requests.Session()
+
+        # async 호출용 클라이언트 (첫 호출 시 생성, 이벤트 루프별로 1개)
+        self._async_client = None
+        self._async_client_loop = None
+
+    def _get_async_client(self):
+        """
+        공유 httpx.AsyncClient 반환 (지연 생성)
+
+        asyncio.run()마다 이벤트 루프가 바뀌므로, 루프가 달라지면 새로 만듭니다.
+        """
+        if httpx is None:
+            raise Exception("httpx가 설치되지 않아 async 호출을 사용할 수 없습니다")
+
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                http2=HTTP2_AVAILABLE,
+                timeout=httpx.Timeout(60.0, connect=10.0)
+            )
+            self._async_client_loop = loop
+
+        return self._async_client
+
+    async def aclose(self):
+        """async 클라이언트 종료 (FastAPI shutdown 시 호출)"""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_client_loop = None
+
+    async def _apost(self, agent: str, url: str, payload: Dict, timeout: int, timeout_message: str) -> Dict:
+        """
+        공유 async 클라이언트로 webhook POST (async 변형 공통)
+
+        동기 메서드와 같은 형식의 예외 메시지를 사용합니다.
+        """
+        client = self._get_async_client()
+
+        try:
+            response = await client.post(url, content=_json_dumps(payload), headers=JSON_HEADERS, timeout=timeout)
+            response.raise_for_status()
+            return _json_loads(response.content)
+
+        except httpx.TimeoutException:
+            logger.error(f"[n8n] {agent} 타임아웃")
+            raise Exception(timeout_message)
+
+        except httpx.HTTPError as e:
+            logger.error(f"[n8n] {agent} 실패: {e}")
+            raise Exception(f"n8n 연결 실패: {str(e)}")
+
     def fetch_emails(self, since_date: Optional[str] = None) -> Dict:
         """
         워크플로우 #1: 메일 가져오기 (FetchEmailAgent)
@@ -54,10 +140,10 @@ class N8nToolWrapper:
         logger.info(f"[n8n] FetchEmailAgent 호출: {payload}")
 
         try:
-            response = requests.post(url, json=payload, timeout=60)
+            response = self._session.post(url, data=_json_dumps(payload), headers=JSON_HEADERS, timeout=60)
             response.raise_for_status()
 
-            result = response.json()
+            result = _json_loads(response.content)
 
             # n8n 응답의 success 필드 확인
             if not result.get('success', True):
@@ -117,10 +203,10 @@ class N8nToolWrapper:
         logger.info(f"[n8n] SendEmailAgent 호출: to={to_email}, subject={subject}")
 
         try:
-            response = requests.post(url, json=payload, timeout=30)
+            response = self._session.post(url, data=_json_dumps(payload), headers=JSON_HEADERS, timeout=30)
             response.raise_for_status()
 
-            result = response.json()
+            result = _json_loads(response.content)
             logger.info(f"[n8n] SendEmailAgent 성공: {to_email}로 발송")
 
             return result
@@ -161,10 +247,10 @@ class N8nToolWrapper:
         logger.info(f"[n8n] SummarizeEmailAgent 호출: {len(email_ids) if email_ids else '전체'} 이메일")
 
         try:
-            response = requests.post(url, json=payload, timeout=120)
+            response = self._session.post(url, data=_json_dumps(payload), headers=JSON_HEADERS, timeout=120)
             response.raise_for_status()
 
-            result = response.json()
+            result = _json_loads(response.content)
             logger.info(f"[n8n] SummarizeEmailAgent 성공: {result.get('email_count', 0)}개 이메일 요약")
 
             return result
@@ -210,10 +296,10 @@ class N8nToolWrapper:
         logger.info(f"[n8n] GenerateReplyAgent 호출: email_id={email_id}, tone={preferred_tone}")
 
         try:
-            response = requests.post(url, json=payload, timeout=60)
+            response = self._session.post(url, data=_json_dumps(payload), headers=JSON_HEADERS, timeout=60)
             response.raise_for_status()
 
-            result = response.json()
+            result = _json_loads(response.content)
             logger.info(f"[n8n] GenerateReplyAgent 성공: 3가지 톤 답변 생성")
 
             return result
@@ -249,9 +335,195 @@ class N8nToolWrapper:
                 }
             }
         """
+        url = f"{self.base_url}/webhook/analyze"
+        payload = self._build_analyze_payload(email_id, email_data, use_rag)
+
+        logger.info(f"[n8n] AnalyzeEmailAgent 호출: email_id={email_id}, use_rag={use_rag}")
+
+        try:
+            response = self._session.post(url, data=_json_dumps(payload), headers=JSON_HEADERS, timeout=60)
+            response.raise_for_status()
+
+            result = _json_loads(response.content)
+            logger.info(f"[n8n] AnalyzeEmailAgent 성공: {result.get('analysis', {}).get('email_type', 'unknown')}")
+
+            return result
+
+        except requests.exceptions.Timeout:
+            logger.error("[n8n] AnalyzeEmailAgent 타임아웃")
+            raise Exception("이메일 분석 시간 초과 (60초)")
+
+        except requests.exceptions.RequestException as e:
+            logger.error(f"[n8n] AnalyzeEmailAgent 실패: {e}")
+            raise Exception(f"n8n 연결 실패: {str(e)}")
+
+    def analyze_emails_batch(self, emails: List[Dict], use_rag: bool = True) -> List[Dict]:
+        """
+        워크플로우 #5-B: 이메일 일괄 분석 (AnalyzeEmailAgent, batch webhook)
+
+        N개 이메일을 한 번의 HTTP 요청으로 보내고, n8n 워크플로우 안에서
+        Split In Batches로 나눠 분석합니다. (N번의 연결/워크플로우 기동 → 1번)
+
+        Args:
+            emails: 이메일 데이터 리스트 (id, subject, sender_name, sender_address, body_text)
+            use_rag: RAG 강화 프롬프트 사용 여부 (기본: True)
+
+        Returns:
+            입력 순서와 같은 분석 결과 리스트 (각 항목은 analyze_email 응답과 같은 형식)
+            n8n 응답에 없는 이메일은 {"success": false, ...}로 채웁니다.
+        """
+        if not emails:
+            return []
+
+        url = f"{self.base_url}/webhook/analyze-batch"
+        payload = {
+            "emails": [
+                self._build_analyze_payload(email['id'], email, use_rag)
+                for email in emails
+            ]
+        }
+
+        logger.info(f"[n8n] AnalyzeEmailAgent 일괄 호출: {len(emails)}개 이메일, use_rag={use_rag}")
+
+        try:
+            response = self._session.post(url, data=_json_dumps(payload), headers=JSON_HEADERS, timeout=120)
+            response.raise_for_status()
+
+            result = _json_loads(response.content)
+            return self._order_batch_results(emails, result)
+
+        except requests.exceptions.Timeout:
+            logger.error("[n8n] AnalyzeEmailAgent 일괄 분석 타임아웃")
+            raise Exception("이메일 일괄 분석 시간 초과 (120초)")
+
+        except requests.exceptions.RequestException as e:
+            logger.error(f"[n8n] AnalyzeEmailAgent 일괄 분석 실패: {e}")
+            raise Exception(f"n8n 연결 실패: {str(e)}")
+
+    # ========== async 변형 (LangGraph async 노드용) ==========
+
+    async def fetch_emails_async(self, since_date: Optional[str] = None) -> Dict:
+        """fetch_emails()의 async 버전"""
+        if since_date is None:
+            since_date = date.today().isoformat()
+
+        url = f"{self.base_url}/webhook/mail"
+        payload = {
+            "sync_date": since_date,
+            "trigger_source": "langgraph"
+        }
+
+        logger.info(f"[n8n] FetchEmailAgent 호출: {payload}")
+
+        result = await self._apost("FetchEmailAgent", url, payload, 60, "메일 가져오기 시간 초과 (60초)")
+
+        # n8n 응답의 success 필드 확인
+        if not result.get('success', True):
+            error_msg = result.get('message', 'n8n 워크플로우 실패')
+            logger.error(f"[n8n] FetchEmailAgent 실패: {error_msg}")
+            raise Exception(error_msg)
+
+        logger.info(f"[n8n] FetchEmailAgent 성공: {result.get('new_emails', 0)}개 새 이메일")
+
+        return result
+
+    async def send_email_async(
+        self,
+        to_email: str,
+        subject: str,
+        body: str,
+        to_name: Optional[str] = None,
+        sender_name: str = "AI 메일 비서",
+        sender_email: Optional[str] = None
+    ) -> Dict:
+        """send_email()의 async 버전"""
+        url = f"{self.base_url}/webhook/send-reply"
+        payload = {
+            "to_email": to_email,
+            "to_name": to_name or "",
+            "subject": subject,
+            "reply_body": body,
+            "sender_name": sender_name,
+            "sender_email": sender_email or ""
+        }
+
+        logger.info(f"[n8n] SendEmailAgent 호출: to={to_email}, subject={subject}")
+
+        result = await self._apost("SendEmailAgent", url, payload, 30, "메일 발송 시간 초과 (30초)")
+        logger.info(f"[n8n] SendEmailAgent 성공: {to_email}로 발송")
+
+        return result
+
+    async def summarize_emails_async(self, email_ids: Optional[List[int]] = None) -> Dict:
+        """summarize_emails()의 async 버전"""
+        url = f"{self.base_url}/webhook/summary"
+        payload = {
+            "summary_date": date.today().isoformat(),
+            "trigger_source": "langgraph"
+        }
+
+        if email_ids:
+            payload["email_ids"] = email_ids
+
+        logger.info(f"[n8n] SummarizeEmailAgent 호출: {len(email_ids) if email_ids else '전체'} 이메일")
+
+        result = await self._apost("SummarizeEmailAgent", url, payload, 120, "메일 요약 시간 초과 (120초)")
+        logger.info(f"[n8n] SummarizeEmailAgent 성공: {result.get('email_count', 0)}개 이메일 요약")
+
+        return result
+
+    async def generate_reply_async(self, email_id: int, preferred_tone: str = "formal") -> Dict:
+        """generate_reply()의 async 버전"""
+        url = f"{self.base_url}/webhook/generate-reply"
+        payload = {
+            "email_id": email_id,
+            "preferred_tone": preferred_tone
+        }
+
+        logger.info(f"[n8n] GenerateReplyAgent 호출: email_id={email_id}, tone={preferred_tone}")
+
+        result = await self._apost("GenerateReplyAgent", url, payload, 60, "답변 생성 시간 초과 (60초)")
+        logger.info("[n8n] GenerateReplyAgent 성공: 3가지 톤 답변 생성")
+
+        return result
+
+    async def analyze_email_async(self, email_id: int, email_data: Dict = None, use_rag: bool = True) -> Dict:
+        """analyze_email()의 async 버전 (DB 조회/RAG 프롬프트 생성은 스레드에서 실행)"""
+        url = f"{self.base_url}/webhook/analyze"
+        payload = await asyncio.to_thread(self._build_analyze_payload, email_id, email_data, use_rag)
+
+        logger.info(f"[n8n] AnalyzeEmailAgent 호출: email_id={email_id}, use_rag={use_rag}")
+
+        result = await self._apost("AnalyzeEmailAgent", url, payload, 60, "이메일 분석 시간 초과 (60초)")
+        logger.info(f"[n8n] AnalyzeEmailAgent 성공: {result.get('analysis', {}).get('email_type', 'unknown')}")
+
+        return result
+
+    async def analyze_emails_batch_async(self, emails: List[Dict], use_rag: bool = True) -> List[Dict]:
+        """analyze_emails_batch()의 async 버전"""
+        if not emails:
+            return []
+
+        url = f"{self.base_url}/webhook/analyze-batch"
+        payload = {
+            "emails": await asyncio.to_thread(
+                lambda: [self._build_analyze_payload(email['id'], email, use_rag) for email in emails]
+            )
+        }
+
+        logger.info(f"[n8n] AnalyzeEmailAgent 일괄 호출: {len(emails)}개 이메일, use_rag={use_rag}")
+
+        result = await self._apost("AnalyzeEmailAgent", url, payload, 120, "이메일 일괄 분석 시간 초과 (120초)")
+        return self._order_batch_results(emails, result)
+
+    def _build_analyze_payload(self, email_id: int, email_data: Optional[Dict], use_rag: bool) -> Dict:
+        """
+        analyze webhook 페이로드 생성 (단건/일괄 공통)
+
+        email_data가 없으면 DB에서 조회하고, use_rag이면 RAG 강화 프롬프트를 포함합니다.
+        """
         # email_data가 없으면 DB에서 조회
         if email_data is None:
-            from ..services.db_service import db
             email = db.get_email_by_id(email_id)
             if not email:
                 raise Exception(f"Email {email_id} not found")
@@ -262,8 +534,7 @@ class N8nToolWrapper:
         if use_rag:
             rag_prompt = self._get_rag_enhanced_prompt(email_data)
 
-        url = f"{self.base_url}/webhook/analyze"
-        payload = {
+        return {
             "email_id": email_id,
             "subject": email_data.get('subject', ''),
             "sender_name": email_data.get('sender_name', ''),
@@ -272,24 +543,20 @@ class N8nToolWrapper:
             "rag_prompt": rag_prompt  # RAG 강화 프롬프트 추가
         }
 
-        logger.info(f"[n8n] AnalyzeEmailAgent 호출: email_id={email_id}, use_rag={use_rag}")
-
-        try:
-            response = requests.post(url, json=payload, timeout=60)
-            response.raise_for_status()
-
-            result = response.json()
-            logger.info(f"[n8n] AnalyzeEmailAgent 성공: {result.get('analysis', {}).get('email_type', 'unknown')}")
+    def _order_batch_results(self, emails: List[Dict], result: Dict) -> List[Dict]:
+        """일괄 분석 응답을 email_id로 매칭해 입력 순서대로 정렬 (없는 항목은 실패로 채움)"""
+        results_by_id = {r.get("email_id"): r for r in result.get("results", [])}
 
-            return result
-
-        except requests.exceptions.Timeout:
-            logger.error("[n8n] AnalyzeEmailAgent 타임아웃")
-            raise Exception("이메일 분석 시간 초과 (60초)")
+        logger.info(f"[n8n] AnalyzeEmailAgent 일괄 분석 성공: {len(results_by_id)}/{len(emails)}개")
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"[n8n] AnalyzeEmailAgent 실패: {e}")
-            raise Exception(f"n8n 연결 실패: {str(e)}")
+        return [
+            results_by_id.get(email['id'], {
+                "success": False,
+                "email_id": email['id'],
+                "error": "일괄 분석 응답에 결과 없음"
+            })
+            for email in emails
+        ]
 
     def _get_rag_enhanced_prompt(self, email_data: Dict) -> Optional[str]:
         """